@@ -5,6 +5,7 @@ Cooling Analysis Tool - pre tézu o chladení vnutorných priestorov
 """
 
 import math
+import os
 import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')  # Pre serverové prostredia bez GUI
@@ -13,11 +14,41 @@ import numpy as np
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import json
+from concurrent.futures import ProcessPoolExecutor
+
+from energy_audit import psychrometrics
+from energy_audit.climate import SLOVAK_STATIONS, Station, cooling_season_data
+from energy_audit.performance_maps import performance_map
+from energy_audit.rts import DAILY_RANGE_FRACTIONS
 
 # Nastavenie slovenčiny pre grafy
 plt.rcParams['font.family'] = 'DejaVu Sans'
 plt.rcParams['axes.unicode_minus'] = False
 
+ELECTRICITY_PRICE_EUR_KWH = 0.18  # priemer SR 2024
+
+
+def present_value_factor(discount_rate, years, escalation=0.0) -> np.ndarray:
+    """
+    Súčasná hodnota 1 € ročných nákladov počas obdobia (anuitný faktor)
+
+    PV = (1 - ((1 + g) / (1 + r))^n) / (r - g), pre r = g je PV = n / (1 + r).
+    Parametre môžu byť polia, výsledok má ich spoločný (vysielaný) tvar.
+
+    Args:
+        discount_rate: diskontná sadzba r [-]
+        years: obdobie n [roky]
+        escalation: ročný rast nákladov g [-]
+    """
+    r, n, g = np.broadcast_arrays(np.asarray(discount_rate, dtype=float),
+                                  np.asarray(years, dtype=float),
+                                  np.asarray(escalation, dtype=float))
+    equal = np.isclose(r, g)
+    ratio = (1 + g) / (1 + r)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = (1 - ratio ** n) / (r - g)
+    return np.where(equal, n / (1 + r), factor)
+
 @dataclass
 class CoolingSystem:
     """Definícia chladiaceho systému"""
@@ -47,6 +78,7 @@ class BuildingParameters:
     u_value_windows: float
     shading_factor: float  # 0-1
     internal_temp_C: float = 24.0
+    internal_relative_humidity: float = 0.5  # 0-1
     
     def calculate_envelope_area(self) -> float:
         """Odhad plochy obálky budovy"""
@@ -56,36 +88,91 @@ class BuildingParameters:
         roof_area = self.floor_area_m2
         return wall_area + roof_area - self.window_area_m2
 
+@dataclass
+class ScenarioGridResult:
+    """
+    Výsledky mriežky scenárov budova × lokalita × systém
+    
+    values obsahuje polia [budova × lokalita × systém]; do súboru sa ukladajú
+    stĺpcovo (jeden stĺpec na veličinu, riadok = kombinácia) spolu s indexmi
+    a názvami budov, lokalít a systémov.
+    """
+    buildings: List[str]
+    locations: List[str]
+    systems: List[str]
+    values: Dict[str, np.ndarray]
+    
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return len(self.buildings), len(self.locations), len(self.systems)
+    
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Stĺpce s jedným riadkom na kombináciu (poradie budova, lokalita, systém)"""
+        building, location, system = (index.ravel() for index in np.indices(self.shape))
+        columns = {'building': building, 'location': location, 'system': system}
+        columns.update({key: value.ravel() for key, value in self.values.items()})
+        return columns
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Tabuľka kombinácií s názvami budov, lokalít a systémov"""
+        columns = self.columns()
+        frame = pd.DataFrame({
+            'Budova': np.asarray(self.buildings, dtype=object)[columns.pop('building')],
+            'Lokalita': np.asarray(self.locations, dtype=object)[columns.pop('location')],
+            'Systém': np.asarray(self.systems, dtype=object)[columns.pop('system')],
+        })
+        for key, value in columns.items():
+            frame[key] = value
+        return frame
+    
+    @staticmethod
+    def file_path(path: str) -> str:
+        """Cesta k súboru s príponou .npz (np.savez ju k ceste bez prípony pridá)"""
+        path = os.fspath(path)
+        return path if path.endswith('.npz') else path + '.npz'
+    
+    def save(self, path: str) -> str:
+        """
+        Uloženie do stĺpcového súboru .npz (bez pickle, názvy ako reťazcové polia)
+        
+        Returns:
+            skutočná cesta k súboru (s príponou .npz)
+        """
+        path = self.file_path(path)
+        np.savez(path,
+                 building_names=np.asarray(self.buildings, dtype=str),
+                 location_names=np.asarray(self.locations, dtype=str),
+                 system_names=np.asarray(self.systems, dtype=str),
+                 **self.columns())
+        return path
+    
+    @staticmethod
+    def load(path: str) -> 'ScenarioGridResult':
+        """Načítanie výsledkov uložených metódou save (prípona .npz sa doplní)"""
+        with np.load(ScenarioGridResult.file_path(path)) as data:
+            names = [data[key].tolist() for key in ('building_names', 'location_names', 'system_names')]
+            shape = tuple(len(values) for values in names)
+            skip = {'building_names', 'location_names', 'system_names', 'building', 'location', 'system'}
+            values = {key: data[key].reshape(shape) for key in data.files if key not in skip}
+        return ScenarioGridResult(*names, values)
+
 class CoolingAnalyzer:
     """Hlavná trieda pre analýzu chladiacich systémov"""
     
-    def __init__(self):
-        self.slovak_climate_data = {
-            "bratislava": {
-                "design_temp_C": 32,
-                "avg_summer_temp_C": 26,
-                "solar_radiation_W_m2": 800,
-                "cooling_hours_per_day": 8,
-                "cooling_days_per_year": 90,
-                "relative_humidity": 0.65
-            },
-            "košice": {
-                "design_temp_C": 31,
-                "avg_summer_temp_C": 25,
-                "solar_radiation_W_m2": 750,
-                "cooling_hours_per_day": 7.5,
-                "cooling_days_per_year": 85,
-                "relative_humidity": 0.68
-            },
-            "žilina": {
-                "design_temp_C": 29,
-                "avg_summer_temp_C": 24,
-                "solar_radiation_W_m2": 700,
-                "cooling_hours_per_day": 6,
-                "cooling_days_per_year": 70,
-                "relative_humidity": 0.70
-            }
-        }
+    def __init__(self, stations: Optional[List[Station]] = None):
+        """
+        Args:
+            stations: stanice s parametrami chladiacej sezóny (predvolene
+                slovenské referenčné stanice, kľúč lokality = station_id)
+        """
+        self.slovak_climate_data = cooling_season_data(stations if stations is not None else SLOVAK_STATIONS)
+    
+    def _location_climate(self, location: str) -> Dict[str, float]:
+        """Údaje lokality (neznáma lokalita = Bratislava, prípadne prvá stanica)"""
+        climate = self.slovak_climate_data.get(location)
+        if climate is None:
+            climate = self.slovak_climate_data.get("bratislava") or next(iter(self.slovak_climate_data.values()))
+        return climate
     
     def calculate_cooling_load(self, building: BuildingParameters, 
                              location: str = "bratislava") -> Dict[str, float]:
@@ -95,42 +182,70 @@ class CoolingAnalyzer:
         Returns:
             Slovník s rozložením chladiacej záťaže [W]
         """
-        climate = self.slovak_climate_data.get(location, self.slovak_climate_data["bratislava"])
+        loads = self.cooling_load_grid([building], [location])
+        return {key: float(value[0, 0]) for key, value in loads.items()}
+    
+    def cooling_load_grid(self, buildings: List[BuildingParameters],
+                          locations: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Chladiaca potreba pre všetky dvojice budova × lokalita naraz
+        
+        Parametre budov a lokalít sa zložia do polí, výsledok má tvar
+        [budova × lokalita] (rovnaké kľúče ako calculate_cooling_load).
+        """
+        climates = [self._location_climate(location) for location in locations]
+        
+        def building_column(attribute):
+            return np.array([getattr(building, attribute) for building in buildings], dtype=float)[:, None]
+        
+        def climate_row(key):
+            return np.array([climate[key] for climate in climates], dtype=float)[None, :]
+        
+        people = building_column("number_of_people")
+        window_area = building_column("window_area_m2")
+        internal_temp = building_column("internal_temp_C")
+        floor_area = building_column("floor_area_m2")
         
         # 1. Tepelné zisky od osôb (ASHRAE 2017)
-        people_sensible_W = building.number_of_people * 70  # W/osoba
-        people_latent_W = building.number_of_people * 45    # W/osoba
+        people_sensible_W = people * 70  # W/osoba
+        people_latent_W = people * 45    # W/osoba
         people_total_W = people_sensible_W + people_latent_W
         
         # 2. Tepelné zisky od osvetlenia
-        lighting_W = building.lighting_power_W * 0.95  # 95% premena na teplo
+        lighting_W = building_column("lighting_power_W") * 0.95  # 95% premena na teplo
         
         # 3. Tepelné zisky od zariadení
-        equipment_W = building.equipment_power_W * 0.7 * 0.8  # usage × simultaneity
+        equipment_W = building_column("equipment_power_W") * 0.7 * 0.8  # usage × simultaneity
         
         # 4. Solárne zisky cez okná
-        solar_W = (building.window_area_m2 * 
-                  climate["solar_radiation_W_m2"] * 
+        solar_W = (window_area * 
+                  climate_row("solar_radiation_W_m2") * 
                   0.85 *  # SHGC typické pre dvojsklo
-                  building.shading_factor)
+                  building_column("shading_factor"))
         
         # 5. Tepelné zisky prechodom cez obálku
-        temp_diff = climate["design_temp_C"] - building.internal_temp_C
-        envelope_area = building.calculate_envelope_area()
+        temp_diff = climate_row("design_temp_C") - internal_temp
+        envelope_area = np.array([building.calculate_envelope_area() for building in buildings], dtype=float)[:, None]
         
         transmission_walls_W = (envelope_area * 0.8 *  # 80% sú steny
-                               building.u_value_walls * temp_diff)
+                               building_column("u_value_walls") * temp_diff)
         transmission_roof_W = (envelope_area * 0.2 *   # 20% je strecha
-                              building.u_value_roof * temp_diff)
-        transmission_windows_W = (building.window_area_m2 * 
-                                 building.u_value_windows * temp_diff)
+                              building_column("u_value_roof") * temp_diff)
+        transmission_windows_W = (window_area * 
+                                 building_column("u_value_windows") * temp_diff)
         
         transmission_total_W = transmission_walls_W + transmission_roof_W + transmission_windows_W
         
         # 6. Ventilačné zisky (predpokladáme 30 m³/h na osobu)
-        air_flow_m3_s = (building.number_of_people * 30) / 3600
+        air_flow_m3_s = (people * 30) / 3600
         ventilation_sensible_W = 1.2 * 1010 * air_flow_m3_s * temp_diff  # ρ × cp × V × ΔT
-        ventilation_latent_W = ventilation_sensible_W * 0.3  # odhad latentného zisku
+        # Latentný zisk z rozdielu mernej vlhkosti; vlhkosť vonkajšieho vzduchu
+        # počas dňa zodpovedá priemernej letnej teplote a relatívnej vlhkosti
+        humidity_ratio_diff = psychrometrics.dehumidification(
+            climate_row("avg_summer_temp_C"), climate_row("relative_humidity"),
+            internal_temp, building_column("internal_relative_humidity")
+        )
+        ventilation_latent_W = 1.2 * air_flow_m3_s * humidity_ratio_diff * 2.5e6  # ρ × V × Δx × l
         ventilation_total_W = ventilation_sensible_W + ventilation_latent_W
         
         # Celková chladiaca potreba
@@ -139,7 +254,8 @@ class CoolingAnalyzer:
         total_latent_W = people_latent_W + ventilation_latent_W
         total_cooling_W = total_sensible_W + total_latent_W
         
-        return {
+        shape = (len(buildings), len(locations))
+        loads = {
             "people_W": people_total_W,
             "lighting_W": lighting_W,
             "equipment_W": equipment_W,
@@ -149,86 +265,313 @@ class CoolingAnalyzer:
             "total_sensible_W": total_sensible_W,
             "total_latent_W": total_latent_W,
             "total_cooling_W": total_cooling_W,
-            "specific_cooling_W_m2": total_cooling_W / building.floor_area_m2
+            "specific_cooling_W_m2": total_cooling_W / floor_area
         }
+        return {key: np.broadcast_to(value, shape) for key, value in loads.items()}
     
+    def cooling_season_profile(self, location: str = "bratislava",
+                               internal_temp_C: float = 24.0) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        Hodinový priebeh chladiacej sezóny z klimatických údajov lokality
+
+        Denné maximá teploty sú rozložené od priemernej letnej po návrhovú teplotu
+        (horúcich dní je málo), prevádzka trvá cooling_hours_per_day hodín okolo
+        15:00 s denným priebehom podľa ASHRAE. Záťaž je pri vnútornej teplote
+        polovičná (vnútorné zisky) a pri návrhovej teplote plná.
+
+        Returns:
+            (vonkajšia teplota [°C], podiel návrhovej záťaže [-], trvanie jednej vzorky [h])
+        """
+        climate = self._location_climate(location)
+        days = int(round(climate["cooling_days_per_year"]))
+        hours_per_day = int(math.ceil(climate["cooling_hours_per_day"]))
+        daily_range = 10.0  # denný rozkmit teploty [K]
+
+        quantile = (np.arange(days) + 0.5) / days
+        daily_max = climate["avg_summer_temp_C"] + (climate["design_temp_C"] - climate["avg_summer_temp_C"]) * quantile ** 2
+        hours = (15 - hours_per_day // 2 + np.arange(hours_per_day)) % 24
+        temperature = (daily_max[:, None] - daily_range * np.asarray(DAILY_RANGE_FRACTIONS)[hours]).ravel()
+
+        span = max(climate["design_temp_C"] - internal_temp_C, 1.0)
+        load_fraction = np.clip(0.5 + 0.5 * (temperature - internal_temp_C) / span, 0.0, 1.0)
+        annual_hours = climate["cooling_days_per_year"] * climate["cooling_hours_per_day"]
+        return temperature, load_fraction, annual_hours / temperature.size
+
     def calculate_system_performance(self, system: CoolingSystem, 
                                    cooling_load_W: float,
-                                   location: str = "bratislava") -> Dict[str, float]:
+                                   location: str = "bratislava",
+                                   hourly_load_W: Optional[np.ndarray] = None,
+                                   outdoor_temp_C: Optional[np.ndarray] = None) -> Dict[str, float]:
         """
         Výpočet výkonnostných parametrov chladiaceho systému
-        """
-        climate = self.slovak_climate_data.get(location, self.slovak_climate_data["bratislava"])
-        
-        # Prevádzkové hodiny za rok
-        annual_hours = climate["cooling_days_per_year"] * climate["cooling_hours_per_day"]
         
-        # COP závislý od vonkajšej teploty (zjednodušené)
-        temp_correction = 1 - (climate["avg_summer_temp_C"] - 25) * 0.02  # -2% na °C nad 25°C
-        effective_cop = system.cop * temp_correction
+        Spotreba sa integruje z hodinových hodnôt: výkon a EER zariadenia sa
+        určia z výkonovej mapy podľa vonkajšej teploty a čiastočného zaťaženia.
+        Bez zadaných hodinových rád sa použije cooling_season_profile lokality.
         
-        # Elektrická spotreba
-        electrical_power_W = cooling_load_W / effective_cop
-        annual_energy_kWh = electrical_power_W * annual_hours / 1000
+        Args:
+            system: chladiaci systém (COP = menovitý EER pri 35 °C a plnom zaťažení)
+            cooling_load_W: návrhová chladiaca záťaž [W]
+            location: lokalita
+            hourly_load_W: hodinová chladiaca záťaž [W] (napr. z metódy RTS)
+            outdoor_temp_C: vonkajšia teplota k hodinovej záťaži [°C]
+        """
+        climate = self._location_climate(location)
+        
+        if hourly_load_W is None:
+            outdoor_temp_C, load_fraction, hour_step = self.cooling_season_profile(location)
+            hourly_load_W = cooling_load_W * load_fraction
+        elif outdoor_temp_C is None:
+            raise ValueError("K hodinovej záťaži treba zadať aj hodinovú vonkajšiu teplotu")
+        else:
+            hour_step = 1.0
+        hourly_load_W = np.asarray(hourly_load_W, dtype=float)
+        operating = hourly_load_W > 0
+        annual_hours = float(np.count_nonzero(operating)) * hour_step
+        
+        # Hodinová prevádzka podľa výkonovej mapy
+        performance = performance_map(system.type)
+        operation = performance.operate(system.cooling_capacity_kW * 1000, system.cop,
+                                        hourly_load_W, outdoor_temp_C)
+        delivered_kWh = float(operation['delivered_W'].sum()) * hour_step / 1000
+        annual_energy_kWh = float(operation['electrical_power_W'].sum()) * hour_step / 1000
+        seasonal_cop = delivered_kWh / annual_energy_kWh if annual_energy_kWh > 0 else system.cop
+        
+        # Príkon v návrhovom bode
+        design = performance.operate(system.cooling_capacity_kW * 1000, system.cop,
+                                     cooling_load_W, climate["design_temp_C"])
+        electrical_power_W = float(design['electrical_power_W'])
         
         # Náklady
-        electricity_price_eur_kWh = 0.18  # priemer SR 2024
-        annual_energy_cost_eur = annual_energy_kWh * electricity_price_eur_kWh
+        annual_energy_cost_eur = annual_energy_kWh * ELECTRICITY_PRICE_EUR_KWH
         total_annual_cost_eur = annual_energy_cost_eur + system.annual_maintenance_cost_eur
         
         return {
-            "effective_cop": effective_cop,
+            "effective_cop": seasonal_cop,
+            "design_cop": float(design['eer']),
             "electrical_power_W": electrical_power_W,
             "annual_energy_kWh": annual_energy_kWh,
+            "annual_cooling_kWh": delivered_kWh,
+            "unmet_cooling_kWh": float(operation['unmet_W'].sum()) * hour_step / 1000,
             "annual_energy_cost_eur": annual_energy_cost_eur,
             "annual_maintenance_cost_eur": system.annual_maintenance_cost_eur,
             "total_annual_cost_eur": total_annual_cost_eur,
             "operating_hours": annual_hours
         }
     
+    def system_performance_arrays(self, systems: List[CoolingSystem],
+                                  cooling_load_W,
+                                  location: str = "bratislava") -> Dict[str, np.ndarray]:
+        """
+        Ročná prevádzka viacerých systémov naraz (ako calculate_system_performance)
+
+        Systémy rovnakého druhu zdieľajú výkonovú mapu, preto sa vyhodnotia
+        jedným vektorizovaným výpočtom [systém × hodina].
+
+        Args:
+            systems: chladiace systémy
+            cooling_load_W: návrhová chladiaca záťaž [W] (skalár alebo pole na systém)
+
+        Returns:
+            polia na systém: annual_energy_kWh, annual_cooling_kWh, unmet_cooling_kWh, effective_cop
+        """
+        n = len(systems)
+        design_load = np.broadcast_to(np.asarray(cooling_load_W, dtype=float), (n,))
+        performance = self._season_operation(systems, design_load[:, None], location)
+        return {key: value[:, 0] for key, value in performance.items()}
+
+    def _season_operation(self, systems: List[CoolingSystem],
+                          design_load: np.ndarray,
+                          location: str,
+                          block_size: int = 2_000_000) -> Dict[str, np.ndarray]:
+        """
+        Sezónna prevádzka systémov pri návrhových záťažiach design_load [systém × záťaž]
+
+        Systémy rovnakého druhu sa počítajú po blokoch [systém × záťaž × hodina]
+        s najviac block_size prvkami, aby pamäť nerástla s veľkosťou úlohy.
+        """
+        temperature, load_fraction, hour_step = self.cooling_season_profile(location)
+        n_loads = design_load.shape[1]
+        capacity = np.array([system.cooling_capacity_kW * 1000 for system in systems], dtype=float)
+        cop = np.array([system.cop for system in systems], dtype=float)
+        design_load = np.broadcast_to(design_load, (len(systems), n_loads))
+
+        energy, delivered, unmet = (np.zeros((len(systems), n_loads)) for _ in range(3))
+        types = np.array([system.type for system in systems], dtype=object)
+        step = max(1, block_size // (n_loads * temperature.size))
+        for system_type in dict.fromkeys(types):
+            performance = performance_map(system_type)
+            group = np.flatnonzero(types == system_type)
+            for start in range(0, group.size, step):
+                index = group[start:start + step]
+                operation = performance.operate(
+                    capacity[index, None, None], cop[index, None, None],
+                    design_load[index, :, None] * load_fraction, temperature
+                )
+                energy[index] = operation['electrical_power_W'].sum(axis=2)
+                delivered[index] = operation['delivered_W'].sum(axis=2)
+                unmet[index] = operation['unmet_W'].sum(axis=2)
+
+        energy *= hour_step / 1000
+        delivered *= hour_step / 1000
+        unmet *= hour_step / 1000
+        return {
+            'annual_energy_kWh': energy,
+            'annual_cooling_kWh': delivered,
+            'unmet_cooling_kWh': unmet,
+            'effective_cop': np.divide(delivered, energy, out=np.broadcast_to(cop[:, None], energy.shape).copy(),
+                                       where=energy > 0),
+        }
+
+    def lifecycle_cost_analysis(self, systems: List[CoolingSystem],
+                                cooling_load_W,
+                                discount_rates=(0.04,),
+                                energy_prices=(ELECTRICITY_PRICE_EUR_KWH,),
+                                analysis_periods=(20,),
+                                energy_price_escalation: float = 0.0,
+                                location: str = "bratislava") -> pd.DataFrame:
+        """
+        Náklady životného cyklu pre všetky kombinácie systémov a scenárov
+
+        Spotreba systémov sa vypočíta raz; súčasná hodnota prevádzkových nákladov
+        je anuitný faktor (present_value_factor) vysielaný cez pole
+        [systém × diskontná sadzba × cena energie × obdobie].
+
+        Returns:
+            tabuľka s jedným riadkom na kombináciu systém × scenár
+        """
+        performance = self.system_performance_arrays(systems, cooling_load_W, location)
+        rates = np.asarray(discount_rates, dtype=float)
+        prices = np.asarray(energy_prices, dtype=float)
+        periods = np.asarray(analysis_periods, dtype=float)
+
+        installation = np.array([system.installation_cost_eur for system in systems], dtype=float)
+        maintenance = np.array([system.annual_maintenance_cost_eur for system in systems], dtype=float)
+        energy = performance['annual_energy_kWh']
+
+        # Osi: systém, diskontná sadzba, cena energie, obdobie
+        annual_cost = energy[:, None, None, None] * prices[None, None, :, None] + maintenance[:, None, None, None]
+        factor = present_value_factor(rates[None, :, None, None], periods[None, None, None, :],
+                                      energy_price_escalation)
+        lcc = installation[:, None, None, None] + annual_cost * factor
+        shape = lcc.shape
+        with np.errstate(divide='ignore'):
+            payback = np.where(annual_cost > 0, installation[:, None, None, None] / annual_cost, np.inf)
+
+        system_index = np.broadcast_to(np.arange(len(systems))[:, None, None, None], shape).ravel()
+        return pd.DataFrame({
+            'Systém': np.array([system.name for system in systems], dtype=object)[system_index],
+            'Typ': np.array([system.type for system in systems], dtype=object)[system_index],
+            'Diskontná sadzba [-]': np.broadcast_to(rates[None, :, None, None], shape).ravel(),
+            'Cena elektriny [€/kWh]': np.broadcast_to(prices[None, None, :, None], shape).ravel(),
+            'Obdobie [roky]': np.broadcast_to(periods[None, None, None, :], shape).ravel(),
+            'Investične náklady [€]': installation[system_index],
+            'Ročná spotreba [kWh]': energy[system_index],
+            'Ročné náklady [€/rok]': np.broadcast_to(annual_cost, shape).ravel(),
+            'LCC [€]': lcc.ravel(),
+            'Payback [roky]': np.minimum(np.broadcast_to(payback, shape).ravel(), 99),
+            'NPV [€]': -lcc.ravel(),  # záporné = náklad
+        })
+
     def economic_analysis(self, systems: List[CoolingSystem], 
                          cooling_load_W: float,
                          analysis_period_years: int = 20,
                          discount_rate: float = 0.04) -> pd.DataFrame:
         """
         Ekonomická analýza rôznych chladiacich systémov
+        
+        Jeden scenár lifecycle_cost_analysis so stĺpcami pôvodnej tabuľky.
         """
-        results = []
-        
-        for system in systems:
-            perf = self.calculate_system_performance(system, cooling_load_W)
-            
-            # NPV výpočet
-            annual_costs = perf["total_annual_cost_eur"]
-            
-            # Súčasná hodnota prevádzkových nákladov
-            pv_operating_costs = 0
-            for year in range(1, analysis_period_years + 1):
-                pv_operating_costs += annual_costs / ((1 + discount_rate) ** year)
-            
-            # Celkové náklady životného cyklu
-            total_lcc = system.installation_cost_eur + pv_operating_costs
-            
-            # Payback period (zjednodušené)
-            if annual_costs > 0:
-                payback_years = system.installation_cost_eur / annual_costs
-            else:
-                payback_years = float('inf')
-            
-            results.append({
-                'Systém': system.name,
-                'Typ': system.type,
-                'Chladiaci výkon [kW]': system.cooling_capacity_kW,
-                'COP [-]': system.cop,
-                'Investične náklady [€]': system.installation_cost_eur,
-                'Ročné náklady [€/rok]': perf["total_annual_cost_eur"],
-                'Ročná spotreba [kWh]': perf["annual_energy_kWh"],
-                'LCC 20 rokov [€]': total_lcc,
-                'Payback [roky]': min(payback_years, 99),
-                'NPV [€]': -total_lcc  # záporné = náklad
-            })
-        
-        return pd.DataFrame(results).round(2)
+        lcc = self.lifecycle_cost_analysis(systems, cooling_load_W, [discount_rate],
+                                           [ELECTRICITY_PRICE_EUR_KWH], [analysis_period_years])
+        return pd.DataFrame({
+            'Systém': lcc['Systém'],
+            'Typ': lcc['Typ'],
+            'Chladiaci výkon [kW]': [system.cooling_capacity_kW for system in systems],
+            'COP [-]': [system.cop for system in systems],
+            'Investične náklady [€]': lcc['Investične náklady [€]'],
+            'Ročné náklady [€/rok]': lcc['Ročné náklady [€/rok]'],
+            'Ročná spotreba [kWh]': lcc['Ročná spotreba [kWh]'],
+            'LCC 20 rokov [€]': lcc['LCC [€]'],
+            'Payback [roky]': lcc['Payback [roky]'],
+            'NPV [€]': lcc['NPV [€]'],
+        }).round(2)
+    
+    def run_scenario_grid(self, buildings: List[BuildingParameters],
+                          locations: List[str],
+                          systems: List[CoolingSystem],
+                          analysis_period_years: int = 20,
+                          discount_rate: float = 0.04,
+                          energy_price: float = ELECTRICITY_PRICE_EUR_KWH,
+                          energy_price_escalation: float = 0.0,
+                          workers: Optional[int] = 0,
+                          chunk_size: int = 64,
+                          output_path: Optional[str] = None) -> ScenarioGridResult:
+        """
+        Všetky kombinácie budova × lokalita × systém
+        
+        Chladiaca potreba sa počíta naraz pre [budova × lokalita], sezónna
+        prevádzka po lokalitách a druhoch systémov nad [systém × budova × hodina]
+        a ekonomika ako v lifecycle_cost_analysis. Pri workers != 0 sa budovy
+        rozdelia na bloky po chunk_size a bloky sa počítajú v samostatných procesoch.
+        
+        Args:
+            workers: počet procesov (None = počet jadier, 0 = bez paralelizácie)
+            chunk_size: počet budov v jednej úlohe
+            output_path: súbor pre stĺpcové výsledky (nepovinné, prípona .npz sa doplní)
+        
+        Returns:
+            výsledky s poliami [budova × lokalita × systém]
+        """
+        options = dict(analysis_period_years=analysis_period_years, discount_rate=discount_rate,
+                       energy_price=energy_price, energy_price_escalation=energy_price_escalation)
+        if workers == 0 or len(buildings) <= chunk_size:
+            values = self._scenario_grid_values(buildings, locations, systems, **options)
+        else:
+            chunks = [buildings[start:start + chunk_size] for start in range(0, len(buildings), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+                parts = list(executor.map(_scenario_grid_chunk, [self] * len(chunks), chunks,
+                                          [locations] * len(chunks), [systems] * len(chunks),
+                                          [options] * len(chunks)))
+            values = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+        
+        result = ScenarioGridResult([building.name for building in buildings], list(locations),
+                                    [system.name for system in systems], values)
+        if output_path is not None:
+            result.save(output_path)
+        return result
+    
+    def _scenario_grid_values(self, buildings: List[BuildingParameters],
+                              locations: List[str],
+                              systems: List[CoolingSystem],
+                              analysis_period_years: int,
+                              discount_rate: float,
+                              energy_price: float,
+                              energy_price_escalation: float) -> Dict[str, np.ndarray]:
+        """Vektorizované jadro run_scenario_grid, polia [budova × lokalita × systém]"""
+        shape = (len(buildings), len(locations), len(systems))
+        cooling_load = self.cooling_load_grid(buildings, locations)["total_cooling_W"]
+        
+        performance = {}
+        for l, location in enumerate(locations):
+            season = self._season_operation(systems, cooling_load[None, :, l], location)
+            for key, value in season.items():
+                performance.setdefault(key, np.zeros(shape))[:, l, :] = value.T
+        
+        installation = np.array([system.installation_cost_eur for system in systems], dtype=float)
+        maintenance = np.array([system.annual_maintenance_cost_eur for system in systems], dtype=float)
+        annual_cost = performance['annual_energy_kWh'] * energy_price + maintenance
+        factor = present_value_factor(discount_rate, analysis_period_years, energy_price_escalation)
+        with np.errstate(divide='ignore'):
+            payback = np.where(annual_cost > 0, installation / annual_cost, np.inf)
+        
+        return {
+            'cooling_load_W': np.broadcast_to(cooling_load[:, :, None], shape).copy(),
+            **performance,
+            'total_annual_cost_eur': annual_cost,
+            'lcc_eur': installation + annual_cost * factor,
+            'payback_years': np.minimum(payback, 99),
+        }
     
     def create_cooling_load_chart(self, cooling_loads: Dict[str, float], 
                                 building_name: str = "Budova") -> None:
@@ -331,6 +674,12 @@ class CoolingAnalyzer:
         plt.close()
         print("✓ Graf uložený ako: porovnanie_chladiacich_systemov.png")
 
+def _scenario_grid_chunk(analyzer: CoolingAnalyzer, buildings: List[BuildingParameters],
+                         locations: List[str], systems: List[CoolingSystem],
+                         options: dict) -> Dict[str, np.ndarray]:
+    """Úloha pre proces: jeden blok budov mriežky scenárov"""
+    return analyzer._scenario_grid_values(buildings, locations, systems, **options)
+
 def create_example_analysis():
     """
     Príklad analýzy pre administratívnu budovu
@@ -8,6 +8,25 @@ Implementované podľa skrípt "Energetické hodnotenie budov" (Krajčík, Petr
 Hlavné moduly:
 - models: Dátové modely pre budovy, konštrukcie, materiály
 - calculations: Výpočtové moduly pre tepelno-technické vlastnosti
+- batch: Vektorizované výpočty potreby tepla pre portfólio budov
+- columnar: Stĺpcové úložisko portfólia budov (BuildingStore) a jeho binárny súbor
+- dynamic: Hodinová simulácia vykurovania a chladenia (RC model)
+- monthly: Mesačná bilancia potreby tepla (STN EN ISO 13790)
+- retrofit: Parametrická štúdia variantov obnovy
+- optimizer: Pareto-optimálne kombinácie opatrení obnovy (náklady vs. úspory)
+- uncertainty: Šírenie neistôt vstupov metódou Monte Carlo
+- sensitivity: Citlivostná analýza vstupov (Morris, Sobol)
+- hydraulics: Model potrubnej siete a hydraulický výpočet (GGA)
+- balancing: Návrh nastavení ventilov pre hydraulické vyregulovanie
+- water_properties: Teplotne závislé vlastnosti vody (hustota, viskozita, merná tepelná kapacita)
+- pipe_sizing: Dimenzovanie potrubia podľa katalógu rúr
+- cli: Príkazový riadok pre dávkový audit (python -m energy_audit, JSONL)
+- cache: Vyrovnávacia pamäť výsledkov výpočtov (LRU v pamäti, SQLite na disku)
+- incremental: Prírastkový prepočet potreby tepla po úpravách modelu
+- climate: úložisko hodinových klimatických údajov staníc a vyhľadanie najbližšej stanice
+- psychrometrics: psychrometria vlhkého vzduchu pre latentné chladiace záťaže
+- rts: hodinová chladiaca záťaž zón metódou radiačných časových radov (RTS)
+- performance_maps: výkonové mapy chladiacich zariadení (výkon a EER podľa teploty a zaťaženia)
 - heating: Výpočty potreby tepla a energie na vykurovanie
 - hot_water: Výpočty potreby energie na prípravu TV
 - standards: Implementácia STN noriem a požiadaviek
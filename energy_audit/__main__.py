@@ -0,0 +1,10 @@
+"""
+Spustenie: python -m energy_audit [vstup.jsonl] [-o výstup.jsonl] [-j procesy]
+"""
+
+import sys
+
+from .cli import main
+
+
+sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Hydraulické vyregulovanie celej sústavy
+Súčasný návrh nastavení všetkých prednastaviteľných ventilov a dopravného tlaku čerpadla
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .hydraulics import PipeNetwork, NetworkSolution, kv_pressure_loss
+
+
+@dataclass
+class BalancingResult:
+    """Výsledok vyregulovania (polia v poradí telies siete)"""
+    terminal_names: List[str]
+    presets: np.ndarray  # nastavenia ventilov (nan = teleso bez prednastavenia)
+    kv: np.ndarray  # Kv pri nastavení [m³/h]
+    valve_pressure_drop: np.ndarray  # tlaková strata ventilu pri návrhovom prietoku [Pa]
+    design_flow: np.ndarray  # [kg/s]
+    achieved_flow: np.ndarray  # prietok overený výpočtom siete [kg/s]
+    pump_pressure: float  # dopravný tlak čerpadla [Pa]
+    index_terminal: str  # teleso na najnepriaznivejšom okruhu (ventil plne otvorený)
+    clamped: np.ndarray  # ventil na najmenšom nastavení nedokáže uškrtiť prebytok tlaku
+    iterations: int  # počet opakovaní návrhu
+    solution: NetworkSolution
+
+    @property
+    def flow_error(self) -> np.ndarray:
+        """Relatívna odchýlka prietoku od návrhového [-]"""
+        return self.achieved_flow / self.design_flow - 1.0
+
+    @property
+    def max_flow_error(self) -> float:
+        return float(np.max(np.abs(self.flow_error))) if len(self.design_flow) else 0.0
+
+    def report(self) -> List[Dict]:
+        """Tabuľka nastavení a odchýlok prietoku pre každé teleso"""
+        return [
+            {
+                'terminal': name,
+                'preset': float(self.presets[i]),
+                'kv': float(self.kv[i]),
+                'valve_pressure_drop_Pa': float(self.valve_pressure_drop[i]),
+                'design_flow_kg_s': float(self.design_flow[i]),
+                'achieved_flow_kg_s': float(self.achieved_flow[i]),
+                'flow_error_percent': float(self.flow_error[i] * 100),
+                'clamped': bool(self.clamped[i]),
+            }
+            for i, name in enumerate(self.terminal_names)
+        ]
+
+
+class ValvePresetOptimizer:
+    """
+    Návrh nastavení prednastaviteľných ventilov telies
+
+    Pri návrhových prietokoch telies sú prietoky v celom rozvode určené
+    rovnicami kontinuity, preto sa tlakové straty rozvodu vypočítajú jedným
+    hydraulickým výpočtom siete s telesami nahradenými odbermi. Najmenší
+    dopravný tlak čerpadla je daný najnepriaznivejším okruhom s plne
+    otvoreným ventilom; ostatné ventily škrtia prebytok dispozičného tlaku.
+    Kv sa prevedie na nastavenie podľa katalógovej charakteristiky
+    a výsledok sa overí výpočtom siete s novými nastaveniami. Nastavenia
+    ventilov a tlak na výtlaku čerpadla sa pritom zapíšu do siete
+    (optimize(apply=False) ich po overení vráti späť).
+    Telesá bez katalógu ventilu majú pevné Kv, vyvažovacie ventily
+    rozvodu sa uvažujú s aktuálnym nastavením.
+    """
+
+    def __init__(self,
+                 network: PipeNetwork,
+                 pump_node: Optional[str] = None,
+                 min_valve_pressure_drop: float = 3000.0,
+                 pressure_margin: float = 0.0):
+        """
+        Args:
+            network: sieť s návrhovými prietokmi telies a zadanými tlakmi
+                na spiatočke a výtlaku čerpadla
+            pump_node: uzol výtlaku čerpadla (predvolene uzol s najvyšším zadaným tlakom)
+            min_valve_pressure_drop: najmenšia tlaková strata ventilu pre dostatočnú autoritu [Pa]
+            pressure_margin: rezerva dopravného tlaku čerpadla [Pa]
+        """
+        if len(network.fixed_pressure) < 2:
+            raise ValueError("Sieť musí mať zadaný tlak na spiatočke aj na výtlaku čerpadla")
+        self.network = network
+        if pump_node is None:
+            self.pump_node = max(network.fixed_pressure, key=network.fixed_pressure.get)
+        else:
+            self.pump_node = network.node_index[pump_node]
+        self.min_valve_pressure_drop = min_valve_pressure_drop
+        self.pressure_margin = pressure_margin
+
+    def optimize(self, apply: bool = True, max_iterations: int = 20,
+                 tolerance: float = 1e-3) -> BalancingResult:
+        """
+        Návrh nastavení ventilov a dopravného tlaku čerpadla
+
+        Ventil, ktorý ani na najmenšom nastavení neuškrtí prebytok
+        dispozičného tlaku, zostane na najmenšom nastavení a jeho prietok
+        prekročí návrhový (BalancingResult.clamped). Takéto telesá menia
+        prietoky v rozvode, preto sa návrh opakuje s ich prietokmi
+        z overovacieho výpočtu, kým sa neustália; ostatné telesá sa nastavia
+        na návrhový prietok pri skutočnom zaťažení rozvodu.
+
+        Args:
+            apply: ponechať nastavenia ventilov a tlak čerpadla v sieti
+                (inak sa po overení obnoví pôvodný stav siete)
+            max_iterations: najväčší počet opakovaní návrhu
+            tolerance: relatívna zmena prietokov telies na najmenšom nastavení [-]
+        """
+        network = self.network
+        terminals = network.terminals()
+        saved = (network.fixed_pressure[self.pump_node],
+                 [network.preset[t] for t in terminals], [network.kv[t] for t in terminals])
+
+        def restore():
+            network.fixed_pressure[self.pump_node] = saved[0]
+            for t, preset, kv in zip(terminals, saved[1], saved[2]):
+                network.preset[t] = preset
+                network.kv[t] = kv
+
+        try:
+            result = self._optimize(terminals, max_iterations, tolerance)
+        except BaseException:
+            restore()
+            raise
+        if not apply:
+            restore()
+        return result
+
+    def _optimize(self, terminals: np.ndarray, max_iterations: int, tolerance: float) -> BalancingResult:
+        network = self.network
+        presettable = np.array([network.catalogue[t] is not None for t in terminals], dtype=bool)
+        design = np.array([network.design_flow[t] for t in terminals])
+        if len(terminals) == 0 or np.any(design <= 0):
+            raise ValueError("Všetky telesá musia mať kladný návrhový prietok")
+        start = np.array([network.link_start[t] for t in terminals])
+        end = np.array([network.link_end[t] for t in terminals])
+        kv = np.array([network.kv[t] for t in terminals])
+
+        # Najmenšia potrebná tlaková strata telies (plne otvorený ventil, autorita)
+        kv_open = kv.copy()
+        kv_min = np.zeros(len(terminals))
+        for t_idx in np.flatnonzero(presettable):
+            kv_open[t_idx] = network.catalogue[terminals[t_idx]].kv_max
+            kv_min[t_idx] = network.catalogue[terminals[t_idx]].kv_min
+        required = kv_pressure_loss(design, kv_open, network.density)
+        required = np.where(presettable, np.maximum(required, self.min_valve_pressure_drop), required)
+
+        groups: Dict[int, List[int]] = {}
+        for t_idx in np.flatnonzero(presettable):
+            groups.setdefault(id(network.catalogue[terminals[t_idx]]), []).append(t_idx)
+
+        active = np.ones(network.n_links, dtype=bool)
+        active[terminals] = False
+        flow = design.copy()  # odbery telies pri výpočte rozvodu
+        for iteration in range(1, max_iterations + 1):
+            # Rozvod pri prietokoch telies: telesá nahradené odbermi
+            demand = np.zeros(network.n_nodes)
+            np.add.at(demand, start, flow)
+            np.add.at(demand, end, -flow)
+            distribution = network.solve(node_demand=demand, active=active)
+            if not distribution.converged:
+                raise RuntimeError("Hydraulický výpočet rozvodu nekonvergoval")
+
+            # Strata rozvodu po okruhoch: Δp na telese = p_čerpadla - strata okruhu
+            pump_pressure = network.fixed_pressure[self.pump_node]
+            circuit_loss = pump_pressure - (distribution.pressure[start] - distribution.pressure[end])
+
+            index = int(np.argmax(circuit_loss + required))
+            pump_pressure = float(circuit_loss[index] + required[index] + self.pressure_margin)
+
+            # Kv, ktoré pri návrhovom prietoku spotrebuje zvyšný dispozičný tlak
+            available = pump_pressure - circuit_loss
+            kv_required = design / network.density * 3600 / np.sqrt(available / 1e5)
+            clamped = presettable & (kv_required < kv_min)
+
+            presets = np.full(len(terminals), np.nan)
+            for members in groups.values():
+                members = np.array(members)
+                catalogue = network.catalogue[terminals[members[0]]]
+                presets[members] = catalogue.preset(kv_required[members])
+            network.set_presets(terminals[presettable], presets[presettable])
+            network.fixed_pressure[self.pump_node] = pump_pressure
+
+            # Overenie: výpočet siete s novými nastaveniami
+            initial = distribution.flow.copy()
+            initial[terminals] = flow
+            solution = network.solve(initial_flow=initial)
+            achieved = solution.flow[terminals]
+
+            updated = np.where(clamped, achieved, design)
+            if np.max(np.abs(updated - flow) / design) <= tolerance:
+                break
+            flow = updated
+
+        kv = np.array([network.kv[t] for t in terminals])
+        return BalancingResult(
+            terminal_names=[network.link_names[t] for t in terminals],
+            presets=presets,
+            kv=kv,
+            valve_pressure_drop=kv_pressure_loss(design, kv, network.density),
+            design_flow=design,
+            achieved_flow=achieved,
+            pump_pressure=pump_pressure,
+            index_terminal=network.link_names[terminals[index]],
+            clamped=clamped,
+            iterations=iteration,
+            solution=solution,
+        )
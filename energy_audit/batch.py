@@ -0,0 +1,330 @@
+"""
+Dávkové (vektorizované) výpočty potreby tepla pre portfólio budov
+Výsledky sú zhodné so skalárnymi výpočtami v HeatingCalculations
+"""
+
+import os
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .models import Building, BuildingCategory, ClimateData, ConstructionType
+from .columnar import BuildingStore, BUILDING_CATEGORIES, CONSTRUCTION_TYPES
+
+
+# Špecifický tepelný výkon vnútorných zdrojov [W/m²] (rovnica 2.7 zo skrípt)
+INTERNAL_GAINS_BY_CATEGORY = {
+    BuildingCategory.APARTMENT_BUILDING: 5.0,
+    BuildingCategory.FAMILY_HOUSE: 4.0,
+}
+DEFAULT_INTERNAL_GAINS = 6.0  # W/m² pre nebytové budovy
+
+# Konštrukcie s redukčným faktorom bx = 1.0 (ostatné 0.5)
+EXTERNAL_CONSTRUCTION_TYPES = (ConstructionType.EXTERNAL_WALL, ConstructionType.ROOF)
+
+# Vyhľadávacie polia podľa kódov enumerácií v BuildingStore
+INTERNAL_GAINS_BY_CODE = np.array([
+    INTERNAL_GAINS_BY_CATEGORY.get(category, DEFAULT_INTERNAL_GAINS) for category in BUILDING_CATEGORIES
+])
+BX_BY_CONSTRUCTION_CODE = np.array([
+    1.0 if construction_type in EXTERNAL_CONSTRUCTION_TYPES else 0.5 for construction_type in CONSTRUCTION_TYPES
+])
+
+
+Portfolio = Union[Sequence[Building], BuildingStore, str, os.PathLike]
+ClimateInput = Union[ClimateData, Sequence[ClimateData]]
+
+
+class BatchHeatingCalculations:
+    """
+    Vektorizované výpočty potreby tepla na vykurovanie pre celé portfólio budov
+
+    Každá metóda vracia pole hodnôt (jedna hodnota na budovu) v poradí vstupu.
+    Sčítavanie prebieha v rovnakom poradí ako v HeatingCalculations,
+    preto sú výsledky bitovo zhodné so skalárnym výpočtom.
+    """
+
+    @staticmethod
+    def as_store(portfolio: Portfolio) -> BuildingStore:
+        """Portfólio ako BuildingStore (zoznam budov sa skonvertuje, súbor sa namapuje)"""
+        if isinstance(portfolio, BuildingStore):
+            return portfolio
+        if isinstance(portfolio, (str, os.PathLike)):
+            return BuildingStore.open(portfolio)
+        return BuildingStore.from_buildings(portfolio)
+
+    @staticmethod
+    def _sum_per_building(arrays: BuildingStore,
+                          construction_values: np.ndarray,
+                          window_values: np.ndarray) -> np.ndarray:
+        """
+        Súčet hodnôt konštrukcií a okien po budovách v poradí skalárneho výpočtu
+        (pre každú zónu najprv konštrukcie, potom okná)
+        """
+        zones = np.concatenate([arrays.construction_zone, arrays.window_zone])
+        values = np.concatenate([construction_values, window_values])
+        order = np.argsort(zones, kind='stable')
+        # np.bincount sčítava postupne v poradí prvkov
+        return np.bincount(arrays.zone_building[zones[order]], weights=values[order],
+                           minlength=arrays.n_buildings)
+
+    @staticmethod
+    def _sum_zones_per_building(arrays: BuildingStore, zone_values: np.ndarray) -> np.ndarray:
+        return np.bincount(arrays.zone_building, weights=zone_values, minlength=arrays.n_buildings)
+
+    @staticmethod
+    def _per_building(value, n_buildings: int) -> np.ndarray:
+        """Rozšírenie skalárneho parametra na pole po budovách"""
+        values = np.asarray(value, dtype=np.float64)
+        if values.ndim == 0:
+            return np.full(n_buildings, float(values))
+        if values.shape != (n_buildings,):
+            raise ValueError("Počet hodnôt parametra nezodpovedá počtu budov")
+        return values
+
+    @staticmethod
+    def climates_per_building(climate_data: ClimateInput, n_buildings: int) -> List[ClimateData]:
+        """Klimatické údaje pre každú budovu (spoločné sa zopakujú)"""
+        if isinstance(climate_data, ClimateData):
+            return [climate_data] * n_buildings
+        climates = list(climate_data)
+        if len(climates) != n_buildings:
+            raise ValueError("Počet klimatických údajov nezodpovedá počtu budov")
+        return climates
+
+    @staticmethod
+    def calculate_u_values(portfolio: Portfolio) -> np.ndarray:
+        """Súčinitele prechodu tepla U všetkých konštrukcií [W/(m².K)]"""
+        arrays = BatchHeatingCalculations.as_store(portfolio)
+        if np.any(arrays.layer_conductivity <= 0):
+            raise ValueError("Tepelná vodivosť musí byť kladná")
+
+        layer_resistance = arrays.layer_thickness / arrays.layer_conductivity
+        layers_sum = np.bincount(arrays.layer_construction, weights=layer_resistance,
+                                 minlength=len(arrays.construction_zone))
+        r_total = arrays.construction_rsi + layers_sum + arrays.construction_rse
+        if np.any(r_total <= 0):
+            raise ValueError("Celkový tepelný odpor musí byť kladný")
+        return 1.0 / r_total
+
+    @staticmethod
+    def calculate_envelope_area(portfolio: Portfolio) -> np.ndarray:
+        """Plocha teplovýmenného obalu jednotlivých budov [m²]"""
+        arrays = BatchHeatingCalculations.as_store(portfolio)
+        return BatchHeatingCalculations._sum_per_building(
+            arrays, arrays.construction_area, arrays.window_area
+        )
+
+    @staticmethod
+    def calculate_transmission_heat_loss_coefficient(portfolio: Portfolio,
+                                                     thermal_bridges_delta_u: float = 0.1) -> np.ndarray:
+        """Merná tepelná strata prechodom tepla HT [W/K] pre každú budovu"""
+        arrays = BatchHeatingCalculations.as_store(portfolio)
+        u_values = BatchHeatingCalculations.calculate_u_values(arrays)
+
+        ht = BatchHeatingCalculations._sum_per_building(
+            arrays,
+            BX_BY_CONSTRUCTION_CODE[arrays.construction_type] * u_values * arrays.construction_area,
+            arrays.window_u_value * arrays.window_area,
+        )
+        envelope_area = BatchHeatingCalculations.calculate_envelope_area(arrays)
+        return ht + thermal_bridges_delta_u * envelope_area
+
+    @staticmethod
+    def calculate_zone_transmission_heat_loss_coefficient(portfolio: Portfolio,
+                                                          thermal_bridges_delta_u: float = 0.1) -> np.ndarray:
+        """Merná tepelná strata prechodom tepla HT [W/K] pre každú zónu"""
+        arrays = BatchHeatingCalculations.as_store(portfolio)
+        n_zones = len(arrays.zone_name)
+        u_values = BatchHeatingCalculations.calculate_u_values(arrays)
+
+        constructions = BX_BY_CONSTRUCTION_CODE[arrays.construction_type] * u_values * arrays.construction_area
+        ht = (np.bincount(arrays.construction_zone, weights=constructions, minlength=n_zones)
+              + np.bincount(arrays.window_zone, weights=arrays.window_u_value * arrays.window_area,
+                            minlength=n_zones))
+        envelope_area = (np.bincount(arrays.construction_zone, weights=arrays.construction_area,
+                                     minlength=n_zones)
+                         + np.bincount(arrays.window_zone, weights=arrays.window_area, minlength=n_zones))
+        return ht + thermal_bridges_delta_u * envelope_area
+
+    @staticmethod
+    def calculate_zone_ventilation_heat_loss_coefficient(portfolio: Portfolio,
+                                                         air_change_rate) -> np.ndarray:
+        """Merná tepelná strata vetraním HV [W/K] pre každú zónu"""
+        arrays = BatchHeatingCalculations.as_store(portfolio)
+        n = BatchHeatingCalculations._per_building(air_change_rate, arrays.n_buildings)
+        return (0.85 * 1.2 * 1010 * n[arrays.zone_building] * arrays.zone_volume) / 3600
+
+    @staticmethod
+    def calculate_zone_solar_apertures(portfolio: Portfolio) -> Tuple[List[str], np.ndarray]:
+        """
+        Účinné kolekčné plochy okien zón podľa orientácie [m²]
+        vrátane tieniaceho faktora vonkajších prekážok (0.8)
+
+        Returns:
+            (orientácie, pole tvaru [zóna × orientácia])
+        """
+        arrays = BatchHeatingCalculations.as_store(portfolio)
+        orientations, window_orientation = arrays.window_orientation_codes
+        a_sol = 0.8 * (arrays.window_shading_factor * arrays.window_g_value * 0.8 * arrays.window_area)
+
+        apertures = np.zeros((len(arrays.zone_name), len(orientations)))
+        np.add.at(apertures, (arrays.window_zone, window_orientation), a_sol)
+        return orientations, apertures
+
+    @staticmethod
+    def calculate_zone_internal_gains(portfolio: Portfolio) -> np.ndarray:
+        """Tepelný výkon vnútorných zdrojov [W] pre každú zónu"""
+        arrays = BatchHeatingCalculations.as_store(portfolio)
+        return INTERNAL_GAINS_BY_CODE[arrays.building_category][arrays.zone_building] * arrays.zone_floor_area
+
+    @staticmethod
+    def calculate_ventilation_heat_loss_coefficient(portfolio: Portfolio,
+                                                    air_change_rate) -> np.ndarray:
+        """Merná tepelná strata vetraním HV [W/K] pre každú budovu"""
+        arrays = BatchHeatingCalculations.as_store(portfolio)
+        n = BatchHeatingCalculations._per_building(air_change_rate, arrays.n_buildings)
+
+        rho_air = 1.2  # kg/m³
+        c_air = 1010   # J/(kg.K)
+        volume_ratio = 0.85
+
+        volume = BatchHeatingCalculations._sum_zones_per_building(arrays, arrays.zone_volume)
+        return (volume_ratio * rho_air * c_air * n * volume) / 3600
+
+    @staticmethod
+    def calculate_total_heat_loss(portfolio: Portfolio,
+                                  climate_data: ClimateInput,
+                                  air_change_rate) -> np.ndarray:
+        """Celková tepelná strata Qht [kWh] pre každú budovu"""
+        arrays = BatchHeatingCalculations.as_store(portfolio)
+        climates = BatchHeatingCalculations.climates_per_building(climate_data, arrays.n_buildings)
+
+        ht = BatchHeatingCalculations.calculate_transmission_heat_loss_coefficient(arrays)
+        hv = BatchHeatingCalculations.calculate_ventilation_heat_loss_coefficient(arrays, air_change_rate)
+
+        theta_int = 20.0
+        theta_e = np.array([c.external_temperature for c in climates], dtype=np.float64)
+        heating_days = np.array([c.heating_days for c in climates], dtype=np.float64)
+
+        return (ht + hv) * (theta_int - theta_e) * heating_days * 0.024
+
+    @staticmethod
+    def calculate_internal_heat_gains(portfolio: Portfolio,
+                                      climate_data: ClimateInput) -> np.ndarray:
+        """Vnútorné tepelné zisky Qint [kWh] pre každú budovu"""
+        arrays = BatchHeatingCalculations.as_store(portfolio)
+        climates = BatchHeatingCalculations.climates_per_building(climate_data, arrays.n_buildings)
+
+        floor_area = BatchHeatingCalculations._sum_zones_per_building(arrays, arrays.zone_floor_area)
+        heating_days = np.array([c.heating_days for c in climates], dtype=np.float64)
+
+        qi = INTERNAL_GAINS_BY_CODE[arrays.building_category]
+        return qi * 0.024 * heating_days * floor_area
+
+    @staticmethod
+    def solar_radiation_table(arrays: BuildingStore,
+                               climates: List[ClimateData]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tabuľka intenzity slnečného žiarenia [unikátna klíma × orientácia]
+        a index klímy pre každú budovu
+        """
+        climate_codes: Dict[int, int] = {}
+        unique_climates: List[ClimateData] = []
+        climate_index = np.empty(arrays.n_buildings, dtype=np.int64)
+        for b_idx, climate in enumerate(climates):
+            code = climate_codes.get(id(climate))
+            if code is None:
+                code = climate_codes[id(climate)] = len(unique_climates)
+                unique_climates.append(climate)
+            climate_index[b_idx] = code
+
+        orientations, _ = arrays.window_orientation_codes
+        table = np.full((len(unique_climates), len(orientations)), np.nan)
+        for c_idx, climate in enumerate(unique_climates):
+            for o_idx, orientation in enumerate(orientations):
+                if orientation not in climate.solar_radiation:
+                    orientation = 'J'  # default na juh
+                if orientation in climate.solar_radiation:
+                    table[c_idx, o_idx] = climate.solar_radiation[orientation]
+        return table, climate_index
+
+    @staticmethod
+    def window_solar_radiation(arrays: BuildingStore, climates: List[ClimateData]) -> np.ndarray:
+        """
+        Intenzita slnečného žiarenia pre každé okno [kWh/m²]
+
+        Raises:
+            KeyError: klíma nemá orientáciu okna ani náhradnú 'J' (ako skalárny výpočet)
+        """
+        table, climate_index = BatchHeatingCalculations.solar_radiation_table(arrays, climates)
+        window_building = arrays.zone_building[arrays.window_zone]
+        _, window_orientation = arrays.window_orientation_codes
+        i_sol = table[climate_index[window_building], window_orientation]
+        if np.any(np.isnan(i_sol)):
+            raise KeyError('J')
+        return i_sol
+
+    @staticmethod
+    def calculate_solar_heat_gains(portfolio: Portfolio,
+                                   climate_data: ClimateInput) -> np.ndarray:
+        """Solárne tepelné zisky Qsol [kWh] pre každú budovu"""
+        arrays = BatchHeatingCalculations.as_store(portfolio)
+        climates = BatchHeatingCalculations.climates_per_building(climate_data, arrays.n_buildings)
+
+        window_building = arrays.zone_building[arrays.window_zone]
+        i_sol = BatchHeatingCalculations.window_solar_radiation(arrays, climates)
+
+        # Účinná kolekčná plocha (rovnica 2.9), (1-FF) = 0.8
+        a_sol = arrays.window_shading_factor * arrays.window_g_value * 0.8 * arrays.window_area
+        f_sh_ob = 0.8  # tieniaci faktor pre vonkajšie prekážky
+        qsol_window = f_sh_ob * a_sol * i_sol
+
+        return np.bincount(window_building, weights=qsol_window, minlength=arrays.n_buildings)
+
+    @staticmethod
+    def calculate_utilization_factor(portfolio: Portfolio) -> np.ndarray:
+        """Faktor využitia tepelných ziskov ηgn [-] (Tab. 2.6 zo skrípt)"""
+        arrays = BatchHeatingCalculations.as_store(portfolio)
+        return np.full(arrays.n_buildings, 0.95)
+
+    @staticmethod
+    def calculate_heating_demand(portfolio: Portfolio,
+                                 climate_data: ClimateInput,
+                                 air_change_rate) -> Dict[str, np.ndarray]:
+        """
+        Potreba tepla na vykurovanie pre celé portfólio naraz
+
+        Args:
+            portfolio: zoznam budov alebo BuildingStore
+            climate_data: klimatické údaje (spoločné alebo jedny na budovu)
+            air_change_rate: intenzita výmeny vzduchu [1/h] (skalár alebo pole na budovu)
+
+        Returns:
+            slovník s rovnakými kľúčmi ako HeatingCalculations.calculate_heating_demand,
+            hodnoty sú polia s jednou hodnotou na budovu
+        """
+        arrays = BatchHeatingCalculations.as_store(portfolio)
+
+        qht = BatchHeatingCalculations.calculate_total_heat_loss(arrays, climate_data, air_change_rate)
+        qint = BatchHeatingCalculations.calculate_internal_heat_gains(arrays, climate_data)
+        qsol = BatchHeatingCalculations.calculate_solar_heat_gains(arrays, climate_data)
+        qgn = qint + qsol
+
+        eta_gn = BatchHeatingCalculations.calculate_utilization_factor(arrays)
+
+        qh = np.maximum(0.0, qht - eta_gn * qgn)
+
+        floor_area = BatchHeatingCalculations._sum_zones_per_building(arrays, arrays.zone_floor_area)
+        qh_specific = np.divide(qh, floor_area, out=np.zeros_like(qh), where=floor_area > 0)
+
+        return {
+            'total_heat_loss': qht,
+            'internal_gains': qint,
+            'solar_gains': qsol,
+            'total_gains': qgn,
+            'utilization_factor': eta_gn,
+            'heating_demand': qh,
+            'specific_heating_demand': qh_specific,
+            'air_change_rate': BatchHeatingCalculations._per_building(air_change_rate, arrays.n_buildings)
+        }
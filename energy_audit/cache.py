@@ -0,0 +1,237 @@
+"""
+Vyrovnávacia pamäť výsledkov výpočtov adresovaná obsahom vstupov
+Kľúč je odtlačok SHA-256 vstupov budovy, klimatických údajov a verzie výpočtov
+"""
+
+import hashlib
+import json
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from . import __version__
+from .models import Building, ClimateData
+from .calculations import HeatingCalculations, EnergyCalculations, HydraulicCalculations
+
+
+# Verzia výpočtov: zvýšiť pri každej zmene, ktorá mení výsledky (staré záznamy sa prestanú používať)
+CALCULATION_VERSION = f"{__version__}+1"
+
+
+def _climate_to_dict(climate_data: ClimateData) -> Dict:
+    return {
+        'external_temperature': climate_data.external_temperature,
+        'heating_days': climate_data.heating_days,
+        'degree_days': climate_data.degree_days,
+        'solar_radiation': climate_data.solar_radiation,
+        'monthly_temperatures': climate_data.monthly_temperatures,
+        'monthly_solar_radiation': climate_data.monthly_solar_radiation,
+    }
+
+
+def input_key(calculation: str,
+              building: Building,
+              climate_data: Optional[ClimateData] = None,
+              parameters: Optional[Dict] = None) -> str:
+    """
+    Odtlačok vstupov výpočtu (SHA-256, hexadecimálne)
+
+    Budova sa zapíše kanonicky (to_dict, zoradené kľúče), bez názvu budovy,
+    ktorý výsledky neovplyvňuje. Rovnaké vstupy dajú rovnaký kľúč
+    v každom procese aj po reštarte.
+    """
+    building_data = building.to_dict()
+    building_data.pop('name')
+    document = {
+        'calculation': calculation,
+        'version': CALCULATION_VERSION,
+        'building': building_data,
+        'climate': None if climate_data is None else _climate_to_dict(climate_data),
+        'parameters': parameters or {},
+    }
+    canonical = json.dumps(document, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class CacheStatistics:
+    """Počty zásahov a výpadkov vyrovnávacej pamäte"""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # záznamy odstránené z disku pre prekročenie veľkosti
+
+    @property
+    def requests(self) -> int:
+        return self.memory_hits + self.disk_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Podiel požiadaviek obslúžených z pamäte alebo z disku [-]"""
+        return (self.memory_hits + self.disk_hits) / self.requests if self.requests else 0.0
+
+
+class ResultCache:
+    """
+    Dvojúrovňová vyrovnávacia pamäť výsledkov
+
+    Prvá úroveň je LRU v pamäti procesu (OrderedDict), druhá voliteľná
+    databáza SQLite na disku s obmedzenou celkovou veľkosťou; pri jej
+    prekročení sa odstránia najdlhšie nepoužité záznamy. Výsledky sa ukladajú
+    serializované (pickle), každé čítanie vráti novú kópiu.
+    """
+
+    def __init__(self,
+                 max_entries: int = 4096,
+                 path: Optional[str] = None,
+                 max_disk_bytes: int = 256 * 1024 ** 2):
+        """
+        Args:
+            max_entries: počet záznamov v pamäti
+            path: súbor databázy SQLite (None = len pamäť)
+            max_disk_bytes: najväčšia veľkosť uložených výsledkov na disku [B]
+        """
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.statistics = CacheStatistics()
+        self._memory: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._connection = None
+        self._disk_bytes = 0
+        if path is not None:
+            self._connection = sqlite3.connect(path)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+            self._connection.commit()
+            self._disk_bytes = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()[0]
+
+    # Úrovne pamäte
+
+    def _remember(self, key: str, value: bytes):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Uložený výsledok alebo None"""
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+            self.statistics.memory_hits += 1
+            return pickle.loads(value)
+
+        if self._connection is not None:
+            row = self._connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+                self._connection.commit()
+                self._remember(key, row[0])
+                self.statistics.disk_hits += 1
+                return pickle.loads(row[0])
+
+        self.statistics.misses += 1
+        return None
+
+    def put(self, key: str, value: Any):
+        """Uloženie výsledku do pamäte aj na disk"""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, data)
+        if self._connection is not None:
+            previous = self._connection.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time())
+            )
+            self._disk_bytes += len(data) - (previous[0] if previous else 0)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict()
+            self._connection.commit()
+
+    def _evict(self):
+        """Odstránenie najdlhšie nepoužitých záznamov, kým veľkosť neklesne pod limit"""
+        removed = []
+        for key, size in self._connection.execute("SELECT key, size FROM results ORDER BY accessed"):
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            removed.append((key,))
+            self._disk_bytes -= size
+        self._connection.executemany("DELETE FROM results WHERE key = ?", removed)
+        self.statistics.evictions += len(removed)
+
+    @property
+    def disk_size(self) -> int:
+        """Celková veľkosť výsledkov na disku [B]"""
+        return self._disk_bytes
+
+    def clear(self):
+        self._memory.clear()
+        if self._connection is not None:
+            self._connection.execute("DELETE FROM results")
+            self._connection.commit()
+            self._disk_bytes = 0
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self) -> 'ResultCache':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Výpočty s vyrovnávacou pamäťou
+
+    def memoize(self, calculation: str, function: Callable, building: Building,
+                climate_data: Optional[ClimateData] = None, parameters: Optional[Dict] = None):
+        """Výsledok function() z pamäte, alebo výpočet a uloženie pod kľúčom vstupov"""
+        key = input_key(calculation, building, climate_data, parameters)
+        result = self.get(key)
+        if result is None:
+            result = function()
+            self.put(key, result)
+        return result
+
+    def calculate_heating_demand(self, building: Building, climate_data: ClimateData,
+                                 air_change_rate: float) -> Dict[str, float]:
+        """HeatingCalculations.calculate_heating_demand s vyrovnávacou pamäťou"""
+        return self.memoize(
+            'heating_demand',
+            lambda: HeatingCalculations.calculate_heating_demand(building, climate_data, air_change_rate),
+            building, climate_data, {'air_change_rate': air_change_rate}
+        )
+
+    def calculate_hot_water_demand(self, building: Building) -> Dict[str, float]:
+        """EnergyCalculations.calculate_hot_water_demand s vyrovnávacou pamäťou"""
+        return self.memoize(
+            'hot_water_demand',
+            lambda: EnergyCalculations.calculate_hot_water_demand(building),
+            building
+        )
+
+    def hydraulic_balancing_analysis(self, building: Building,
+                                     heating_demand_per_zone: Dict[str, float],
+                                     network=None) -> Dict[str, Dict]:
+        """
+        HydraulicCalculations.hydraulic_balancing_analysis s vyrovnávacou pamäťou
+
+        Výpočet so zadanou potrubnou sieťou sa neukladá (sieť nie je súčasťou kľúča).
+        """
+        if network is not None:
+            return HydraulicCalculations.hydraulic_balancing_analysis(
+                building, heating_demand_per_zone, network
+            )
+        return self.memoize(
+            'hydraulic_balancing_analysis',
+            lambda: HydraulicCalculations.hydraulic_balancing_analysis(building, heating_demand_per_zone),
+            building, None, {'heating_demand_per_zone': heating_demand_per_zone}
+        )
@@ -7,10 +7,14 @@ import math
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 
+import numpy as np
+
 from .models import (
     Building, Zone, Construction, Window, ConstructionType,
-    ClimateData, HeatingSystemType
+    ClimateData, HeatingSystem, HeatingSystemType
 )
+from . import water_properties, psychrometrics
+from .climate import SLOVAK_STATIONS, cooling_design_data
 
 
 @dataclass
@@ -341,25 +345,56 @@ class HeatingCalculations:
             'air_change_rate': air_change_rate
         }
 
+    @staticmethod
+    def calculate_heating_demand_monthly(building: Building,
+                                       climate_data: ClimateData,
+                                       air_change_rate: float) -> Dict:
+        """
+        Mesačná bilancia potreby tepla podľa STN EN ISO 13790
+        Faktor využitia ziskov závisí od pomeru ziskov a strát a časovej konštanty
+        
+        Returns:
+            slovník s mesačnými hodnotami (zoznamy 12 hodnôt) a ročnými súčtami
+        """
+        from .monthly import MonthlyHeatingCalculations
+        
+        results = MonthlyHeatingCalculations.calculate_heating_demand(
+            [building], climate_data, air_change_rate
+        )
+        return {key: values[0].tolist() for key, values in results.items()}
+
 
 class EnergyCalculations:
     """Výpočty potreby energie na vykurovanie a prípravu TV"""
     
+    @staticmethod
+    def emission_temperature_increase(heating_system: Optional[HeatingSystem]) -> float:
+        """
+        Zvýšenie vnútornej teploty Δθ vplyvom odovzdávania tepla [K]
+
+        Radiátory s P-regulátorom 1,2 K, podlahové a ostatné sústavy 0,5 K,
+        bez sústavy 1,2 K. Hydraulicky vyregulovaná sústava má zložku Δθhydr
+        0,2 K namiesto 0,6 K (STN EN 15316-2), teda Δθ nižšie o 0,4 K.
+        """
+        if heating_system is None:
+            return 1.2  # default
+        if heating_system.system_type.value == "radiátorový":
+            delta_theta = 1.2  # radiátory s P-regulátorom
+        else:
+            delta_theta = 0.5  # pre podlahové systémy
+        if heating_system.hydraulic_adjustment:
+            delta_theta -= 0.4
+        return delta_theta
+    
     @staticmethod
     def calculate_emission_losses(building: Building, heating_demand: float) -> float:
         """
         Tepelná strata systému odovzdávania tepla [kWh]
-        Zjednodušený výpočet podľa kapitoly 3.1.1 zo skrípt
+        Zjednodušený výpočet podľa kapitoly 3.1.1 zo skrípt, zvýšenie
+        teploty Δθ podľa emission_temperature_increase (vrátane vplyvu
+        hydraulického vyregulovania)
         """
-        # Zjednodušené pre príklad - závislé od typu systému
-        if building.heating_system:
-            if building.heating_system.system_type.value == "radiátorový":
-                # Pre radiátory s P-regulátorom
-                delta_theta = 1.2  # zvýšenie teploty [K]
-            else:
-                delta_theta = 0.5  # pre podlahové systémy
-        else:
-            delta_theta = 1.2  # default
+        delta_theta = EnergyCalculations.emission_temperature_increase(building.heating_system)
         
         theta_int_inc = 20.0 + delta_theta
         theta_e_comb = building.climate_data.external_temperature
@@ -442,6 +477,10 @@ class EnergyCalculations:
         }
 
 
+# Prechodová oblasť medzi laminárnym a turbulentným prúdením pre iteračné výpočty sietí
+TRANSITION_REYNOLDS = (2000.0, 4000.0)
+
+
 class HydraulicCalculations:
     """Výpočty hydraulického vyregulovania vykurovacích systémov"""
     
@@ -464,7 +503,10 @@ class HydraulicCalculations:
             raise ValueError("Teplota prívodnej vody musí byť vyššia ako vratnej")
         
         delta_t = supply_temp - return_temp  # teplotný spád [K]
-        c_water = 4186  # merná tepelná kapacita vody [J/(kg.K)]
+        # merná tepelná kapacita vody pri strednej teplote [J/(kg.K)]
+        c_water = water_properties.specific_heat(
+            water_properties.mean_temperature(supply_temp, return_temp)
+        )
         
         flow_rate = heating_demand / (c_water * delta_t)  # kg/s
         return flow_rate
@@ -473,7 +515,8 @@ class HydraulicCalculations:
     def calculate_pressure_loss(flow_rate: float, 
                               pipe_length: float,
                               pipe_diameter: float,
-                              fittings_factor: float = 1.5) -> float:
+                              fittings_factor: float = 1.5,
+                              water_temperature: float = 60.0) -> float:
         """
         Výpočet tlakovej straty v potrubí [Pa]
         
@@ -482,6 +525,7 @@ class HydraulicCalculations:
             pipe_length: dĺžka potrubia [m]
             pipe_diameter: vnútorný priemer potrubia [m]
             fittings_factor: faktor armatur a tvaroviek [-]
+            water_temperature: teplota vody [°C]
             
         Returns:
             tlaková strata [Pa]
@@ -489,9 +533,9 @@ class HydraulicCalculations:
         if pipe_diameter <= 0:
             raise ValueError("Priemer potrubia musí byť kladný")
         
-        # Fyzikálne vlastnosti vody pri 60°C
-        rho_water = 983.2  # kg/m³
-        mu_water = 0.466e-3  # Pa.s
+        # Fyzikálne vlastnosti vody pri danej teplote
+        rho_water = water_properties.density(water_temperature)  # kg/m³
+        mu_water = water_properties.viscosity(water_temperature)  # Pa.s
         
         # Plocha prierezu potrubia
         area = math.pi * (pipe_diameter / 2) ** 2  # m²
@@ -517,6 +561,149 @@ class HydraulicCalculations:
         
         return pressure_loss_total
     
+    @staticmethod
+    def calculate_friction_factor_array(reynolds,
+                                        relative_roughness=0.0,
+                                        method: str = "blasius",
+                                        transition: bool = False,
+                                        tolerance: float = 1e-12,
+                                        max_iterations: int = 20) -> np.ndarray:
+        """
+        Súčiniteľ trenia λ pre pole Reynoldsových čísel [-]
+        
+        Args:
+            reynolds: Reynoldsove čísla [-]
+            relative_roughness: pomerná drsnosť ε/d [-]
+            method: turbulentné prúdenie - "blasius" (hladké potrubie, ako
+                calculate_pressure_loss), "swamee_jain" alebo "colebrook"
+            transition: lineárny prechod medzi laminárnym a turbulentným
+                prúdením v oblasti Re 2000-4000 (spojitá strata pre iteračné výpočty)
+            tolerance: presnosť iterácie Colebrookovej rovnice pre 1/√λ
+            max_iterations: najväčší počet Newtonových krokov
+            
+        Returns:
+            súčiniteľ trenia [-] (0 pri nulovom prietoku)
+        """
+        reynolds = np.asarray(reynolds, dtype=np.float64)
+        if method not in ("blasius", "swamee_jain", "colebrook"):
+            raise ValueError(f"Neznáma metóda výpočtu súčiniteľa trenia: {method}")
+        
+        low, high = TRANSITION_REYNOLDS if transition else (2300.0, 2300.0)
+        flowing = reynolds > 0
+        if not flowing.all():
+            reynolds = np.where(flowing, reynolds, high)
+        
+        # Turbulentné prúdenie počítané pre všetky prvky (bez výberu podľa masky)
+        if method == "blasius":
+            friction = reynolds ** -0.25
+            friction *= 0.3164
+        else:
+            roughness = np.broadcast_to(np.asarray(relative_roughness, dtype=np.float64),
+                                        reynolds.shape)
+            # Laminárne prvky sa prepíšu nižšie; turbulentné vzťahy pre ne nie sú platné
+            turbulent = np.maximum(reynolds, high)
+            # Swamee-Jain (aj počiatočný odhad pre Colebrook-White)
+            a = roughness / 3.7
+            friction = 0.25 / np.log10(a + 5.74 / turbulent ** 0.9) ** 2
+            if method == "colebrook":
+                # 1/√λ = -2 log10(ε/3.7d + 2.51/(Re √λ)), Newtonova metóda pre x = 1/√λ
+                b = 2.51 / turbulent
+                x = 1 / np.sqrt(friction)
+                for _ in range(max_iterations):
+                    inner = a + b * x
+                    step = (x + 2 * np.log10(inner)) / (1 + 2 * b / (inner * math.log(10)))
+                    x -= step
+                    if np.max(np.abs(step), initial=0.0) < tolerance:
+                        break
+                friction = 1 / x ** 2
+        
+        # Laminárne prúdenie a prechodová oblasť (zvyčajne malá časť potrubí)
+        laminar = reynolds < high
+        if laminar.any():
+            re = reynolds[laminar]
+            if transition:
+                f_high = HydraulicCalculations.calculate_friction_factor_array(
+                    np.full(re.shape, high), np.broadcast_to(relative_roughness, reynolds.shape)[laminar],
+                    method
+                )
+                f_low = 64 / low
+                friction[laminar] = np.where(re <= low, 64 / re,
+                                             f_low + (f_high - f_low) * (re - low) / (high - low))
+            else:
+                friction[laminar] = 64 / re
+        
+        if not flowing.all():
+            friction[~flowing] = 0.0
+        return friction
+    
+    @staticmethod
+    def calculate_pressure_loss_array(flow_rate,
+                                      pipe_length,
+                                      pipe_diameter,
+                                      fittings_factor=1.5,
+                                      water_temperature=60.0,
+                                      *,
+                                      roughness=0.0,
+                                      method: str = "blasius",
+                                      density=None,
+                                      viscosity=None) -> np.ndarray:
+        """
+        Tlakové straty súboru potrubí [Pa] (vektorizovaná calculate_pressure_loss)
+        
+        Pozičné parametre sú v rovnakom poradí ako v calculate_pressure_loss,
+        ďalšie parametre sa zadávajú len menom.
+        
+        Args:
+            flow_rate: prietoky [kg/s]
+            pipe_length: dĺžky potrubí [m]
+            pipe_diameter: vnútorné priemery [m]
+            fittings_factor: faktor armatúr a tvaroviek [-]
+            water_temperature: teplota vody [°C] (skalár alebo pole, napr. prívod/spiatočka)
+            roughness: absolútna drsnosť stien [m]
+            method: výpočet súčiniteľa trenia (blasius, swamee_jain, colebrook)
+            density: hustota vody [kg/m³] (predvolene podľa teploty)
+            viscosity: dynamická viskozita vody [Pa.s] (predvolene podľa teploty)
+            
+        Returns:
+            pole tlakových strát [Pa]; pri metóde blasius zhodné so skalárnym
+            výpočtom (na presnosť zaokrúhlenia)
+        """
+        if density is None:
+            density = water_properties.density(water_temperature)
+        if viscosity is None:
+            viscosity = water_properties.viscosity(water_temperature)
+        flow_rate = np.asarray(flow_rate, dtype=np.float64)
+        pipe_length = np.asarray(pipe_length, dtype=np.float64)
+        pipe_diameter = np.asarray(pipe_diameter, dtype=np.float64)
+        if np.any(pipe_diameter <= 0):
+            raise ValueError("Priemer potrubia musí byť kladný")
+        
+        # Rýchlosť a Reynoldsovo číslo (strata nezávisí od smeru prúdenia);
+        # pole výsledku má spoločný tvar všetkých vstupov, ďalej sa pracuje na mieste
+        velocity = np.empty(np.broadcast_shapes(
+            *(np.shape(value) for value in (flow_rate, pipe_length, pipe_diameter, fittings_factor,
+                                            density, viscosity, roughness))
+        ))
+        np.abs(flow_rate, out=velocity)
+        velocity /= pipe_diameter
+        velocity /= pipe_diameter
+        velocity *= 4 / (math.pi * density)
+        reynolds = velocity * pipe_diameter
+        reynolds *= density / viscosity
+        
+        relative_roughness = 0.0 if method == "blasius" else np.asarray(roughness) / pipe_diameter
+        friction = HydraulicCalculations.calculate_friction_factor_array(
+            reynolds, relative_roughness, method
+        )
+        
+        # Δp = λ (L / d) ρ v² / 2 × faktor armatúr
+        velocity *= velocity
+        friction *= velocity
+        friction *= pipe_length
+        friction /= pipe_diameter
+        friction *= np.multiply(fittings_factor, density / 2)
+        return friction
+    
     @staticmethod
     def calculate_valve_authority(valve_pressure_loss: float,
                                 total_circuit_pressure_loss: float) -> float:
@@ -565,13 +752,17 @@ class HydraulicCalculations:
     
     @staticmethod
     def hydraulic_balancing_analysis(building: Building, 
-                                   heating_demand_per_zone: Dict[str, float]) -> Dict[str, Dict]:
+                                   heating_demand_per_zone: Dict[str, float],
+                                   network=None) -> Dict[str, Dict]:
         """
         Komplexná analýza hydraulického vyregulovania
         
         Args:
             building: budova
             heating_demand_per_zone: tepelné výkony jednotlivých zón [W]
+            network: model potrubnej siete (PipeNetwork) s telesami priradenými
+                k zónam; ak je zadaný, prietoky a tlaky sa počítajú pre celú
+                sieť naraz namiesto odhadu dĺžky a priemeru potrubia
             
         Returns:
             slovník s výsledkami analýzy pre každú zónu
@@ -584,27 +775,43 @@ class HydraulicCalculations:
         supply_temp = building.heating_system.supply_temperature
         return_temp = building.heating_system.return_temperature
         
-        for zone in building.zones:
+        if network is not None:
+            return HydraulicCalculations._network_balancing_analysis(
+                building, heating_demand_per_zone, network
+            )
+        
+        from .pipe_sizing import PipeSizer
+        
+        mean_temp = water_properties.mean_temperature(supply_temp, return_temp)
+        zones = [zone for zone in building.zones if zone.name in heating_demand_per_zone]
+        
+        # Výpočet požadovaných prietokov
+        flow_rates = [
+            HydraulicCalculations.calculate_required_flow_rate(
+                heating_demand_per_zone[zone.name], supply_temp, return_temp
+            )
+            for zone in zones
+        ]
+        
+        # Dimenzovanie prípojok zón podľa katalógu (všetky zóny naraz)
+        sizing = PipeSizer(water_temperature=mean_temp).size(
+            flow_rates, names=[zone.name for zone in zones]
+        )
+        
+        for i, zone in enumerate(zones):
             zone_name = zone.name
-            
-            if zone_name not in heating_demand_per_zone:
-                continue
-            
             heating_demand = heating_demand_per_zone[zone_name]
-            
-            # Výpočet požadovaného prietoku
-            flow_rate_kg_s = HydraulicCalculations.calculate_required_flow_rate(
-                heating_demand, supply_temp, return_temp
-            )
+            flow_rate_kg_s = flow_rates[i]
             flow_rate_m3_h = flow_rate_kg_s * 3.6  # konverzia na m³/h
             
             # Odhad parametrov potrubia (zjednodušené)
             estimated_pipe_length = math.sqrt(zone.floor_area) * 2  # odhad dĺžky potrubia
-            pipe_diameter = 0.025  # 25mm vnútorný priemer
+            pipe_diameter = float(sizing.diameter[i])  # vnútorný priemer [m]
             
-            # Výpočet tlakovej straty
+            # Výpočet tlakovej straty pri strednej teplote vody
             pressure_loss = HydraulicCalculations.calculate_pressure_loss(
-                flow_rate_kg_s, estimated_pipe_length, pipe_diameter
+                flow_rate_kg_s, estimated_pipe_length, pipe_diameter,
+                water_temperature=mean_temp
             )
             
             # Nastavenie vyvažovacieho ventilu (príklad s Kv=2.5)
@@ -618,6 +825,8 @@ class HydraulicCalculations:
                 'required_flow_kg_s': flow_rate_kg_s,
                 'required_flow_m3_h': flow_rate_m3_h,
                 'estimated_pipe_length_m': estimated_pipe_length,
+                'pipe_nominal': sizing.nominal[i],
+                'pipe_diameter_m': pipe_diameter,
                 'pressure_loss_Pa': pressure_loss,
                 'pressure_loss_kPa': pressure_loss / 1000,
                 'kv_required': kv_required,
@@ -628,6 +837,57 @@ class HydraulicCalculations:
             }
         
         return results
+    
+    @staticmethod
+    def _network_balancing_analysis(building: Building,
+                                    heating_demand_per_zone: Dict[str, float],
+                                    network) -> Dict[str, Dict]:
+        """Analýza vyregulovania z hydraulického výpočtu celej siete"""
+        supply_temp = building.heating_system.supply_temperature
+        return_temp = building.heating_system.return_temperature
+        
+        solution = network.solve()
+        terminals = network.terminals()
+        results = {}
+        
+        for zone in building.zones:
+            zone_name = zone.name
+            zone_terminals = [t for t in terminals if network.zone[t] == zone_name]
+            if zone_name not in heating_demand_per_zone or not zone_terminals:
+                continue
+            
+            heating_demand = heating_demand_per_zone[zone_name]
+            flow_rate_kg_s = HydraulicCalculations.calculate_required_flow_rate(
+                heating_demand, supply_temp, return_temp
+            )
+            flow_rate_m3_h = flow_rate_kg_s * 3.6
+            
+            actual_flow = float(sum(solution.flow[t] for t in zone_terminals))
+            # Dispozičný tlak na telese (najnepriaznivejšie teleso zóny)
+            pressure_loss = float(min(solution.pressure_drop[t] for t in zone_terminals))
+            kv_terminal = sum(network.kv[t] for t in zone_terminals)
+            
+            kv_required, valve_opening = HydraulicCalculations.calculate_balancing_valve_setting(
+                flow_rate_m3_h, max(pressure_loss, 1e-9) / 1000, kv_terminal
+            )
+            
+            results[zone_name] = {
+                'heating_demand_W': heating_demand,
+                'required_flow_kg_s': flow_rate_kg_s,
+                'required_flow_m3_h': flow_rate_m3_h,
+                'actual_flow_kg_s': actual_flow,
+                'flow_deviation_percent': (actual_flow / flow_rate_kg_s - 1) * 100 if flow_rate_kg_s > 0 else 0.0,
+                'pressure_loss_Pa': pressure_loss,
+                'pressure_loss_kPa': pressure_loss / 1000,
+                'kv_required': kv_required,
+                'valve_opening_percent': valve_opening,
+                'temperature_supply': supply_temp,
+                'temperature_return': return_temp,
+                'temperature_difference': supply_temp - return_temp,
+                'network_converged': solution.converged
+            }
+        
+        return results
 
 
 class CoolingCalculations:
@@ -742,18 +1002,34 @@ class CoolingCalculations:
     @staticmethod
     def calculate_ventilation_cooling_load(air_flow_rate: float,
                                          temp_difference: float,
-                                         humidity_ratio_difference: float = 0) -> Dict[str, float]:
+                                         humidity_ratio_difference: float = 0,
+                                         outdoor_relative_humidity: Optional[float] = None,
+                                         indoor_temperature: float = 24.0,
+                                         indoor_relative_humidity: float = 0.5) -> Dict[str, float]:
         """
         Výpočet chladiacej záťaže od vetraného vzduchu [W]
         
+        Pri zadanej vonkajšej relatívnej vlhkosti sa rozdiel absolútnej vlhkosti
+        určí psychrometricky (vonkajšia teplota = indoor_temperature + temp_difference).
+        Všetky parametre môžu byť aj hodinové polia numpy.
+        
         Args:
             air_flow_rate: prietok vzduchu [m³/s]
             temp_difference: teplotný rozdiel [K]
             humidity_ratio_difference: rozdiel absolútnej vlhkosti [kg/kg]
+            outdoor_relative_humidity: relatívna vlhkosť vonkajšieho vzduchu (0-1)
+            indoor_temperature: vnútorná teplota [°C]
+            indoor_relative_humidity: relatívna vlhkosť vnútorného vzduchu (0-1)
             
         Returns:
             slovník s rozdelením na suchý a vlhký tepelný zisk
         """
+        if outdoor_relative_humidity is not None:
+            humidity_ratio_difference = psychrometrics.dehumidification(
+                np.add(indoor_temperature, temp_difference), outdoor_relative_humidity,
+                indoor_temperature, indoor_relative_humidity
+            )
+        
         # Fyzikálne vlastnosti vzduchu
         rho_air = 1.2  # kg/m³
         c_air = 1010   # J/(kg.K)
@@ -780,6 +1056,9 @@ class CoolingCalculations:
         """
         Celkový výpočet chladiacej potreby budovy [W]
         
+        Súčet okamžitých ziskov v návrhovom bode bez akumulácie tepla v konštrukciách;
+        hodinovú záťaž s akumuláciou počíta rts.RadiantTimeSeries.
+        
         Args:
             building: budova
             climate_data: klimatické údaje
@@ -927,27 +1206,5 @@ STN_REQUIREMENTS = {
     }
 }
 
-# Klimatické údaje pre Slovensko - chladenie
-SLOVAK_COOLING_DATA = {
-    "bratislava": {
-        "design_temp_C": 32,  # návrhová vonkajšia teplota
-        "cooling_degree_days": 180,  # chladiace deň-stupne
-        "solar_radiation_horizontal_kWh_m2": 1200,
-        "relative_humidity_percent": 65,
-        "cooling_season_days": 90
-    },
-    "košice": {
-        "design_temp_C": 31,
-        "cooling_degree_days": 160,
-        "solar_radiation_horizontal_kWh_m2": 1150,
-        "relative_humidity_percent": 68,
-        "cooling_season_days": 85
-    },
-    "žilina": {
-        "design_temp_C": 29,
-        "cooling_degree_days": 120,
-        "solar_radiation_horizontal_kWh_m2": 1100,
-        "relative_humidity_percent": 70,
-        "cooling_season_days": 70
-    }
-}
+# Klimatické údaje pre Slovensko - chladenie (zo staníc energy_audit.climate.SLOVAK_STATIONS)
+SLOVAK_COOLING_DATA = cooling_design_data(SLOVAK_STATIONS)
@@ -0,0 +1,217 @@
+"""
+Príkazový riadok pre dávkový energetický audit portfólia budov
+Vstup aj výstup sú riadky JSON (JSONL), jeden riadok = jedna budova
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from .models import Building, EnergyAuditResults, ConstructionType
+from .calculations import (
+    ThermalCalculations, HeatingCalculations, EnergyCalculations, HydraulicCalculations
+)
+
+
+# Návrhová vonkajšia teplota pre tepelný výkon zón [°C] (STN EN 12831, Bratislava)
+DESIGN_EXTERNAL_TEMPERATURE = -11.0
+
+# Konštrukcie bez požiadavky na U podľa STN 73 0540-2
+_NOT_ASSESSED = (ConstructionType.INTERNAL_WALL,)
+
+
+def zone_heat_loads(building: Building,
+                    air_change_rate: float,
+                    design_external_temperature: float = DESIGN_EXTERNAL_TEMPERATURE) -> Dict[str, float]:
+    """
+    Návrhový tepelný výkon zón [W] pre hydraulický výpočet
+
+    Merná tepelná strata budovy (HT + HV) sa rozdelí na zóny podľa
+    podlahovej plochy a vynásobí rozdielom vnútornej a návrhovej vonkajšej teploty.
+    """
+    ht = HeatingCalculations.calculate_transmission_heat_loss_coefficient(building)
+    hv = HeatingCalculations.calculate_ventilation_heat_loss_coefficient(building, air_change_rate)
+    floor_area = building.total_floor_area()
+    if floor_area <= 0:
+        return {}
+    return {
+        zone.name: (ht + hv) * zone.floor_area / floor_area
+        * (zone.internal_temperature - design_external_temperature)
+        for zone in building.zones
+    }
+
+
+def audit_building(building: Building,
+                   air_change_rate: float = 0.5,
+                   assessment_level: str = "U_N",
+                   audit_date: Optional[str] = None,
+                   design_external_temperature: float = DESIGN_EXTERNAL_TEMPERATURE) -> EnergyAuditResults:
+    """
+    Energetický audit jednej budovy: posúdenie konštrukcií, potreba tepla
+    na vykurovanie a prípravu TV a hydraulické vyregulovanie
+
+    Args:
+        building: posudzovaná budova (klimatické údaje z building.climate_data)
+        air_change_rate: intenzita výmeny vzduchu [1/h]
+        assessment_level: úroveň posúdenia podľa STN 73 0540-2 (U_max, U_N, U_r1, U_r2)
+        audit_date: dátum auditu (predvolene dnešný)
+        design_external_temperature: návrhová vonkajšia teplota [°C]
+    """
+    results = EnergyAuditResults(
+        building_name=building.name,
+        audit_date=audit_date or datetime.date.today().isoformat(),
+    )
+
+    # Tepelno-technické posúdenie konštrukcií
+    for zone in building.zones:
+        for construction in zone.constructions:
+            if construction.construction_type in _NOT_ASSESSED:
+                continue
+            assessment = ThermalCalculations.assess_construction_compliance(construction, assessment_level)
+            results.envelope_u_values[construction.name] = assessment.u_value_calculated
+            results.stn_compliance[construction.name] = assessment.compliant
+
+    # Potreba tepla na vykurovanie a prípravu TV
+    heating = HeatingCalculations.calculate_heating_demand(
+        building, building.climate_data, air_change_rate
+    )
+    hot_water = EnergyCalculations.calculate_hot_water_demand(building)
+    results.heating_demand_kwh = heating['heating_demand']
+    results.hot_water_demand_kwh = hot_water['total_hot_water_energy']
+    results.total_energy_demand_kwh = results.heating_demand_kwh + results.hot_water_demand_kwh
+    floor_area = building.total_floor_area()
+    results.specific_energy_demand_kwh_m2 = (
+        results.total_energy_demand_kwh / floor_area if floor_area > 0 else 0.0
+    )
+
+    # Hydraulické vyregulovanie
+    if building.heating_system is not None:
+        results.hydraulic_balancing_results = HydraulicCalculations.hydraulic_balancing_analysis(
+            building, zone_heat_loads(building, air_change_rate, design_external_temperature)
+        )
+        if building.heating_system.hydraulic_adjustment:
+            results.current_hydraulic_state = "vyregulované"
+
+    return results
+
+
+def _audit_lines(lines: List[str], options: Dict) -> List[str]:
+    """
+    Audit bloku riadkov JSONL; chybný riadok vráti záznam s chybou namiesto výsledku
+
+    Zachytáva sa každá chyba jedného záznamu, aby neúplná alebo poškodená
+    budova neprerušila spracovanie celého prúdu (ani v pracovnom procese).
+    """
+    output = []
+    for line in lines:
+        try:
+            building = Building.from_dict(json.loads(line))
+            record = audit_building(building, **options).export_to_dict()
+        except Exception as error:
+            record = {'error': f"{type(error).__name__}: {error}"}
+        output.append(json.dumps(record, ensure_ascii=False))
+    return output
+
+
+def _chunks(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk = []
+    for line in lines:
+        if not line.strip():
+            continue
+        chunk.append(line)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _write(records: List[str], output: TextIO) -> int:
+    output.write(''.join(record + '\n' for record in records))
+    return len(records)
+
+
+def run_pipeline(lines: Iterable[str],
+                 output: TextIO,
+                 workers: Optional[int] = 0,
+                 chunk_size: int = 256,
+                 max_pending: Optional[int] = None,
+                 **options) -> int:
+    """
+    Prúdové spracovanie budov z riadkov JSONL
+
+    Vstup sa číta po blokoch chunk_size riadkov; rozpracovaných blokov je
+    najviac max_pending, takže pamäť nezávisí od veľkosti vstupu. Výsledky sa
+    zapisujú v poradí vstupu hneď, ako je hotový najstarší rozpracovaný blok.
+
+    Args:
+        lines: riadky JSON vo formáte Building.to_dict
+        output: výstupný prúd (jeden riadok JSON na budovu)
+        workers: počet procesov (None = počet jadier, 0 = bez paralelizácie)
+        chunk_size: počet budov v jednej úlohe
+        max_pending: najväčší počet rozpracovaných blokov (predvolene 2 × počet procesov)
+        options: parametre audit_building
+
+    Returns:
+        počet spracovaných budov
+    """
+    count = 0
+    if workers == 0:
+        for chunk in _chunks(lines, chunk_size):
+            count += _write(_audit_lines(chunk, options), output)
+        return count
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _chunks(lines, chunk_size):
+            if len(pending) >= max_pending:
+                count += _write(pending.popleft().result(), output)
+            pending.append(executor.submit(_audit_lines, chunk, options))
+        while pending:
+            count += _write(pending.popleft().result(), output)
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='energy_audit',
+        description="Energetický audit portfólia budov (JSONL na vstupe aj výstupe)"
+    )
+    parser.add_argument('input', nargs='?', default='-',
+                        help="súbor JSONL s budovami (Building.to_dict), '-' = štandardný vstup")
+    parser.add_argument('-o', '--output', default='-', help="výstupný súbor JSONL, '-' = štandardný výstup")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="počet procesov (0 = bez paralelizácie, predvolene počet jadier)")
+    parser.add_argument('--chunk-size', type=int, default=256, help="počet budov v jednej úlohe")
+    parser.add_argument('--air-change-rate', type=float, default=0.5, help="intenzita výmeny vzduchu [1/h]")
+    parser.add_argument('--assessment-level', choices=['U_max', 'U_N', 'U_r1', 'U_r2'], default='U_N',
+                        help="úroveň posúdenia konštrukcií podľa STN 73 0540-2")
+    parser.add_argument('--design-temperature', type=float, default=DESIGN_EXTERNAL_TEMPERATURE,
+                        help="návrhová vonkajšia teplota [°C]")
+    parser.add_argument('--date', default=None, help="dátum auditu (predvolene dnešný)")
+    args = parser.parse_args(argv)
+
+    options = {
+        'air_change_rate': args.air_change_rate,
+        'assessment_level': args.assessment_level,
+        'audit_date': args.date or datetime.date.today().isoformat(),
+        'design_external_temperature': args.design_temperature,
+    }
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        count = run_pipeline(source, target, workers=args.workers, chunk_size=args.chunk_size, **options)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    print(f"Spracovaných budov: {count}", file=sys.stderr)
+    return 0
@@ -0,0 +1,301 @@
+"""
+Úložisko klimatických údajov meteorologických staníc
+Hodinové rady (TMY) teploty, vlhkosti a žiarenia podľa orientácie ako float32 na disku
+"""
+
+import json
+import os
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .models import ClimateData
+from .dynamic import HourlyWeather, HOURS_PER_YEAR, DEFAULT_SOLAR_PEAKS
+
+
+# Stĺpce hodinového radu stanice (v súbore po riadkoch, každý rad je súvislý)
+TEMPERATURE = 'teplota'  # [°C]
+RELATIVE_HUMIDITY = 'vlhkosť'  # relatívna vlhkosť [-]
+ORIENTATIONS = ('S', 'SV', 'V', 'JV', 'J', 'JZ', 'Z', 'SZ', 'H')  # H = vodorovná plocha
+SERIES = (TEMPERATURE, RELATIVE_HUMIDITY) + ORIENTATIONS
+
+# Vykurovacie obdobie: dni s priemernou dennou teplotou do 13 °C (STN 38 3350)
+HEATING_LIMIT_TEMPERATURE = 13.0
+INTERNAL_TEMPERATURE = 20.0  # pre dennostupne [°C]
+
+EARTH_RADIUS = 6371.0  # [km]
+
+_INDEX_FILE = 'stations.json'
+_HOURS_PER_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]) * 24
+
+
+@dataclass
+class Station:
+    """Meteorologická stanica"""
+    station_id: str
+    name: str
+    latitude: float  # [°]
+    longitude: float  # [°]
+    elevation: float = 0.0  # [m n. m.]
+    design_heating_temperature: float = -11.0  # návrhová teplota pre vykurovanie [°C]
+    design_cooling_temperature: float = 32.0  # návrhová teplota pre chladenie [°C]
+    # Letné parametre pre zjednodušený výpočet chladenia
+    summer_mean_temperature: float = 25.0  # priemerná letná teplota [°C]
+    summer_relative_humidity: float = 0.65  # [-]
+    peak_solar_radiation: float = 750.0  # intenzita žiarenia na okná v návrhový deň [W/m²]
+    cooling_hours_per_day: float = 8.0  # [h]
+    cooling_days_per_year: int = 85
+    cooling_degree_days: float = 160.0
+    annual_horizontal_solar: float = 1150.0  # ročný úhrn žiarenia na vodorovnú plochu [kWh/m²]
+
+
+# Slovenské referenčné stanice (návrhové teploty podľa STN 73 0540-3 a údajov pre chladenie);
+# jediný zdroj lokalít pre vykurovanie aj chladenie (SLOVAK_COOLING_DATA, CoolingAnalyzer)
+SLOVAK_STATIONS = [
+    Station('bratislava', 'Bratislava', 48.1486, 17.1077, 140.0, -11.0, 32.0,
+            26.0, 0.65, 800.0, 8.0, 90, 180.0, 1200.0),
+    Station('košice', 'Košice', 48.7164, 21.2611, 206.0, -13.0, 31.0,
+            25.0, 0.68, 750.0, 7.5, 85, 160.0, 1150.0),
+    Station('žilina', 'Žilina', 49.2231, 18.7394, 342.0, -15.0, 29.0,
+            24.0, 0.70, 700.0, 6.0, 70, 120.0, 1100.0),
+]
+
+# Parametre syntetického referenčného roka slovenských staníc
+# (priemerná teplota, ročná amplitúda, priemerná vlhkosť, podiel žiarenia voči DEFAULT_SOLAR_PEAKS)
+_SYNTHETIC_PARAMETERS = {
+    'bratislava': (10.5, 11.0, 0.70, 1.00),
+    'košice': (9.3, 11.8, 0.72, 0.96),
+    'žilina': (8.2, 11.2, 0.77, 0.92),
+}
+
+
+def haversine_distance(latitude, longitude, latitudes, longitudes) -> np.ndarray:
+    """Vzdialenosť po povrchu Zeme [km] z bodu do poľa bodov"""
+    lat1, lon1 = np.radians(latitude), np.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(a))
+
+
+def cooling_design_data(stations: List[Station] = SLOVAK_STATIONS) -> Dict[str, Dict[str, float]]:
+    """Klimatické údaje pre chladenie podľa staníc (formát SLOVAK_COOLING_DATA)"""
+    return {
+        station.station_id: {
+            "design_temp_C": station.design_cooling_temperature,
+            "cooling_degree_days": station.cooling_degree_days,
+            "solar_radiation_horizontal_kWh_m2": station.annual_horizontal_solar,
+            "relative_humidity_percent": round(station.summer_relative_humidity * 100, 6),
+            "cooling_season_days": station.cooling_days_per_year,
+        }
+        for station in stations
+    }
+
+
+def cooling_season_data(stations: List[Station] = SLOVAK_STATIONS) -> Dict[str, Dict[str, float]]:
+    """Parametre chladiacej sezóny podľa staníc (formát CoolingAnalyzer.slovak_climate_data)"""
+    return {
+        station.station_id: {
+            "design_temp_C": station.design_cooling_temperature,
+            "avg_summer_temp_C": station.summer_mean_temperature,
+            "solar_radiation_W_m2": station.peak_solar_radiation,
+            "cooling_hours_per_day": station.cooling_hours_per_day,
+            "cooling_days_per_year": station.cooling_days_per_year,
+            "relative_humidity": station.summer_relative_humidity,
+        }
+        for station in stations
+    }
+
+
+class StationSeries:
+    """
+    Hodinové rady jednej stanice
+
+    Rady sú riadky poľa float32 [rad × hodina] namapovaného zo súboru,
+    takže sa z disku čítajú až pri prístupe a iba potrebné rady.
+    """
+
+    def __init__(self, station: Station, data: np.ndarray):
+        self.station = station
+        self.data = data
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.data[SERIES.index(name)]
+
+    @property
+    def n_hours(self) -> int:
+        return self.data.shape[1]
+
+    @property
+    def temperature(self) -> np.ndarray:
+        return self[TEMPERATURE]
+
+    @property
+    def relative_humidity(self) -> np.ndarray:
+        return self[RELATIVE_HUMIDITY]
+
+    def irradiance(self, orientation: str) -> np.ndarray:
+        """Intenzita žiarenia [W/m²] (neznáma orientácia = juh)"""
+        orientation = orientation.upper()
+        return self[orientation if orientation in ORIENTATIONS else 'J']
+
+    def hourly_weather(self) -> HourlyWeather:
+        """Rady pre hodinovú simuláciu (HourlyWeather, float64, vrátane vodorovnej plochy H)"""
+        return HourlyWeather(
+            temperature=self.temperature,
+            solar_radiation={o: self.irradiance(o) for o in ORIENTATIONS},
+        )
+
+    def climate_data(self) -> ClimateData:
+        """
+        Sezónne a mesačné údaje pre ročnú a mesačnú bilanciu
+
+        Vykurovacie obdobie tvoria dni s priemernou dennou teplotou do 13 °C;
+        žiarenie je úhrn za tieto dni [kWh/m²].
+        """
+        n_days = self.n_hours // 24
+        temperature = self.temperature[:n_days * 24].astype(np.float64)
+        daily_temperature = temperature.reshape(n_days, 24).mean(axis=1)
+        heating = daily_temperature <= HEATING_LIMIT_TEMPERATURE
+        heating_hours = np.repeat(heating, 24)
+
+        solar, monthly_solar = {}, {}
+        month_edges = np.concatenate([[0], np.cumsum(_HOURS_PER_MONTH)])
+        for orientation in ORIENTATIONS:
+            if orientation == 'H':
+                continue
+            values = self.irradiance(orientation)[:n_days * 24].astype(np.float64)
+            solar[orientation] = float(values[heating_hours].sum() / 1000)
+            if self.n_hours >= HOURS_PER_YEAR:
+                monthly_solar[orientation] = (np.add.reduceat(values, month_edges[:-1]) / 1000).tolist()
+
+        monthly_temperatures = None
+        if self.n_hours >= HOURS_PER_YEAR:
+            monthly_temperatures = (np.add.reduceat(temperature, month_edges[:-1]) / _HOURS_PER_MONTH).tolist()
+
+        heating_days = int(heating.sum())
+        climate = ClimateData(
+            external_temperature=float(daily_temperature[heating].mean()) if heating_days else INTERNAL_TEMPERATURE,
+            heating_days=heating_days,
+            degree_days=float((INTERNAL_TEMPERATURE - daily_temperature[heating]).sum()),
+            solar_radiation=solar,
+            monthly_solar_radiation=monthly_solar or None,
+        )
+        if monthly_temperatures is not None:
+            climate.monthly_temperatures = monthly_temperatures
+        return climate
+
+
+class ClimateStore:
+    """
+    Adresár staníc: index stations.json a jeden súbor .npy na stanicu
+
+    Načítané rady a odvodené ClimateData sa ukladajú do vyrovnávacej
+    pamäte úložiska, takže všetky budovy v okolí jednej stanice zdieľajú
+    jedno namapované pole a jeden objekt ClimateData.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, _INDEX_FILE), encoding='utf-8') as file:
+            index = json.load(file)
+        self.stations = [Station(**item) for item in index['stations']]
+        self._index = {station.station_id: i for i, station in enumerate(self.stations)}
+        self._latitudes = np.array([station.latitude for station in self.stations])
+        self._longitudes = np.array([station.longitude for station in self.stations])
+        self._series: Dict[str, StationSeries] = {}
+        self._climate: Dict[str, ClimateData] = {}
+
+    # Zápis
+
+    @staticmethod
+    def write(path: str, stations: List[Tuple[Station, Dict[str, np.ndarray]]]) -> 'ClimateStore':
+        """
+        Vytvorenie úložiska
+
+        Args:
+            path: adresár úložiska (vytvorí sa)
+            stations: dvojice (stanica, rady podľa SERIES, každý s rovnakým počtom hodín)
+        """
+        os.makedirs(path, exist_ok=True)
+        for station, series in stations:
+            missing = set(SERIES) - set(series)
+            if missing:
+                raise ValueError(f"Stanici {station.station_id} chýbajú rady: {sorted(missing)}")
+            data = np.stack([np.asarray(series[name], dtype=np.float32) for name in SERIES])
+            np.save(os.path.join(path, f"{station.station_id}.npy"), data)
+        with open(os.path.join(path, _INDEX_FILE), 'w', encoding='utf-8') as file:
+            json.dump({'series': list(SERIES), 'stations': [asdict(station) for station, _ in stations]},
+                      file, ensure_ascii=False, indent=1)
+        return ClimateStore(path)
+
+    # Vyhľadávanie
+
+    def station(self, station_id: str) -> Station:
+        return self.stations[self._index[station_id]]
+
+    def nearest(self, latitude: float, longitude: float) -> Station:
+        """Najbližšia stanica k súradniciam [°]"""
+        if not self.stations:
+            raise ValueError("Úložisko neobsahuje žiadnu stanicu")
+        distance = haversine_distance(latitude, longitude, self._latitudes, self._longitudes)
+        return self.stations[int(np.argmin(distance))]
+
+    # Načítanie (lenivé, zdieľané)
+
+    def series(self, station_id: str) -> StationSeries:
+        """Hodinové rady stanice (pamäťovo mapované, načítané raz)"""
+        series = self._series.get(station_id)
+        if series is None:
+            data = np.load(os.path.join(self.path, f"{station_id}.npy"), mmap_mode='r')
+            series = self._series[station_id] = StationSeries(self.station(station_id), data)
+        return series
+
+    def climate_data(self, station_id: str) -> ClimateData:
+        """ClimateData stanice (jeden zdieľaný objekt pre všetky budovy)"""
+        climate = self._climate.get(station_id)
+        if climate is None:
+            climate = self._climate[station_id] = self.series(station_id).climate_data()
+        return climate
+
+    def climate_data_near(self, latitude: float, longitude: float) -> ClimateData:
+        """ClimateData najbližšej stanice"""
+        return self.climate_data(self.nearest(latitude, longitude).station_id)
+
+
+def synthetic_series(mean_temperature: float = 10.0,
+                     annual_amplitude: float = 10.5,
+                     mean_humidity: float = 0.72,
+                     solar_scale: float = 1.0) -> Dict[str, np.ndarray]:
+    """Syntetický referenčný rok pre stanicu bez nameraných údajov (rady podľa SERIES)"""
+    peaks = {orientation: peak * solar_scale for orientation, peak in DEFAULT_SOLAR_PEAKS.items()}
+    peaks['H'] = 800.0 * solar_scale
+    weather = HourlyWeather.synthetic(mean_temperature, annual_amplitude, solar_peaks=peaks)
+    # Relatívna vlhkosť klesá s dennou teplotou (vyššia v noci a v zime)
+    anomaly = weather.temperature - mean_temperature
+    humidity = np.clip(mean_humidity - 0.012 * anomaly, 0.2, 1.0)
+    series = {TEMPERATURE: weather.temperature, RELATIVE_HUMIDITY: humidity}
+    series.update(weather.solar_radiation)
+    return series
+
+
+def create_slovak_store(path: str) -> ClimateStore:
+    """Úložisko so slovenskými referenčnými stanicami (syntetické referenčné roky)"""
+    return ClimateStore.write(path, [
+        (station, synthetic_series(*_SYNTHETIC_PARAMETERS[station.station_id]))
+        for station in SLOVAK_STATIONS
+    ])
+
+
+# Otvorené úložiská zdieľané v rámci procesu
+_OPEN_STORES: Dict[str, ClimateStore] = {}
+
+
+def open_store(path: str) -> ClimateStore:
+    """Úložisko pre adresár (v procese sa otvorí raz a zdieľa)"""
+    key = os.path.abspath(path)
+    store = _OPEN_STORES.get(key)
+    if store is None:
+        store = _OPEN_STORES[key] = ClimateStore(path)
+    return store
@@ -0,0 +1,516 @@
+"""
+Stĺpcová (struct-of-arrays) reprezentácia portfólia budov
+Súvislé polia pre vrstvy, konštrukcie, okná a zóny s indexmi posunov
+"""
+
+import json
+from collections.abc import Sequence as SequenceABC
+from dataclasses import dataclass, fields
+from functools import cached_property
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .models import (
+    Building, BuildingCategory, Zone, Construction, ConstructionType, Layer,
+    Material, Window, ThermalBridge, HeatingSystem, HeatingSystemType,
+    HotWaterSystem, ClimateData
+)
+
+
+# Kódovanie enumerácií do celých čísel
+BUILDING_CATEGORIES = list(BuildingCategory)
+CONSTRUCTION_TYPES = list(ConstructionType)
+
+
+def _offsets(counts: Sequence[int]) -> np.ndarray:
+    """Posuny (n+1) z počtov prvkov"""
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def _owner_index(offsets: np.ndarray) -> np.ndarray:
+    """Index vlastníka pre každý prvok podľa posunov"""
+    return np.repeat(np.arange(len(offsets) - 1, dtype=np.int64), np.diff(offsets))
+
+
+# Binárny súbor portfólia: hlavička JSON + stĺpce zarovnané na _ALIGNMENT bajtov
+FILE_MAGIC = b'EAPORTF\x00'
+FILE_FORMAT_VERSION = 1
+_ALIGNMENT = 64
+
+# Stĺpce reťazcov (v súbore blok UTF-8 a posuny) a zdieľané objekty (v hlavičke)
+_STRING_COLUMNS = (
+    'material_name', 'material_category', 'construction_name', 'construction_orientation',
+    'window_name', 'window_orientation', 'bridge_name', 'zone_name', 'building_name',
+)
+_OBJECT_COLUMNS = ('heating_systems', 'hot_water_systems', 'climates')
+
+
+class StringColumn(SequenceABC):
+    """
+    Stĺpec reťazcov uložený ako súvislý blok UTF-8 s posunmi
+
+    Reťazce sa dekódujú až pri prístupe, takže pri mapovanom súbore sa
+    z disku načítajú len stránky, ktoré sa skutočne čítajú.
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self.data = data  # bajty UTF-8 (uint8)
+        self.offsets = offsets  # n + 1 posunov
+
+    @classmethod
+    def from_strings(cls, strings: Sequence[str]) -> 'StringColumn':
+        encoded = [string.encode('utf-8') for string in strings]
+        offsets = _offsets([len(item) for item in encoded])
+        return cls(np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        start, end = int(self.offsets[index]), int(self.offsets[index + 1])
+        return self.data[start:end].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        # Celý stĺpec naraz: jeden prevod blokov namiesto prístupu po prvkoch
+        data = self.data.tobytes()
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield data[start:end].decode('utf-8')
+
+
+def _system_to_dict(item) -> Dict:
+    """Zdieľaný systémový objekt pre hlavičku súboru"""
+    data = dict(vars(item))
+    if isinstance(item, HeatingSystem):
+        data['system_type'] = item.system_type.value
+    return data
+
+
+def _system_from_dict(column: str, data: Dict):
+    if column == 'heating_systems':
+        return HeatingSystem(**{**data, 'system_type': HeatingSystemType(data['system_type'])})
+    if column == 'hot_water_systems':
+        return HotWaterSystem(**data)
+    return ClimateData(**data)
+
+
+class _Interner:
+    """Priradenie indexu objektom podľa identity (zdieľané objekty = jeden riadok)"""
+
+    def __init__(self):
+        self.codes: Dict[int, int] = {}
+        self.items: List = []
+
+    def code(self, item) -> int:
+        key = id(item)
+        code = self.codes.get(key)
+        if code is None:
+            code = self.codes[key] = len(self.items)
+            self.items.append(item)
+        return code
+
+
+@dataclass
+class BuildingStore:
+    """
+    Stĺpcové úložisko portfólia budov
+
+    Každá tabuľka (materiály, vrstvy, konštrukcie, okná, tepelné mosty, zóny,
+    budovy) je uložená ako súbor súvislých polí rovnakej dĺžky. Hierarchia je
+    zachytená poľami posunov: prvky zóny z sú napr. konštrukcie
+    zone_construction_offsets[z]:zone_construction_offsets[z + 1].
+    Zdieľané objekty (materiály, systémy, klimatické údaje) sú uložené raz.
+
+    Úložisko sa dá zapísať do binárneho súboru (save) a otvoriť bez
+    kopírovania pamäťovým mapovaním (open); stĺpce sa potom načítajú
+    z disku po stránkach až pri prístupe.
+    """
+    # Materiály
+    material_name: List[str]
+    material_conductivity: np.ndarray  # λ [W/(m.K)]
+    material_density: np.ndarray  # ρ [kg/m³]
+    material_specific_heat: np.ndarray  # c [J/(kg.K)]
+    material_category: List[str]
+
+    # Vrstvy
+    layer_material: np.ndarray  # index materiálu
+    layer_thickness: np.ndarray  # [m]
+
+    # Konštrukcie
+    construction_name: List[str]
+    construction_type: np.ndarray  # kód ConstructionType
+    construction_area: np.ndarray  # [m²]
+    construction_orientation: List[str]
+    construction_rsi: np.ndarray
+    construction_rse: np.ndarray
+    construction_layer_offsets: np.ndarray
+
+    # Okná
+    window_name: List[str]
+    window_area: np.ndarray  # [m²]
+    window_u_value: np.ndarray  # [W/(m².K)]
+    window_g_value: np.ndarray  # [-]
+    window_orientation: List[str]
+    window_shading_factor: np.ndarray  # [-]
+
+    # Tepelné mosty
+    bridge_name: List[str]
+    bridge_psi_value: np.ndarray  # [W/(m.K)]
+    bridge_length: np.ndarray  # [m]
+
+    # Zóny
+    zone_name: List[str]
+    zone_floor_area: np.ndarray  # [m²]
+    zone_volume: np.ndarray  # [m³]
+    zone_internal_temperature: np.ndarray  # [°C]
+    zone_construction_offsets: np.ndarray
+    zone_window_offsets: np.ndarray
+    zone_bridge_offsets: np.ndarray
+
+    # Budovy
+    building_name: List[str]
+    building_category: np.ndarray  # kód BuildingCategory
+    building_zone_offsets: np.ndarray
+    building_length: np.ndarray
+    building_width: np.ndarray
+    building_height: np.ndarray
+    building_floors_count: np.ndarray
+    building_heating_system: np.ndarray  # index do heating_systems, -1 = bez systému
+    building_hot_water_system: np.ndarray  # index do hot_water_systems, -1 = bez systému
+    building_climate: np.ndarray  # index do climates
+
+    # Zdieľané systémové objekty
+    heating_systems: List[HeatingSystem]
+    hot_water_systems: List[HotWaterSystem]
+    climates: List[ClimateData]
+
+    def __len__(self) -> int:
+        return len(self.building_name)
+
+    @property
+    def n_buildings(self) -> int:
+        return len(self.building_name)
+
+    # Indexy vlastníkov (odvodené z posunov, počítané raz)
+
+    @cached_property
+    def layer_construction(self) -> np.ndarray:
+        """Index konštrukcie pre každú vrstvu"""
+        return _owner_index(self.construction_layer_offsets)
+
+    @cached_property
+    def construction_zone(self) -> np.ndarray:
+        """Index zóny pre každú konštrukciu"""
+        return _owner_index(self.zone_construction_offsets)
+
+    @cached_property
+    def window_zone(self) -> np.ndarray:
+        """Index zóny pre každé okno"""
+        return _owner_index(self.zone_window_offsets)
+
+    @cached_property
+    def bridge_zone(self) -> np.ndarray:
+        """Index zóny pre každý tepelný most"""
+        return _owner_index(self.zone_bridge_offsets)
+
+    @cached_property
+    def zone_building(self) -> np.ndarray:
+        """Index budovy pre každú zónu"""
+        return _owner_index(self.building_zone_offsets)
+
+    @cached_property
+    def window_orientation_codes(self) -> Tuple[List[str], np.ndarray]:
+        """Orientácie okien (veľkými písmenami) a kód orientácie každého okna"""
+        codes: Dict[str, int] = {}
+        window_codes = np.fromiter(
+            (codes.setdefault(o.upper(), len(codes)) for o in self.window_orientation),
+            dtype=np.int64, count=len(self.window_orientation)
+        )
+        return list(codes), window_codes
+
+    @cached_property
+    def layer_conductivity(self) -> np.ndarray:
+        """Tepelná vodivosť materiálu každej vrstvy λ [W/(m.K)]"""
+        return self.material_conductivity[self.layer_material]
+
+    @classmethod
+    def from_buildings(cls, buildings: Sequence[Building]) -> 'BuildingStore':
+        """Vytvorenie úložiska z objektov Building (jeden prechod stromom)"""
+        materials = _Interner()
+        heating_systems = _Interner()
+        hot_water_systems = _Interner()
+        climates = _Interner()
+        category_codes = {category: i for i, category in enumerate(BUILDING_CATEGORIES)}
+        type_codes = {construction_type: i for i, construction_type in enumerate(CONSTRUCTION_TYPES)}
+
+        layer_material, layer_thickness = [], []
+        c_name, c_type, c_area, c_orient, c_rsi, c_rse, c_layers = [], [], [], [], [], [], []
+        w_name, w_area, w_u, w_g, w_orient, w_shading = [], [], [], [], [], []
+        tb_name, tb_psi, tb_length = [], [], []
+        z_name, z_floor, z_volume, z_temp, z_constr, z_win, z_tb = [], [], [], [], [], [], []
+        b_name, b_category, b_zones, b_length, b_width, b_height, b_floors = [], [], [], [], [], [], []
+        b_heating, b_hot_water, b_climate = [], [], []
+
+        for building in buildings:
+            b_name.append(building.name)
+            b_category.append(category_codes[building.category])
+            b_zones.append(len(building.zones))
+            b_length.append(building.length)
+            b_width.append(building.width)
+            b_height.append(building.height)
+            b_floors.append(building.floors_count)
+            b_heating.append(-1 if building.heating_system is None
+                             else heating_systems.code(building.heating_system))
+            b_hot_water.append(-1 if building.hot_water_system is None
+                               else hot_water_systems.code(building.hot_water_system))
+            b_climate.append(climates.code(building.climate_data))
+
+            for zone in building.zones:
+                z_name.append(zone.name)
+                z_floor.append(zone.floor_area)
+                z_volume.append(zone.volume)
+                z_temp.append(zone.internal_temperature)
+                z_constr.append(len(zone.constructions))
+                z_win.append(len(zone.windows))
+                z_tb.append(len(zone.thermal_bridges))
+
+                for construction in zone.constructions:
+                    c_name.append(construction.name)
+                    c_type.append(type_codes[construction.construction_type])
+                    c_area.append(construction.area)
+                    c_orient.append(construction.orientation)
+                    c_rsi.append(construction.rsi)
+                    c_rse.append(construction.rse)
+                    c_layers.append(len(construction.layers))
+                    for layer in construction.layers:
+                        layer_material.append(materials.code(layer.material))
+                        layer_thickness.append(layer.thickness)
+
+                for window in zone.windows:
+                    w_name.append(window.name)
+                    w_area.append(window.area)
+                    w_u.append(window.u_value)
+                    w_g.append(window.g_value)
+                    w_orient.append(window.orientation)
+                    w_shading.append(window.shading_factor)
+
+                for bridge in zone.thermal_bridges:
+                    tb_name.append(bridge.name)
+                    tb_psi.append(bridge.psi_value)
+                    tb_length.append(bridge.length)
+
+        def floats(values):
+            return np.asarray(values, dtype=np.float64)
+
+        material_items: List[Material] = materials.items
+        return cls(
+            material_name=[m.name for m in material_items],
+            material_conductivity=floats([m.thermal_conductivity for m in material_items]),
+            material_density=floats([m.density for m in material_items]),
+            material_specific_heat=floats([m.specific_heat for m in material_items]),
+            material_category=[m.category for m in material_items],
+            layer_material=np.asarray(layer_material, dtype=np.int32),
+            layer_thickness=floats(layer_thickness),
+            construction_name=c_name,
+            construction_type=np.asarray(c_type, dtype=np.int8),
+            construction_area=floats(c_area),
+            construction_orientation=c_orient,
+            construction_rsi=floats(c_rsi),
+            construction_rse=floats(c_rse),
+            construction_layer_offsets=_offsets(c_layers),
+            window_name=w_name,
+            window_area=floats(w_area),
+            window_u_value=floats(w_u),
+            window_g_value=floats(w_g),
+            window_orientation=w_orient,
+            window_shading_factor=floats(w_shading),
+            bridge_name=tb_name,
+            bridge_psi_value=floats(tb_psi),
+            bridge_length=floats(tb_length),
+            zone_name=z_name,
+            zone_floor_area=floats(z_floor),
+            zone_volume=floats(z_volume),
+            zone_internal_temperature=floats(z_temp),
+            zone_construction_offsets=_offsets(z_constr),
+            zone_window_offsets=_offsets(z_win),
+            zone_bridge_offsets=_offsets(z_tb),
+            building_name=b_name,
+            building_category=np.asarray(b_category, dtype=np.int8),
+            building_zone_offsets=_offsets(b_zones),
+            building_length=floats(b_length),
+            building_width=floats(b_width),
+            building_height=floats(b_height),
+            building_floors_count=np.asarray(b_floors, dtype=np.int64),
+            building_heating_system=np.asarray(b_heating, dtype=np.int64),
+            building_hot_water_system=np.asarray(b_hot_water, dtype=np.int64),
+            building_climate=np.asarray(b_climate, dtype=np.int64),
+            heating_systems=heating_systems.items,
+            hot_water_systems=hot_water_systems.items,
+            climates=climates.items,
+        )
+
+    def _materials(self) -> List[Material]:
+        return [
+            Material(name, float(conductivity), float(density), float(specific_heat), category)
+            for name, conductivity, density, specific_heat, category in zip(
+                self.material_name, self.material_conductivity.tolist(),
+                self.material_density.tolist(), self.material_specific_heat.tolist(),
+                self.material_category
+            )
+        ]
+
+    def _build(self, index: int, materials: List[Material]) -> Building:
+        """Zostavenie jednej budovy z riadkov tabuliek"""
+        heating_index = int(self.building_heating_system[index])
+        hot_water_index = int(self.building_hot_water_system[index])
+        building = Building(
+            name=self.building_name[index],
+            category=BUILDING_CATEGORIES[self.building_category[index]],
+            heating_system=self.heating_systems[heating_index] if heating_index >= 0 else None,
+            hot_water_system=self.hot_water_systems[hot_water_index] if hot_water_index >= 0 else None,
+            climate_data=self.climates[self.building_climate[index]],
+            length=float(self.building_length[index]),
+            width=float(self.building_width[index]),
+            height=float(self.building_height[index]),
+            floors_count=int(self.building_floors_count[index]),
+        )
+
+        for z in range(self.building_zone_offsets[index], self.building_zone_offsets[index + 1]):
+            zone = Zone(self.zone_name[z], float(self.zone_floor_area[z]), float(self.zone_volume[z]),
+                        float(self.zone_internal_temperature[z]))
+
+            for c in range(self.zone_construction_offsets[z], self.zone_construction_offsets[z + 1]):
+                start, end = self.construction_layer_offsets[c], self.construction_layer_offsets[c + 1]
+                zone.constructions.append(Construction(
+                    name=self.construction_name[c],
+                    construction_type=CONSTRUCTION_TYPES[self.construction_type[c]],
+                    layers=[Layer(materials[m], t) for m, t in zip(
+                        self.layer_material[start:end].tolist(), self.layer_thickness[start:end].tolist()
+                    )],
+                    area=float(self.construction_area[c]),
+                    orientation=self.construction_orientation[c],
+                    rsi=float(self.construction_rsi[c]),
+                    rse=float(self.construction_rse[c]),
+                ))
+
+            for w in range(self.zone_window_offsets[z], self.zone_window_offsets[z + 1]):
+                zone.windows.append(Window(
+                    name=self.window_name[w],
+                    area=float(self.window_area[w]),
+                    u_value=float(self.window_u_value[w]),
+                    g_value=float(self.window_g_value[w]),
+                    orientation=self.window_orientation[w],
+                    shading_factor=float(self.window_shading_factor[w]),
+                ))
+
+            for t in range(self.zone_bridge_offsets[z], self.zone_bridge_offsets[z + 1]):
+                zone.thermal_bridges.append(ThermalBridge(
+                    self.bridge_name[t], float(self.bridge_psi_value[t]), float(self.bridge_length[t])
+                ))
+
+            building.zones.append(zone)
+        return building
+
+    def building(self, index: int) -> Building:
+        """Objekt Building pre jednu budovu úložiska"""
+        return self._build(index, self._materials())
+
+    def to_buildings(self) -> List[Building]:
+        """Spätná konverzia na objekty Building (zdieľané materiály zostanú zdieľané)"""
+        materials = self._materials()
+        return [self._build(i, materials) for i in range(len(self))]
+
+    # Binárny súbor
+
+    def save(self, path: str):
+        """
+        Zápis úložiska do binárneho súboru
+
+        Súbor tvorí FILE_MAGIC, dĺžka hlavičky (uint64), hlavička JSON
+        (typy, dĺžky a posuny stĺpcov, zdieľané systémové objekty) a za ňou
+        stĺpce ako surové polia zarovnané na _ALIGNMENT bajtov.
+        """
+        columns: Dict[str, Dict] = {}
+        blocks: List[Tuple[int, np.ndarray]] = []
+        position = 0
+
+        def add(name: str, array: np.ndarray):
+            nonlocal position
+            array = np.ascontiguousarray(array)
+            position = -(-position // _ALIGNMENT) * _ALIGNMENT
+            columns[name] = {'dtype': array.dtype.str, 'length': len(array), 'offset': position}
+            blocks.append((position, array))
+            position += array.nbytes
+
+        for column in fields(self):
+            name = column.name
+            if name in _OBJECT_COLUMNS:
+                continue
+            if name in _STRING_COLUMNS:
+                strings = getattr(self, name)
+                if not isinstance(strings, StringColumn):
+                    strings = StringColumn.from_strings(strings)
+                add(f"{name}.data", strings.data)
+                add(f"{name}.offsets", strings.offsets)
+            else:
+                add(name, getattr(self, name))
+
+        header = {
+            'format_version': FILE_FORMAT_VERSION,
+            'columns': columns,
+            'objects': {name: [_system_to_dict(item) for item in getattr(self, name)]
+                        for name in _OBJECT_COLUMNS},
+        }
+        header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        data_offset = -(-(len(FILE_MAGIC) + 8 + len(header_bytes)) // _ALIGNMENT) * _ALIGNMENT
+
+        with open(path, 'wb') as file:
+            file.write(FILE_MAGIC)
+            file.write(len(header_bytes).to_bytes(8, 'little'))
+            file.write(header_bytes)
+            for offset, array in blocks:
+                file.write(b'\x00' * (data_offset + offset - file.tell()))
+                file.write(memoryview(array).cast('B'))
+
+    @classmethod
+    def open(cls, path: str) -> 'BuildingStore':
+        """
+        Otvorenie binárneho súboru úložiska bez načítania údajov
+
+        Číselné stĺpce sú pohľady do jedného pamäťovo mapovaného súboru
+        (len na čítanie), reťazce sa dekódujú pri prístupe.
+        """
+        with open(path, 'rb') as file:
+            if file.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f"{path} nie je súbor portfólia budov")
+            header_length = int.from_bytes(file.read(8), 'little')
+            header = json.loads(file.read(header_length).decode('utf-8'))
+        if header.get('format_version') != FILE_FORMAT_VERSION:
+            raise ValueError(f"Nepodporovaná verzia súboru: {header.get('format_version')}")
+
+        raw = np.memmap(path, dtype=np.uint8, mode='r')
+        data_offset = -(-(len(FILE_MAGIC) + 8 + header_length) // _ALIGNMENT) * _ALIGNMENT
+
+        def column(name: str) -> np.ndarray:
+            spec = header['columns'][name]
+            dtype = np.dtype(spec['dtype'])
+            start = data_offset + spec['offset']
+            return raw[start:start + spec['length'] * dtype.itemsize].view(dtype)
+
+        values = {}
+        for field_info in fields(cls):
+            name = field_info.name
+            if name in _OBJECT_COLUMNS:
+                values[name] = [_system_from_dict(name, item) for item in header['objects'][name]]
+            elif name in _STRING_COLUMNS:
+                values[name] = StringColumn(column(f"{name}.data"), column(f"{name}.offsets"))
+            else:
+                values[name] = column(name)
+        return cls(**values)
@@ -0,0 +1,211 @@
+"""
+Hodinová dynamická simulácia vykurovania a chladenia (8760 h)
+Zjednodušený RC model zóny (1R1C) podľa STN EN ISO 13790 / 52016-1
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import numpy as np
+
+from .batch import BatchHeatingCalculations, Portfolio
+
+
+HOURS_PER_YEAR = 8760
+
+# Maximálna intenzita slnečného žiarenia pri jasnej oblohe v lete [W/m²]
+DEFAULT_SOLAR_PEAKS = {
+    'S': 120.0, 'SV': 250.0, 'V': 450.0, 'JV': 520.0,
+    'J': 600.0, 'JZ': 520.0, 'Z': 450.0, 'SZ': 250.0
+}
+
+# Efektívna tepelná kapacita na m² podlahovej plochy [J/(m².K)] (STN EN ISO 13790, Tab. 12)
+HEAT_CAPACITY_CLASSES = {
+    'veľmi_ľahká': 80000.0,
+    'ľahká': 110000.0,
+    'stredná': 165000.0,
+    'ťažká': 260000.0,
+    'veľmi_ťažká': 370000.0,
+}
+
+
+@dataclass
+class HourlyWeather:
+    """Hodinové klimatické údaje pre jeden rok"""
+    temperature: np.ndarray  # vonkajšia teplota θe [°C], tvar (hodiny,)
+    solar_radiation: Dict[str, np.ndarray] = field(default_factory=dict)  # [W/m²] podľa orientácie
+
+    def __post_init__(self):
+        self.temperature = np.asarray(self.temperature, dtype=np.float64)
+        self.solar_radiation = {
+            orientation.upper(): np.asarray(values, dtype=np.float64)
+            for orientation, values in self.solar_radiation.items()
+        }
+        for values in self.solar_radiation.values():
+            if values.shape != self.temperature.shape:
+                raise ValueError("Časové rady žiarenia a teploty musia mať rovnakú dĺžku")
+
+    @property
+    def n_hours(self) -> int:
+        return len(self.temperature)
+
+    def irradiance(self, orientation: str) -> np.ndarray:
+        """Intenzita žiarenia pre orientáciu (neznáma orientácia = juh)"""
+        orientation = orientation.upper()
+        if orientation not in self.solar_radiation:
+            orientation = 'J'
+        return self.solar_radiation[orientation]
+
+    @classmethod
+    def synthetic(cls,
+                  annual_mean_temperature: float = 10.0,
+                  annual_amplitude: float = 10.5,
+                  daily_amplitude: float = 4.0,
+                  solar_peaks: Optional[Dict[str, float]] = None,
+                  coldest_day: int = 15) -> 'HourlyWeather':
+        """
+        Syntetický referenčný rok (harmonický priebeh teploty a žiarenia)
+
+        Slúži na testovanie a orientačné výpočty, keď nie sú k dispozícii
+        namerané hodinové údaje (TMY).
+        """
+        hours = np.arange(HOURS_PER_YEAR, dtype=np.float64)
+        day = hours / 24.0
+        hour_of_day = hours % 24.0
+
+        # Ročný a denný priebeh teploty (denné maximum o 15:00)
+        seasonal = -np.cos(2 * np.pi * (day - coldest_day) / 365.0)
+        daily = np.cos(2 * np.pi * (hour_of_day - 15.0) / 24.0)
+        temperature = annual_mean_temperature + annual_amplitude * seasonal + daily_amplitude * daily
+
+        # Dĺžka dňa 8-16 h, výška slnka vyjadrená sezónnym faktorom 0.35-1.0
+        day_length = 12.0 + 4.0 * seasonal
+        sunrise = 12.0 - day_length / 2
+        sun = np.clip(np.sin(np.pi * (hour_of_day - sunrise) / day_length), 0.0, None)
+        intensity = sun * (0.675 + 0.325 * seasonal)
+
+        peaks = DEFAULT_SOLAR_PEAKS if solar_peaks is None else solar_peaks
+        return cls(
+            temperature=temperature,
+            solar_radiation={orientation: peak * intensity for orientation, peak in peaks.items()}
+        )
+
+
+def sum_zones_per_building(loads: np.ndarray, zone_building: np.ndarray, n_buildings: int) -> np.ndarray:
+    """Súčet zónových hodnôt [hodina × zóna] za budovy [hodina × budova]"""
+    counts = np.bincount(zone_building, minlength=n_buildings)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    nonempty = counts > 0
+    result = np.zeros((loads.shape[0], n_buildings))
+    if nonempty.any():
+        # Zóny jednej budovy sú v BuildingStore uložené za sebou
+        result[:, nonempty] = np.add.reduceat(loads, starts[nonempty], axis=1)
+    return result
+
+
+@dataclass
+class HourlySimulationResult:
+    """Výsledky hodinovej simulácie (polia tvaru [hodina × zóna])"""
+    zone_temperature: np.ndarray  # [°C]
+    heating_load: np.ndarray  # potrebný vykurovací výkon [W]
+    cooling_load: np.ndarray  # potrebný chladiaci výkon [W]
+    zone_building: np.ndarray  # index budovy pre každú zónu
+    n_buildings: int
+
+    def _per_building(self, zone_values: np.ndarray) -> np.ndarray:
+        return np.bincount(self.zone_building, weights=zone_values, minlength=self.n_buildings)
+
+    def annual_heating_demand(self) -> np.ndarray:
+        """Ročná potreba tepla na vykurovanie [kWh] pre každú budovu"""
+        return self._per_building(self.heating_load.sum(axis=0)) / 1000
+
+    def annual_cooling_demand(self) -> np.ndarray:
+        """Ročná potreba chladu [kWh] pre každú budovu"""
+        return self._per_building(self.cooling_load.sum(axis=0)) / 1000
+
+    def building_loads(self, loads: np.ndarray) -> np.ndarray:
+        """Hodinový výkon budov [hodina × budova] zo zónových hodnôt"""
+        return sum_zones_per_building(loads, self.zone_building, self.n_buildings)
+
+    def peak_heating_load(self) -> np.ndarray:
+        """Maximálny hodinový vykurovací výkon [W] pre každú budovu"""
+        return self.building_loads(self.heating_load).max(axis=0, initial=0.0)
+
+    def peak_cooling_load(self) -> np.ndarray:
+        """Maximálny hodinový chladiaci výkon [W] pre každú budovu"""
+        return self.building_loads(self.cooling_load).max(axis=0, initial=0.0)
+
+
+class HourlySimulation:
+    """
+    Hodinová simulácia ideálneho vykurovania a chladenia
+
+    Každá zóna je reprezentovaná jedným tepelným odporom (HT + HV) a jednou
+    tepelnou kapacitou Cm. Teplota zóny sa počíta implicitnou Eulerovou
+    metódou s krokom 1 h; ak voľne plávajúca teplota klesne pod požadovanú
+    teplotu vykurovania alebo stúpne nad požadovanú teplotu chladenia,
+    dopočíta sa ideálny výkon, ktorý ju udrží na hranici.
+    Výpočet je vektorizovaný cez všetky zóny portfólia naraz.
+    """
+
+    @staticmethod
+    def simulate(portfolio: Portfolio,
+                 weather: HourlyWeather,
+                 air_change_rate=0.5,
+                 cooling_setpoint: float = 26.0,
+                 heat_capacity_per_area: float = HEAT_CAPACITY_CLASSES['stredná'],
+                 thermal_bridges_delta_u: float = 0.1) -> HourlySimulationResult:
+        """
+        Args:
+            portfolio: zoznam budov alebo BuildingStore
+            weather: hodinové klimatické údaje
+            air_change_rate: intenzita výmeny vzduchu [1/h] (skalár alebo pole na budovu)
+            cooling_setpoint: požadovaná teplota pri chladení [°C]
+            heat_capacity_per_area: efektívna tepelná kapacita [J/(m².K)]
+            thermal_bridges_delta_u: prirážka na tepelné mosty ΔU [W/(m².K)]
+
+        Returns:
+            hodinové teploty zón a výkony vykurovania a chladenia
+        """
+        store = BatchHeatingCalculations.as_store(portfolio)
+
+        # Parametre zón
+        h_total = (BatchHeatingCalculations.calculate_zone_transmission_heat_loss_coefficient(
+                       store, thermal_bridges_delta_u)
+                   + BatchHeatingCalculations.calculate_zone_ventilation_heat_loss_coefficient(
+                       store, air_change_rate))
+        capacity = heat_capacity_per_area * store.zone_floor_area / 3600.0  # [Wh/K] pre krok 1 h
+        heating_setpoint = store.zone_internal_temperature
+        cooling = np.maximum(cooling_setpoint, heating_setpoint)
+
+        # Tepelné zisky [hodina × zóna]: vnútorné + solárne
+        orientations, apertures = BatchHeatingCalculations.calculate_zone_solar_apertures(store)
+        gains = np.broadcast_to(BatchHeatingCalculations.calculate_zone_internal_gains(store),
+                                (weather.n_hours, len(h_total))).copy()
+        if orientations:
+            irradiance = np.column_stack([weather.irradiance(o) for o in orientations])
+            gains += irradiance @ apertures.T
+
+        # Budiace členy, ktoré nezávisia od teploty zóny
+        forcing = gains + np.outer(weather.temperature, h_total)
+        conductance = capacity + h_total
+        inverse = 1.0 / conductance
+
+        free_temperature = np.empty_like(forcing)
+        zone_temperature = np.empty_like(forcing)
+        temperature = heating_setpoint.copy()
+        for hour in range(weather.n_hours):
+            free = (capacity * temperature + forcing[hour]) * inverse
+            free_temperature[hour] = free
+            temperature = np.clip(free, heating_setpoint, cooling)
+            zone_temperature[hour] = temperature
+
+        # Ideálny výkon potrebný na posun z voľnej teploty na požadovanú
+        correction = conductance * (zone_temperature - free_temperature)
+        return HourlySimulationResult(
+            zone_temperature=zone_temperature,
+            heating_load=np.maximum(correction, 0.0),
+            cooling_load=np.maximum(-correction, 0.0),
+            zone_building=store.zone_building,
+            n_buildings=store.n_buildings,
+        )
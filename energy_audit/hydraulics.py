@@ -0,0 +1,515 @@
+"""
+Model potrubnej siete vykurovacej sústavy a hydraulický výpočet
+Súčasný výpočet prietokov a tlakov globálnou gradientovou metódou (Todini-Pilati)
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import spsolve
+
+from .calculations import HydraulicCalculations
+from . import water_properties
+
+
+# Druhy úsekov siete
+PIPE = 0  # potrubie
+TERMINAL = 1  # vykurovacie teleso (radiátor s termostatickým ventilom)
+VALVE = 2  # vyvažovací ventil
+PUMP = 3  # čerpadlo s charakteristikou
+
+# Návrhová stredná teplota vody [°C]
+DEFAULT_WATER_TEMPERATURE = 60.0
+
+# Relatívny krok numerickej derivácie súčiniteľa trenia
+_LOG_STEP = 1e-6
+
+# Prietok, pod ktorým sa derivácia kvadratických strát neznižuje (regularizácia Newtonovej metódy)
+MIN_SLOPE_FLOW = 1e-4  # [kg/s]
+
+
+def kv_pressure_loss(mass_flow: np.ndarray, kv: np.ndarray, density: float) -> np.ndarray:
+    """Tlaková strata prvku s prietokovým súčiniteľom Kv [Pa] (so znamienkom prietoku)"""
+    volume_flow = mass_flow / density * 3600  # [m³/h]
+    return 1e5 * volume_flow * np.abs(volume_flow) / kv ** 2
+
+
+@dataclass
+class ValveCatalogue:
+    """
+    Katalógová charakteristika prednastaviteľného ventilu Kv(nastavenie)
+
+    Kv medzi katalógovými bodmi sa interpoluje lineárne; nastavenie sa dá
+    meniť po krokoch resolution (napr. 0.1 otáčky ručného kolesa).
+    """
+    name: str
+    presets: np.ndarray  # nastavenia ventilu (rastúce)
+    kv_values: np.ndarray  # Kv pri nastaveniach [m³/h] (rastúce)
+    resolution: float = 0.1  # najmenší krok nastavenia
+
+    def __post_init__(self):
+        self.presets = np.asarray(self.presets, dtype=np.float64)
+        self.kv_values = np.asarray(self.kv_values, dtype=np.float64)
+        if np.any(np.diff(self.presets) <= 0) or np.any(np.diff(self.kv_values) <= 0):
+            raise ValueError("Charakteristika ventilu musí byť rastúca")
+
+    @property
+    def kv_min(self) -> float:
+        return float(self.kv_values[0])
+
+    @property
+    def kv_max(self) -> float:
+        return float(self.kv_values[-1])
+
+    def kv(self, preset):
+        """Kv pri nastavení [m³/h]"""
+        return np.interp(preset, self.presets, self.kv_values)
+
+    def preset(self, kv):
+        """Nastavenie pre požadované Kv, zaokrúhlené na krok a obmedzené na rozsah ventilu"""
+        preset = np.interp(kv, self.kv_values, self.presets)
+        if self.resolution > 0:
+            steps = np.round((preset - self.presets[0]) / self.resolution)
+            preset = np.minimum(self.presets[0] + steps * self.resolution, self.presets[-1])
+        return preset
+
+
+# Katalógové charakteristiky typových ventilov
+VALVE_CATALOGUE = {
+    # Termostatický ventil s prednastavením (nastavenia 1-7, N = 8)
+    'TRV_DN15': ValveCatalogue('TRV_DN15', [1, 2, 3, 4, 5, 6, 7, 8],
+                               [0.04, 0.08, 0.12, 0.19, 0.25, 0.33, 0.38, 0.73]),
+    # Vyvažovacie ventily (nastavenie v otáčkach ručného kolesa)
+    'STAD_DN15': ValveCatalogue('STAD_DN15', [0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0],
+                                [0.127, 0.212, 0.314, 0.571, 0.877, 1.38, 1.92, 2.52]),
+    'STAD_DN20': ValveCatalogue('STAD_DN20', [0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0],
+                                [0.511, 0.757, 1.19, 1.9, 2.80, 3.87, 4.75, 5.70]),
+}
+
+
+def friction_factor(reynolds: np.ndarray, relative_roughness, method: str):
+    """
+    Súčiniteľ trenia so spojitým prechodom laminárne/turbulentné prúdenie
+
+    Bez prechodovej oblasti by strata mala skok pri Re = 2300 a Newtonova
+    metóda by okolo neho oscilovala.
+
+    Returns:
+        (λ [-], d ln λ / d ln Re [-]) - derivácia numericky pre Jacobiho maticu
+    """
+    friction = HydraulicCalculations.calculate_friction_factor_array(
+        reynolds, relative_roughness, method, transition=True
+    )
+    shifted = HydraulicCalculations.calculate_friction_factor_array(
+        reynolds * (1 + _LOG_STEP), relative_roughness, method, transition=True
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_slope = np.log(shifted / friction) / np.log1p(_LOG_STEP)
+    return friction, np.where(friction > 0, log_slope, -1.0)
+
+
+@dataclass
+class NetworkSolution:
+    """Výsledok hydraulického výpočtu siete"""
+    flow: np.ndarray  # hmotnostný prietok úsekov [kg/s] (kladný v smere start → end)
+    pressure: np.ndarray  # tlak v uzloch [Pa]
+    pressure_drop: np.ndarray  # tlaková strata úsekov [Pa]
+    iterations: int
+    converged: bool
+    residual: float  # najväčšia nerovnováha prietokov v uzle [kg/s]
+    link_index: Dict[str, int] = field(default_factory=dict, repr=False)
+    node_index: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    def link_flow(self, name: str) -> float:
+        return float(self.flow[self.link_index[name]])
+
+    def node_pressure(self, name: str) -> float:
+        return float(self.pressure[self.node_index[name]])
+
+
+class PipeNetwork:
+    """
+    Potrubná sieť vykurovacej sústavy
+
+    Sieť je orientovaný graf: uzly sú odbočky a pripojenia, úseky sú
+    potrubia, vykurovacie telesá, ventily a čerpadlá. Aspoň v jednom uzle
+    musí byť zadaný tlak (expanzná nádoba); zadaním tlaku na výtlaku
+    čerpadla sa modeluje čerpadlo s konštantným diferenčným tlakom.
+    """
+
+    def __init__(self, water_temperature: float = DEFAULT_WATER_TEMPERATURE,
+                 friction_method: str = "colebrook"):
+        self.water_temperature = water_temperature  # [°C]
+        self.friction_method = friction_method  # blasius, swamee_jain, colebrook
+
+        self.node_names: List[str] = []
+        self.node_index: Dict[str, int] = {}
+        self.fixed_pressure: Dict[int, float] = {}  # [Pa]
+
+        self.link_names: List[str] = []
+        self.link_index: Dict[str, int] = {}
+        self.link_kind: List[int] = []
+        self.link_start: List[int] = []
+        self.link_end: List[int] = []
+        self.length: List[float] = []  # [m]
+        self.diameter: List[float] = []  # vnútorný priemer [m]
+        self.roughness: List[float] = []  # absolútna drsnosť [m]
+        self.zeta: List[float] = []  # súčet súčiniteľov miestnych strát [-]
+        self.kv: List[float] = []  # prietokový súčiniteľ [m³/h] (inf = bez odporu)
+        self.pump_pressure: List[float] = []  # tlak čerpadla pri nulovom prietoku [Pa]
+        self.pump_max_flow: List[float] = []  # prietok pri nulovom tlaku [kg/s]
+        self.zone: List[Optional[str]] = []  # zóna vykurovaná telesom
+        self.design_flow: List[float] = []  # návrhový prietok telesa [kg/s]
+        self.catalogue: List[Optional[ValveCatalogue]] = []  # charakteristika prednastaviteľného ventilu
+        self.preset: List[float] = []  # nastavenie ventilu (nan = bez prednastavenia)
+
+    # Zostavenie siete
+
+    def add_node(self, name: str, pressure: Optional[float] = None) -> int:
+        """Pridanie uzla, voliteľne so zadaným tlakom [Pa]"""
+        if name in self.node_index:
+            raise ValueError(f"Uzol {name} už existuje")
+        index = self.node_index[name] = len(self.node_names)
+        self.node_names.append(name)
+        if pressure is not None:
+            self.fixed_pressure[index] = float(pressure)
+        return index
+
+    def set_pressure(self, node: str, pressure: float):
+        """Zadanie tlaku v uzle [Pa]"""
+        self.fixed_pressure[self.node_index[node]] = float(pressure)
+
+    def _add_link(self, name: str, kind: int, start: str, end: str, length: float = 0.0,
+                  diameter: float = 0.0, roughness: float = 0.0, zeta: float = 0.0,
+                  kv: float = np.inf, pump_pressure: float = 0.0, pump_max_flow: float = 1.0,
+                  zone: Optional[str] = None, design_flow: float = 0.0,
+                  catalogue: Optional[ValveCatalogue] = None, preset: float = np.nan) -> int:
+        if name in self.link_index:
+            raise ValueError(f"Úsek {name} už existuje")
+        index = self.link_index[name] = len(self.link_names)
+        self.link_names.append(name)
+        self.link_kind.append(kind)
+        self.link_start.append(self.node_index[start])
+        self.link_end.append(self.node_index[end])
+        self.length.append(length)
+        self.diameter.append(diameter)
+        self.roughness.append(roughness)
+        self.zeta.append(zeta)
+        self.kv.append(kv)
+        self.pump_pressure.append(pump_pressure)
+        self.pump_max_flow.append(pump_max_flow)
+        self.zone.append(zone)
+        self.design_flow.append(design_flow)
+        self.catalogue.append(catalogue)
+        self.preset.append(preset)
+        return index
+
+    def add_pipe(self, name: str, start: str, end: str, length: float, diameter: float,
+                 roughness: float = 0.0, zeta: float = 0.0) -> int:
+        """Potrubie s dĺžkou [m], vnútorným priemerom [m] a miestnymi stratami ζ [-]"""
+        if diameter <= 0:
+            raise ValueError("Priemer potrubia musí byť kladný")
+        return self._add_link(name, PIPE, start, end, length=length, diameter=diameter,
+                              roughness=roughness, zeta=zeta)
+
+    def add_terminal(self, name: str, start: str, end: str, kv: Optional[float] = None,
+                     zone: Optional[str] = None, design_flow: float = 0.0,
+                     catalogue: Optional[ValveCatalogue] = None, preset: Optional[float] = None) -> int:
+        """
+        Vykurovacie teleso s ventilom, voliteľne s priradenou zónou
+
+        Kv [m³/h] sa zadá priamo, alebo ako nastavenie prednastaviteľného
+        ventilu z katalógu (bez nastavenia = plne otvorený).
+        """
+        kv, preset = self._valve_kv(kv, catalogue, preset)
+        return self._add_link(name, TERMINAL, start, end, kv=kv, zone=zone, design_flow=design_flow,
+                              catalogue=catalogue, preset=preset)
+
+    def add_valve(self, name: str, start: str, end: str, kv: Optional[float] = None,
+                  catalogue: Optional[ValveCatalogue] = None, preset: Optional[float] = None) -> int:
+        """Vyvažovací ventil s prietokovým súčiniteľom Kv [m³/h] alebo nastavením z katalógu"""
+        kv, preset = self._valve_kv(kv, catalogue, preset)
+        return self._add_link(name, VALVE, start, end, kv=kv, catalogue=catalogue, preset=preset)
+
+    @staticmethod
+    def _valve_kv(kv: Optional[float], catalogue: Optional[ValveCatalogue], preset: Optional[float]):
+        if catalogue is not None:
+            preset = catalogue.presets[-1] if preset is None else preset
+            kv = float(catalogue.kv(preset))
+        elif kv is None:
+            raise ValueError("Je potrebné zadať Kv alebo katalóg ventilu")
+        if kv <= 0:
+            raise ValueError("Kv musí byť kladné")
+        return kv, np.nan if preset is None else float(preset)
+
+    def set_presets(self, links: Sequence[int], presets: Sequence[float]):
+        """Nastavenie prednastaviteľných ventilov (Kv podľa katalógu)"""
+        for link, preset in zip(links, presets):
+            catalogue = self.catalogue[link]
+            if catalogue is None:
+                raise ValueError(f"Úsek {self.link_names[link]} nemá prednastaviteľný ventil")
+            self.preset[link] = float(preset)
+            self.kv[link] = float(catalogue.kv(preset))
+
+    def add_pump(self, name: str, start: str, end: str, max_pressure: float, max_flow: float) -> int:
+        """
+        Čerpadlo s parabolickou charakteristikou Δp = Δp0 (1 - (m / m_max)²)
+
+        Args:
+            max_pressure: dopravný tlak pri nulovom prietoku Δp0 [Pa]
+            max_flow: prietok pri nulovom dopravnom tlaku m_max [kg/s]
+        """
+        return self._add_link(name, PUMP, start, end, pump_pressure=max_pressure,
+                              pump_max_flow=max_flow)
+
+    @property
+    def density(self) -> float:
+        """Hustota vody pri teplote siete [kg/m³]"""
+        return water_properties.density(self.water_temperature)
+
+    @property
+    def viscosity(self) -> float:
+        """Dynamická viskozita vody pri teplote siete [Pa.s]"""
+        return water_properties.viscosity(self.water_temperature)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.node_names)
+
+    @property
+    def n_links(self) -> int:
+        return len(self.link_names)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Parametre úsekov ako polia"""
+        return {
+            'kind': np.array(self.link_kind, dtype=np.int8),
+            'start': np.array(self.link_start, dtype=np.int64),
+            'end': np.array(self.link_end, dtype=np.int64),
+            'length': np.array(self.length, dtype=np.float64),
+            'diameter': np.array(self.diameter, dtype=np.float64),
+            'roughness': np.array(self.roughness, dtype=np.float64),
+            'zeta': np.array(self.zeta, dtype=np.float64),
+            'kv': np.array(self.kv, dtype=np.float64),
+            'pump_pressure': np.array(self.pump_pressure, dtype=np.float64),
+            'pump_max_flow': np.array(self.pump_max_flow, dtype=np.float64),
+        }
+
+    def incidence_matrix(self) -> sp.csr_matrix:
+        """Matica incidencie [úsek × uzol]: +1 v začiatočnom, -1 v koncovom uzle"""
+        rows = np.repeat(np.arange(self.n_links), 2)
+        cols = np.column_stack([self.link_start, self.link_end]).ravel()
+        data = np.tile([1.0, -1.0], self.n_links)
+        return sp.csr_matrix((data, (rows, cols)), shape=(self.n_links, self.n_nodes))
+
+    def terminals(self) -> np.ndarray:
+        """Indexy vykurovacích telies"""
+        return np.flatnonzero(np.array(self.link_kind) == TERMINAL)
+
+    # Hydraulický výpočet
+
+    def link_pressure_loss(self, flow: np.ndarray, links: Dict[str, np.ndarray]):
+        """
+        Tlakové straty úsekov a ich derivácie podľa prietoku
+
+        Returns:
+            (Δp [Pa], dΔp/dm [Pa.s/kg]); čerpadlo má zápornú stratu (dodáva tlak)
+        """
+        kind = links['kind']
+        loss = np.zeros_like(flow)
+        derivative = np.zeros_like(flow)
+        magnitude = np.abs(flow)
+
+        pipes = kind == PIPE
+        if pipes.any():
+            d = links['diameter'][pipes]
+            area = np.pi * (d / 2) ** 2
+            velocity = magnitude[pipes] / (self.density * area)
+            reynolds = self.density * velocity * d / self.viscosity
+            friction, log_slope = friction_factor(reynolds, links['roughness'][pipes] / d,
+                                                  self.friction_method)
+            dynamic = self.density * velocity ** 2 / 2
+            friction_loss = friction * links['length'][pipes] / d * dynamic
+            local_loss = links['zeta'][pipes] * dynamic
+            loss[pipes] = np.sign(flow[pipes]) * (friction_loss + local_loss)
+            # Δp ~ f(Re) m²: d ln Δp / d ln m = 2 + d ln f / d ln Re
+            with np.errstate(divide='ignore', invalid='ignore'):
+                slope = ((2 + log_slope) * friction_loss + 2 * local_loss) / magnitude[pipes]
+            # Pri nulovom prietoku sa použije laminárna smernica
+            laminar_slope = (128 * self.viscosity * links['length'][pipes]
+                             / (self.density * area * d ** 2))
+            derivative[pipes] = np.where(magnitude[pipes] > 0, slope, laminar_slope)
+
+        resistances = (kind == TERMINAL) | (kind == VALVE)
+        if resistances.any():
+            kv = links['kv'][resistances]
+            loss[resistances] = kv_pressure_loss(flow[resistances], kv, self.density)
+            derivative[resistances] = (2 * 1e5 * np.maximum(magnitude[resistances], MIN_SLOPE_FLOW)
+                                       * (3600 / self.density) ** 2 / kv ** 2)
+
+        pumps = kind == PUMP
+        if pumps.any():
+            p0 = links['pump_pressure'][pumps]
+            m_max = links['pump_max_flow'][pumps]
+            loss[pumps] = -p0 + p0 * flow[pumps] * magnitude[pumps] / m_max ** 2
+            derivative[pumps] = 2 * p0 * np.maximum(magnitude[pumps], MIN_SLOPE_FLOW) / m_max ** 2
+
+        return loss, derivative
+
+    def solve(self,
+              initial_flow: Optional[np.ndarray] = None,
+              node_demand: Optional[np.ndarray] = None,
+              active: Optional[np.ndarray] = None,
+              tolerance: float = 1e-7,
+              max_iterations: int = 100) -> NetworkSolution:
+        """
+        Súčasný výpočet prietokov a tlakov (globálna gradientová metóda)
+
+        Newtonova metóda nad sústavou rovníc zachovania energie v úsekoch
+        a kontinuity v uzloch. V každom kroku sa rieši riedka symetrická
+        sústava pre tlaky v uzloch bez zadaného tlaku, prietoky sa potom
+        dopočítajú po úsekoch.
+
+        Args:
+            initial_flow: počiatočný odhad prietokov [kg/s]
+            node_demand: odber z uzlov [kg/s] (kladný = voda zo siete odteká)
+            active: maska úsekov zahrnutých do výpočtu (ostatné majú nulový prietok)
+            tolerance: požadovaná presnosť prietokov [kg/s]
+            max_iterations: najväčší počet iterácií
+
+        Returns:
+            prietoky v úsekoch, tlaky v uzloch a údaje o konvergencii
+        """
+        if not self.fixed_pressure:
+            raise ValueError("Aspoň v jednom uzle musí byť zadaný tlak")
+
+        active = np.ones(self.n_links, dtype=bool) if active is None else np.asarray(active, dtype=bool)
+        links = {key: values[active] for key, values in self.arrays().items()}
+        incidence = self.incidence_matrix()[active]
+        fixed = np.array(sorted(self.fixed_pressure), dtype=np.int64)
+        free = np.setdiff1d(np.arange(self.n_nodes), fixed)
+        a_free = incidence[:, free].tocsc()
+        a_free_t = a_free.T.tocsr()
+        fixed_term = incidence[:, fixed] @ np.array([self.fixed_pressure[i] for i in fixed])
+        demand = np.zeros(len(free)) if node_demand is None else np.asarray(node_demand)[free]
+
+        flow = np.full(len(links['kind']), 0.01) if initial_flow is None \
+            else np.array(initial_flow, dtype=np.float64)[active]
+        pressure = np.zeros(self.n_nodes)
+        pressure[fixed] = [self.fixed_pressure[i] for i in fixed]
+
+        converged, iterations, step = False, 0, np.inf
+        for iterations in range(1, max_iterations + 1):
+            loss, slope = self.link_pressure_loss(flow, links)
+            inverse = 1.0 / slope
+
+            # (A^T D^-1 A) p = b - A^T m - A^T D^-1 (A_f p_f - Δp(m))
+            energy = fixed_term - loss
+            matrix = (a_free_t @ sp.diags(inverse) @ a_free).tocsc()
+            rhs = -demand - a_free_t @ flow - a_free_t @ (inverse * energy)
+            if len(free):
+                pressure[free] = spsolve(matrix, rhs)
+
+            correction = inverse * (incidence @ pressure - loss)
+            flow = flow + correction
+            step = np.max(np.abs(correction)) if len(correction) else 0.0
+            if step < tolerance:
+                converged = True
+                break
+
+        loss, _ = self.link_pressure_loss(flow, links)
+        imbalance = a_free_t @ flow + demand
+        all_flow = np.zeros(self.n_links)
+        all_flow[active] = flow
+        all_loss = np.zeros(self.n_links)
+        all_loss[active] = loss
+        return NetworkSolution(
+            flow=all_flow,
+            pressure=pressure,
+            pressure_drop=all_loss,
+            iterations=iterations,
+            converged=converged,
+            residual=float(np.max(np.abs(imbalance))) if len(imbalance) else 0.0,
+            link_index=self.link_index,
+            node_index=self.node_index,
+        )
+
+    # Typové siete
+
+    @classmethod
+    def two_pipe_system(cls,
+                        terminal_kv: Optional[np.ndarray],
+                        pump_pressure: float,
+                        floor_height: float = 3.0,
+                        riser_spacing: float = 8.0,
+                        connection_length: float = 2.0,
+                        main_diameter: float = 0.050,
+                        riser_diameter: float = 0.025,
+                        connection_diameter: float = 0.015,
+                        zones: Optional[Sequence[Sequence[str]]] = None,
+                        design_flows: Optional[np.ndarray] = None,
+                        catalogue: Optional[ValveCatalogue] = None,
+                        water_temperature: float = DEFAULT_WATER_TEMPERATURE) -> 'PipeNetwork':
+        """
+        Dvojrúrková sústava so stúpačkami (typický bytový dom)
+
+        Zdroj tepla je na začiatku ležatého rozvodu, z ktorého odbočujú
+        stúpačky; na každom podlaží je na stúpačku pripojené jedno teleso.
+        Čerpadlo udržiava konštantný diferenčný tlak medzi prívodom a spiatočkou.
+
+        Args:
+            terminal_kv: Kv telies [stúpačka × podlažie] [m³/h]
+                (pri zadanom katalógu môže chýbať, ventily sú potom plne otvorené)
+            pump_pressure: diferenčný tlak čerpadla [Pa]
+            zones: názvy zón telies [stúpačka × podlažie]
+            design_flows: návrhové prietoky telies [stúpačka × podlažie] [kg/s]
+            catalogue: prednastaviteľný ventil telies
+            water_temperature: stredná teplota vody [°C]
+        """
+        if terminal_kv is None:
+            if catalogue is None or design_flows is None:
+                raise ValueError("Bez Kv telies je potrebné zadať katalóg ventilu a návrhové prietoky")
+            terminal_kv = np.full(np.shape(design_flows), catalogue.kv_max)
+        terminal_kv = np.atleast_2d(np.asarray(terminal_kv, dtype=np.float64))
+        n_risers, n_floors = terminal_kv.shape
+        presets = None if catalogue is None else catalogue.preset(terminal_kv)
+        network = cls(water_temperature)
+        network.add_node('zdroj_spiatočka', pressure=0.0)
+        network.add_node('zdroj_prívod', pressure=pump_pressure)
+
+        previous_supply, previous_return = 'zdroj_prívod', 'zdroj_spiatočka'
+        for r in range(n_risers):
+            # Ležatý rozvod k päte stúpačky
+            supply, ret = f"P{r}.0", f"S{r}.0"
+            network.add_node(supply)
+            network.add_node(ret)
+            network.add_pipe(f"ležatý_P{r}", previous_supply, supply, riser_spacing, main_diameter)
+            network.add_pipe(f"ležatý_S{r}", ret, previous_return, riser_spacing, main_diameter)
+            previous_supply, previous_return = supply, ret
+
+            for f in range(n_floors):
+                if f > 0:
+                    supply, ret = f"P{r}.{f}", f"S{r}.{f}"
+                    network.add_node(supply)
+                    network.add_node(ret)
+                    network.add_pipe(f"stúpačka_P{r}.{f}", f"P{r}.{f - 1}", supply,
+                                     floor_height, riser_diameter)
+                    network.add_pipe(f"stúpačka_S{r}.{f}", ret, f"S{r}.{f - 1}",
+                                     floor_height, riser_diameter)
+
+                inlet, outlet = f"T{r}.{f}_vstup", f"T{r}.{f}_výstup"
+                network.add_node(inlet)
+                network.add_node(outlet)
+                network.add_pipe(f"prípojka_P{r}.{f}", supply, inlet, connection_length,
+                                 connection_diameter, zeta=4.0)
+                network.add_terminal(f"teleso_{r}.{f}", inlet, outlet,
+                                     kv=None if catalogue is not None else terminal_kv[r, f],
+                                     zone=None if zones is None else zones[r][f],
+                                     design_flow=0.0 if design_flows is None else float(design_flows[r, f]),
+                                     catalogue=catalogue,
+                                     preset=None if presets is None else float(presets[r, f]))
+                network.add_pipe(f"prípojka_S{r}.{f}", outlet, ret, connection_length,
+                                 connection_diameter, zeta=4.0)
+        return network
@@ -0,0 +1,172 @@
+"""
+Prírastkový prepočet potreby tepla pri úpravách modelu budovy
+Zmena okna, vrstvy alebo materiálu prepočíta len dotknutú zónu a súhrnné výsledky
+"""
+
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from .models import Building, ClimateData, Zone
+from .calculations import HeatingCalculations, EnergyCalculations
+
+
+def _same_items(items: list, previous: tuple) -> bool:
+    """Zoznam obsahuje tie isté objekty v rovnakom poradí"""
+    return len(items) == len(previous) and all(a is b for a, b in zip(items, previous))
+
+
+class IncrementalHeatingModel:
+    """
+    Potreba tepla budovy s prírastkovým prepočtom
+
+    Model sa registruje ako pozorovateľ zón, konštrukcií (tie preposielajú
+    zmeny vrstiev a materiálov) a okien. Zmena označí vlastniacu zónu ako
+    neaktuálnu; pri čítaní výsledkov sa prepočítajú len čiastkové súčty
+    neaktuálnych zón (HT, plocha obalu, solárne zisky) a z nich súhrnné
+    hodnoty budovy. Zmeny zoznamov na mieste (append okna, nahradenie okna
+    alebo konštrukcie, pridanie zóny) sa zistia porovnaním identity prvkov
+    pri čítaní výsledkov.
+    """
+
+    def __init__(self,
+                 building: Building,
+                 climate_data: Optional[ClimateData] = None,
+                 air_change_rate: float = 0.5,
+                 thermal_bridges_delta_u: float = 0.1):
+        """
+        Args:
+            building: sledovaná budova
+            climate_data: klimatické údaje (predvolene building.climate_data)
+            air_change_rate: intenzita výmeny vzduchu [1/h]
+            thermal_bridges_delta_u: prirážka na tepelné mosty ΔU [W/(m².K)]
+        """
+        self.building = building
+        self._climate_data = climate_data
+        self.air_change_rate = air_change_rate
+        self.thermal_bridges_delta_u = thermal_bridges_delta_u
+        self.zone_updates = 0  # počet prepočtov čiastkových súčtov zón
+        self._zones: List[Zone] = []
+        self._rebuild()
+
+    @property
+    def climate_data(self) -> ClimateData:
+        return self._climate_data if self._climate_data is not None else self.building.climate_data
+
+    @climate_data.setter
+    def climate_data(self, climate_data: Optional[ClimateData]):
+        self._climate_data = climate_data
+        self.invalidate()
+
+    @property
+    def dirty_zones(self) -> Set[int]:
+        """Indexy zón čakajúcich na prepočet"""
+        return set(self._dirty)
+
+    def invalidate(self):
+        """Označenie všetkých zón na prepočet (napr. po úprave klimatických údajov na mieste)"""
+        self._dirty.update(range(len(self._zones)))
+
+    # Sledovanie zmien
+
+    def _rebuild(self):
+        """Nové čiastkové súčty a registrácia pre aktuálnu štruktúru budovy"""
+        for index, zone in enumerate(self._zones):
+            self._unobserve(index, zone)
+        self._zones = list(self.building.zones)
+        n = len(self._zones)
+        self._owner: Dict[int, int] = {}  # id(sledovaný objekt) -> index zóny
+        self._members: List[tuple] = [((), ())] * n  # (konštrukcie, okná) pri poslednom prepočte
+        self._transmission = np.zeros(n)  # Σ bx U A konštrukcií a okien [W/K]
+        self._envelope = np.zeros(n)  # plocha obalu [m²]
+        self._solar = np.zeros(n)  # solárne zisky [kWh]
+        self._dirty: Set[int] = set(range(n))
+
+    def _unobserve(self, index: int, zone: Zone):
+        zone.remove_observer(self)
+        constructions, windows = self._members[index]
+        for item in constructions + windows:
+            item.remove_observer(self)
+
+    def _observe(self, index: int, zone: Zone):
+        members = (tuple(zone.constructions), tuple(zone.windows))
+        current = {id(item) for item in members[0] + members[1]}
+        for item in self._members[index][0] + self._members[index][1]:
+            if id(item) not in current:
+                item.remove_observer(self)
+                self._owner.pop(id(item), None)
+        for item in (zone,) + members[0] + members[1]:
+            item.add_observer(self)
+            self._owner[id(item)] = index
+        self._members[index] = members
+
+    def model_changed(self, source, field_name: str):
+        index = self._owner.get(id(source))
+        if index is not None:
+            self._dirty.add(index)
+
+    def _check_structure(self):
+        """Zistenie pridaných alebo odobraných zón, konštrukcií a okien"""
+        zones = self.building.zones
+        if len(zones) != len(self._zones) or any(a is not b for a, b in zip(zones, self._zones)):
+            self._rebuild()
+            return
+        for index, zone in enumerate(zones):
+            constructions, windows = self._members[index]
+            if not (_same_items(zone.constructions, constructions) and _same_items(zone.windows, windows)):
+                self._dirty.add(index)
+
+    # Prepočet
+
+    def _update_zone(self, index: int):
+        zone = self._zones[index]
+        self._observe(index, zone)
+        # Jednozónová budova: čiastkové súčty tými istými výpočtami ako pre celú budovu
+        single = Building(self.building.name, self.building.category, zones=[zone],
+                          climate_data=self.climate_data)
+        self._transmission[index] = HeatingCalculations.calculate_transmission_heat_loss_coefficient(
+            single, thermal_bridges_delta_u=0.0
+        )
+        self._envelope[index] = single.envelope_area()
+        self._solar[index] = HeatingCalculations.calculate_solar_heat_gains(single, self.climate_data)
+        self.zone_updates += 1
+
+    def results(self) -> Dict[str, float]:
+        """
+        Aktuálne výsledky (kľúče ako HeatingCalculations.calculate_heating_demand
+        doplnené o merné tepelné straty a straty sústavy)
+        """
+        self._check_structure()
+        for index in sorted(self._dirty):
+            self._update_zone(index)
+        self._dirty.clear()
+
+        building, climate = self.building, self.climate_data
+        envelope = float(self._envelope.sum())
+        ht = float(self._transmission.sum()) + self.thermal_bridges_delta_u * envelope
+        hv = HeatingCalculations.calculate_ventilation_heat_loss_coefficient(building, self.air_change_rate)
+
+        # Rovnica (2.2) ako v HeatingCalculations.calculate_total_heat_loss
+        qht = (ht + hv) * (20.0 - climate.external_temperature) * climate.heating_days * 0.024
+        qint = HeatingCalculations.calculate_internal_heat_gains(building, climate)
+        qsol = float(self._solar.sum())
+        qgn = qint + qsol
+        eta_gn = HeatingCalculations.calculate_utilization_factor(building)
+        qh = max(0, qht - eta_gn * qgn)
+        floor_area = building.total_floor_area()
+
+        return {
+            'transmission_heat_loss_coefficient': ht,
+            'ventilation_heat_loss_coefficient': hv,
+            'envelope_area': envelope,
+            'total_heat_loss': qht,
+            'internal_gains': qint,
+            'solar_gains': qsol,
+            'total_gains': qgn,
+            'utilization_factor': eta_gn,
+            'heating_demand': qh,
+            'specific_heating_demand': qh / floor_area if floor_area > 0 else 0,
+            'air_change_rate': self.air_change_rate,
+            'emission_losses': EnergyCalculations.calculate_emission_losses(building, qh),
+            'distribution_losses': EnergyCalculations.calculate_distribution_losses(building),
+        }
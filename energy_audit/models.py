@@ -3,10 +3,14 @@ Dátové modely pre energetický audit budov
 Implementované podľa STN noriem z skrípt Krajčík, Petráš, Skalíková
 """
 
+from contextlib import contextmanager
+import dataclasses
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
+from typing import ClassVar, FrozenSet, List, Dict, Optional, Tuple
 from enum import Enum
+import gc
 import json
+import weakref
 
 
 class BuildingCategory(Enum):
@@ -37,14 +41,116 @@ class HeatingSystemType(Enum):
     CEILING_HEATING = "stropný"
 
 
+class ObservableModel:
+    """
+    Základ pre modely, ktoré oznamujú zmeny sledovaných atribútov
+
+    Pozorovateľ je ľubovoľný objekt s metódou model_changed(source, field_name).
+    Pozorovatelia sú držaní slabými referenciami a neprenášajú sa pri kopírovaní
+    ani pri serializácii (pickle). Oznamujú sa len priradenia po vytvorení
+    objektu; __init__ (dekorátor observable) zapisuje atribúty priamo.
+    """
+    _tracked_fields: ClassVar[FrozenSet[str]] = frozenset()
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in self._tracked_fields:
+            self._notify_change(name)
+
+    def add_observer(self, observer):
+        """Registrácia pozorovateľa zmien"""
+        observers = self.__dict__.get('_observers')
+        if observers is None:
+            observers = self.__dict__['_observers'] = {}
+        key = id(observer)
+
+        def discard(ref, key=key, observers=observers):
+            if observers.get(key) is ref:
+                del observers[key]
+
+        observers[key] = weakref.ref(observer, discard)
+
+    def remove_observer(self, observer):
+        """Zrušenie registrácie pozorovateľa"""
+        observers = self.__dict__.get('_observers')
+        if observers:
+            observers.pop(id(observer), None)
+
+    def _notify_change(self, name: str):
+        observers = self.__dict__.get('_observers')
+        if not observers:
+            return
+        for key, ref in list(observers.items()):
+            observer = ref()
+            if observer is None:
+                del observers[key]
+            else:
+                observer.model_changed(self, name)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_observers', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+
+def observable(cls):
+    """
+    Dekorátor dataclass modelov odvodených od ObservableModel
+
+    Nahradí vygenerovaný __init__ verziou, ktorá zapisuje polia priamo do
+    __dict__, takže vytvorenie objektu neprechádza cez __setattr__ ani
+    neoznamuje zmeny (pri tisícoch vrstiev a okien je to väčšina času).
+    """
+    namespace = {'MISSING': dataclasses.MISSING}
+    parameters, body = ['self'], ['d = self.__dict__']
+    for item in dataclasses.fields(cls):
+        name = item.name
+        if item.default is not dataclasses.MISSING:
+            namespace[f'_default_{name}'] = item.default
+            value = f'_default_{name}'
+        elif item.default_factory is not dataclasses.MISSING:
+            namespace[f'_factory_{name}'] = item.default_factory
+            value = f'_factory_{name}()'
+        else:
+            value = None
+        if not item.init:
+            body.append(f'd[{name!r}] = {value}')
+        elif value is None:
+            parameters.append(name)
+            body.append(f'd[{name!r}] = {name}')
+        elif item.default_factory is not dataclasses.MISSING:
+            parameters.append(f'{name}=MISSING')
+            body.append(f'd[{name!r}] = {value} if {name} is MISSING else {name}')
+        else:
+            parameters.append(f'{name}={value}')
+            body.append(f'd[{name!r}] = {name}')
+    if hasattr(cls, '__post_init__'):
+        body.append('self.__post_init__()')
+    source = f"def __init__({', '.join(parameters)}):\n" + ''.join(f'    {line}\n' for line in body)
+    exec(source, namespace)
+    init = namespace['__init__']
+    init.__qualname__ = f'{cls.__qualname__}.__init__'
+    init.__doc__ = cls.__init__.__doc__
+    cls.__init__ = init
+    return cls
+
+
+@observable
 @dataclass
-class Material:
+class Material(ObservableModel):
     """Stavebný materiál s tepelno-technickými vlastnosťami"""
     name: str
     thermal_conductivity: float  # λ [W/(m.K)]
     density: float = 0.0  # ρ [kg/m³]
     specific_heat: float = 0.0  # c [J/(kg.K)]
     category: str = ""
+
+    _tracked_fields: ClassVar[FrozenSet[str]] = frozenset(
+        {'thermal_conductivity', 'density', 'specific_heat'}
+    )
     
     def thermal_resistance(self, thickness: float) -> float:
         """Tepelný odpor vrstvy R = d/λ [(m².K)/W]"""
@@ -53,20 +159,81 @@ class Material:
         return thickness / self.thermal_conductivity
 
 
+@observable
 @dataclass 
-class Layer:
+class Layer(ObservableModel):
     """Vrstva v konštrukcii"""
     material: Material
     thickness: float  # hrúbka [m]
+
+    _tracked_fields: ClassVar[FrozenSet[str]] = frozenset({'material', 'thickness'})
     
     def thermal_resistance(self) -> float:
         """Tepelný odpor vrstvy"""
         return self.material.thermal_resistance(self.thickness)
 
 
+class LayerList(list):
+    """
+    Zoznam vrstiev konštrukcie, ktorý oznamuje úpravy na mieste
+
+    Každá zmena zoznamu (append, pop, nahradenie prvku, ...) zneplatní
+    uložený tepelný odpor vlastniacej konštrukcie. Pri kopírovaní a
+    serializácii sa správa ako obyčajný zoznam.
+    """
+
+    __slots__ = ('_owner',)  # slabá referencia na konštrukciu
+
+    @staticmethod
+    def owned_by(owner: 'Construction', layers) -> 'LayerList':
+        result = LayerList(layers)
+        result._owner = weakref.ref(owner)
+        return result
+
+    def _changed(self):
+        owner = getattr(self, '_owner', None)
+        owner = owner() if owner is not None else None
+        if owner is not None:
+            owner._layers_changed()
+
+    def __reduce_ex__(self, protocol):
+        return list, (list(self),)
+
+
+def _notifying_list_method(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._changed()
+        return result
+
+    wrapper.__name__ = name
+    wrapper.__qualname__ = f'LayerList.{name}'
+    return wrapper
+
+
+for _name in ('__setitem__', '__delitem__', '__iadd__', '__imul__', 'append', 'extend',
+              'insert', 'pop', 'remove', 'clear', 'sort', 'reverse'):
+    setattr(LayerList, _name, _notifying_list_method(_name))
+del _name
+
+
+# Štatistika vyrovnávacej pamäte tepelného odporu konštrukcií
+_RESISTANCE_CACHE_STATS = {'hits': 0, 'misses': 0}
+
+
+@observable
 @dataclass
-class Construction:
-    """Stavebná konštrukcia zložená z vrstiev"""
+class Construction(ObservableModel):
+    """
+    Stavebná konštrukcia zložená z vrstiev
+
+    Celkový tepelný odpor sa ukladá do vyrovnávacej pamäte. Zneplatní ho
+    zmena hrúbky alebo materiálu vrstvy, zmena λ materiálu, zmena rsi/rse,
+    priradenie nového zoznamu vrstiev aj úprava zoznamu na mieste (layers
+    je LayerList). Vrstvy a materiály sa sledujú až od prvého výpočtu.
+    """
     name: str
     construction_type: ConstructionType
     layers: List[Layer] = field(default_factory=list)
@@ -76,11 +243,77 @@ class Construction:
     # Prestupy tepla na povrchoch [(m².K)/W]
     rsi: float = 0.13  # vnútorný povrch (horizontálny tok)
     rse: float = 0.04  # vonkajší povrch
+
+    _tracked_fields: ClassVar[FrozenSet[str]] = frozenset(
+        {'name', 'construction_type', 'layers', 'area', 'orientation', 'rsi', 'rse'}
+    )
+    _resistance_fields: ClassVar[FrozenSet[str]] = frozenset({'layers', 'rsi', 'rse'})
+
+    def __post_init__(self):
+        self.__dict__['layers'] = LayerList.owned_by(self, self.layers)
+
+    def __setattr__(self, name, value):
+        if name == 'layers':
+            value = LayerList.owned_by(self, value)
+        if name in self._resistance_fields:
+            self.__dict__.pop('_resistance_cache', None)
+        super().__setattr__(name, value)
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.pop('_resistance_cache', None)
+        state.pop('_observed', None)
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.__dict__['layers'] = LayerList.owned_by(self, self.layers)
+
+    def model_changed(self, source, field_name: str):
+        """Zmena niektorej z vrstiev alebo jej materiálu zneplatní uložený tepelný odpor"""
+        self._layers_changed()
+
+    def _layers_changed(self):
+        self.__dict__.pop('_resistance_cache', None)
+        self._notify_change('layers')
+
+    def _observe_layers(self):
+        """Sledovanie aktuálnych vrstiev a ich materiálov (pri výpočte odporu)"""
+        observed = {}
+        for layer in self.layers:
+            observed[id(layer)] = layer
+            observed[id(layer.material)] = layer.material
+        for key, item in self.__dict__.get('_observed', {}).items():
+            if key not in observed:
+                item.remove_observer(self)
+        for item in observed.values():
+            item.add_observer(self)
+        self.__dict__['_observed'] = observed
+
+    @staticmethod
+    def cache_info() -> Dict[str, int]:
+        """Počet zásahov a výpadkov vyrovnávacej pamäte tepelného odporu"""
+        return dict(_RESISTANCE_CACHE_STATS)
+
+    @staticmethod
+    def reset_cache_info():
+        """Vynulovanie štatistiky vyrovnávacej pamäte"""
+        _RESISTANCE_CACHE_STATS['hits'] = 0
+        _RESISTANCE_CACHE_STATS['misses'] = 0
     
     def total_thermal_resistance(self) -> float:
         """Celkový tepelný odpor R = Rsi + ΣRi + Rse"""
+        r_total = self.__dict__.get('_resistance_cache')
+        if r_total is not None:
+            _RESISTANCE_CACHE_STATS['hits'] += 1
+            return r_total
+
+        _RESISTANCE_CACHE_STATS['misses'] += 1
+        self._observe_layers()
         layer_resistance = sum(layer.thermal_resistance() for layer in self.layers)
-        return self.rsi + layer_resistance + self.rse
+        r_total = self.rsi + layer_resistance + self.rse
+        self.__dict__['_resistance_cache'] = r_total
+        return r_total
     
     def u_value(self) -> float:
         """Súčiniteľ prechodu tepla U = 1/R [W/(m².K)]"""
@@ -91,11 +324,13 @@ class Construction:
     
     def add_layer(self, material: Material, thickness: float):
         """Pridanie vrstvy do konštrukcie"""
-        self.layers.append(Layer(material, thickness))
+        list.append(self.layers, Layer(material, thickness))
+        self._layers_changed()
 
 
+@observable
 @dataclass
-class Window:
+class Window(ObservableModel):
     """Okno alebo dvere"""
     name: str
     area: float  # plocha [m²]
@@ -104,6 +339,10 @@ class Window:
     orientation: str = ""  # orientácia (S, V, J, Z)
     shading_factor: float = 0.8  # tieniaci faktor [-]
 
+    _tracked_fields: ClassVar[FrozenSet[str]] = frozenset(
+        {'area', 'u_value', 'g_value', 'orientation', 'shading_factor'}
+    )
+
 
 @dataclass
 class ThermalBridge:
@@ -113,8 +352,9 @@ class ThermalBridge:
     length: float  # dĺžka [m]
 
 
+@observable
 @dataclass
-class Zone:
+class Zone(ObservableModel):
     """Zóna budovy"""
     name: str
     floor_area: float  # podlahová plocha [m²]
@@ -124,6 +364,11 @@ class Zone:
     windows: List[Window] = field(default_factory=list)
     thermal_bridges: List[ThermalBridge] = field(default_factory=list)
 
+    # Zmeny zoznamov na mieste (append) sa neoznamujú, len priradenie nového zoznamu
+    _tracked_fields: ClassVar[FrozenSet[str]] = frozenset(
+        {'floor_area', 'volume', 'internal_temperature', 'constructions', 'windows', 'thermal_bridges'}
+    )
+
 
 @dataclass
 class HeatingSystem:
@@ -160,6 +405,16 @@ class ClimateData:
         'S': 320, 'V': 200, 'Z': 200, 'J': 320,
         'SV': 130, 'SZ': 130, 'JV': 260, 'JZ': 260
     })  # intenzita slnečného žiarenia [kWh/m²]
+    # Priemerné mesačné teploty január-december [°C]
+    monthly_temperatures: List[float] = field(default_factory=lambda: [
+        -1.4, 0.5, 4.6, 10.3, 15.0, 18.2, 19.9, 19.5, 15.3, 10.0, 4.6, 0.3
+    ])
+    # Mesačné úhrny slnečného žiarenia podľa orientácie [kWh/m²], None = odvodiť zo sezónnych
+    monthly_solar_radiation: Optional[Dict[str, List[float]]] = None
+
+
+# Verzia formátu slovníka budovy (Building.to_dict / from_dict)
+SCHEMA_VERSION = 1
 
 
 @dataclass 
@@ -209,15 +464,223 @@ class Building:
         self.zones.append(zone)
     
     def to_dict(self) -> Dict:
-        """Konverzia do slovníka pre JSON"""
-        # Implementácia pre export/import údajov
-        pass
+        """
+        Konverzia do slovníka pre JSON
+
+        Materiály sa uložia raz do tabuľky 'materials' a vrstvy na ne odkazujú
+        indexom, takže materiál zdieľaný viacerými vrstvami zostane zdieľaný
+        aj po načítaní.
+        """
+        materials: List[Material] = []
+        data = _building_to_dict(self, materials, {})
+        return {
+            'schema_version': SCHEMA_VERSION,
+            'materials': [_material_to_dict(material) for material in materials],
+            **data,
+        }
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Building':
-        """Vytvorenie z slovníka"""
-        # Implementácia pre import údajov
-        pass
+        """Vytvorenie z slovníka (formát to_dict)"""
+        _check_schema_version(data)
+        materials = [Material(**material) for material in data['materials']]
+        return _building_from_dict(data, materials)
+
+
+def _check_schema_version(data: Dict) -> int:
+    """Kontrola verzie formátu uložených údajov"""
+    if not isinstance(data, dict):
+        raise ValueError(f"Údaje musia byť objekt JSON, nie {type(data).__name__}")
+    version = data.get('schema_version')
+    if not isinstance(version, int) or not 1 <= version <= SCHEMA_VERSION:
+        raise ValueError(f"Nepodporovaná verzia formátu údajov: {version}")
+    return version
+
+
+def _material_to_dict(material: Material) -> Dict:
+    return {
+        'name': material.name,
+        'thermal_conductivity': material.thermal_conductivity,
+        'density': material.density,
+        'specific_heat': material.specific_heat,
+        'category': material.category,
+    }
+
+
+def _building_to_dict(building: Building, materials: List[Material], material_index: Dict[int, int]) -> Dict:
+    """
+    Slovník budovy bez tabuľky materiálov
+
+    Args:
+        materials: tabuľka materiálov, nové materiály sa pridajú na koniec
+        material_index: id(materiál) -> index v tabuľke (zdieľaný pre portfólio)
+    """
+    def material_ref(material: Material) -> int:
+        index = material_index.get(id(material))
+        if index is None:
+            index = material_index[id(material)] = len(materials)
+            materials.append(material)
+        return index
+
+    zones = []
+    for zone in building.zones:
+        zones.append({
+            'name': zone.name,
+            'floor_area': zone.floor_area,
+            'volume': zone.volume,
+            'internal_temperature': zone.internal_temperature,
+            'constructions': [
+                {
+                    'name': construction.name,
+                    'construction_type': construction.construction_type.value,
+                    'area': construction.area,
+                    'orientation': construction.orientation,
+                    'rsi': construction.rsi,
+                    'rse': construction.rse,
+                    # vrstvy ako [index materiálu, hrúbka]
+                    'layers': [[material_ref(layer.material), layer.thickness]
+                               for layer in construction.layers],
+                }
+                for construction in zone.constructions
+            ],
+            'windows': [
+                {
+                    'name': window.name,
+                    'area': window.area,
+                    'u_value': window.u_value,
+                    'g_value': window.g_value,
+                    'orientation': window.orientation,
+                    'shading_factor': window.shading_factor,
+                }
+                for window in zone.windows
+            ],
+            'thermal_bridges': [dict(vars(bridge)) for bridge in zone.thermal_bridges],
+        })
+
+    heating_system = None
+    if building.heating_system is not None:
+        heating_system = dict(vars(building.heating_system))
+        heating_system['system_type'] = building.heating_system.system_type.value
+
+    climate = building.climate_data
+    return {
+        'name': building.name,
+        'category': building.category.value,
+        'length': building.length,
+        'width': building.width,
+        'height': building.height,
+        'floors_count': building.floors_count,
+        'zones': zones,
+        'heating_system': heating_system,
+        'hot_water_system': None if building.hot_water_system is None else dict(vars(building.hot_water_system)),
+        'climate_data': {
+            'external_temperature': climate.external_temperature,
+            'heating_days': climate.heating_days,
+            'degree_days': climate.degree_days,
+            'solar_radiation': dict(climate.solar_radiation),
+            'monthly_temperatures': list(climate.monthly_temperatures),
+            'monthly_solar_radiation': None if climate.monthly_solar_radiation is None else {
+                orientation: list(values) for orientation, values in climate.monthly_solar_radiation.items()
+            },
+        },
+    }
+
+
+def _building_from_dict(data: Dict, materials: List[Material]) -> Building:
+    """Budova zo slovníka building_to_dict s už načítanou tabuľkou materiálov"""
+    zones = []
+    for zone in data['zones']:
+        constructions = [
+            Construction(
+                construction['name'],
+                ConstructionType(construction['construction_type']),
+                [Layer(materials[index], thickness) for index, thickness in construction['layers']],
+                construction['area'],
+                construction['orientation'],
+                construction['rsi'],
+                construction['rse'],
+            )
+            for construction in zone['constructions']
+        ]
+        zones.append(Zone(
+            zone['name'], zone['floor_area'], zone['volume'], zone['internal_temperature'],
+            constructions,
+            [Window(**window) for window in zone['windows']],
+            [ThermalBridge(**bridge) for bridge in zone['thermal_bridges']],
+        ))
+
+    heating_system = data['heating_system']
+    if heating_system is not None:
+        heating_system = dict(heating_system)
+        heating_system['system_type'] = HeatingSystemType(heating_system['system_type'])
+        heating_system = HeatingSystem(**heating_system)
+    hot_water_system = data['hot_water_system']
+
+    return Building(
+        name=data['name'],
+        category=BuildingCategory(data['category']),
+        zones=zones,
+        heating_system=heating_system,
+        hot_water_system=None if hot_water_system is None else HotWaterSystem(**hot_water_system),
+        climate_data=ClimateData(**data['climate_data']),
+        length=data['length'],
+        width=data['width'],
+        height=data['height'],
+        floors_count=data['floors_count'],
+    )
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Pozastavenie cyklického zberu odpadu pri hromadnom vytváraní objektov
+
+    Pri státisícoch nových objektov by sa zber spúšťal opakovane nad celou
+    haldou a načítanie by trvalo niekoľkonásobne dlhšie.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def portfolio_to_dict(buildings: List[Building]) -> Dict:
+    """Portfólio budov so spoločnou tabuľkou materiálov"""
+    materials: List[Material] = []
+    material_index: Dict[int, int] = {}
+    data = [_building_to_dict(building, materials, material_index) for building in buildings]
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'materials': [_material_to_dict(material) for material in materials],
+        'buildings': data,
+    }
+
+
+def portfolio_from_dict(data: Dict) -> List[Building]:
+    """Budovy z portfolio_to_dict (materiály zdieľané medzi budovami zostanú zdieľané)"""
+    _check_schema_version(data)
+    with _gc_paused():
+        materials = [Material(**material) for material in data['materials']]
+        return [_building_from_dict(building, materials) for building in data['buildings']]
+
+
+def save_portfolio(buildings: List[Building], path: str):
+    """Uloženie portfólia budov do súboru JSON"""
+    # json.dumps používa rýchly kódovač v C, json.dump do súboru nie
+    text = json.dumps(portfolio_to_dict(buildings), ensure_ascii=False, separators=(',', ':'))
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(text)
+
+
+def load_portfolio(path: str) -> List[Building]:
+    """Načítanie portfólia budov zo súboru JSON"""
+    with open(path, encoding='utf-8') as file:
+        text = file.read()
+    with _gc_paused():
+        return portfolio_from_dict(json.loads(text))
 
 
 # Predpripravené materiály podľa STN 73 0540-3
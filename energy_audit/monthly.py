@@ -0,0 +1,160 @@
+"""
+Mesačná kvázistacionárna bilancia potreby tepla na vykurovanie
+Podľa STN EN ISO 13790 (mesačná metóda), výpočet polí 12 mesiacov × budovy
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from .models import ClimateData
+from .batch import BatchHeatingCalculations, ClimateInput, Portfolio
+from .dynamic import HEAT_CAPACITY_CLASSES
+
+
+MONTH_NAMES = ['január', 'február', 'marec', 'apríl', 'máj', 'jún',
+               'júl', 'august', 'september', 'október', 'november', 'december']
+MONTH_DAYS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.float64)
+
+# Mesiace vykurovacieho obdobia, pre ktoré platia sezónne úhrny v ClimateData.solar_radiation
+HEATING_SEASON_MONTHS = np.array([1, 1, 1, 1, 0, 0, 0, 0, 0, 1, 1, 1], dtype=bool)
+
+# Relatívny ročný priebeh slnečného žiarenia; normovaný tak, aby súčet
+# za vykurovacie obdobie bol 1 (mesačný úhrn = sezónny úhrn × podiel)
+_SOLAR_PROFILE = np.array([0.35, 0.55, 0.85, 1.10, 1.35, 1.40, 1.45, 1.30, 1.00, 0.70, 0.40, 0.30])
+MONTHLY_SOLAR_SHARES = _SOLAR_PROFILE / _SOLAR_PROFILE[HEATING_SEASON_MONTHS].sum()
+
+# Parametre faktora využitia ziskov pre mesačnú metódu (STN EN ISO 13790, 12.2.1.1)
+UTILIZATION_A0 = 1.0  # [-]
+UTILIZATION_TAU0 = 15.0  # [h]
+
+
+def monthly_solar_radiation(climate_data: ClimateData, orientation: str) -> np.ndarray:
+    """Mesačné úhrny slnečného žiarenia pre orientáciu [kWh/m²]"""
+    if climate_data.monthly_solar_radiation is not None:
+        radiation = climate_data.monthly_solar_radiation
+        if orientation not in radiation:
+            orientation = 'J'  # default na juh
+        return np.asarray(radiation[orientation], dtype=np.float64)
+
+    if orientation not in climate_data.solar_radiation:
+        orientation = 'J'
+    return climate_data.solar_radiation[orientation] * MONTHLY_SOLAR_SHARES
+
+
+class MonthlyHeatingCalculations:
+    """
+    Mesačná bilancia potreby tepla pre portfólio budov
+
+    Straty a zisky sa počítajú pre každý mesiac zvlášť a faktor využitia
+    ziskov ηgn závisí od pomeru ziskov a strát γ a od časovej konštanty
+    budovy τ. Všetky veličiny sú polia tvaru [budova × 12 mesiacov].
+    """
+
+    @staticmethod
+    def calculate_utilization_factor(gain_loss_ratio: np.ndarray,
+                                     time_constant: np.ndarray) -> np.ndarray:
+        """
+        Faktor využitia tepelných ziskov ηgn [-]
+
+        Args:
+            gain_loss_ratio: pomer ziskov a strát γ [-]
+            time_constant: časová konštanta budovy τ [h] (rozšíriteľná na tvar γ)
+        """
+        gamma = np.asarray(gain_loss_ratio, dtype=np.float64)
+        a = UTILIZATION_A0 + np.asarray(time_constant, dtype=np.float64) / UTILIZATION_TAU0
+        a = np.broadcast_to(a, gamma.shape)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            eta = (1 - gamma ** a) / (1 - gamma ** (a + 1))
+            eta = np.where(np.isclose(gamma, 1.0), a / (a + 1), eta)
+            eta = np.where(gamma > 0, eta, np.where(gamma < 0, 1 / gamma, 1.0))
+            # Pri veľmi vysokom γ sú straty zanedbateľné voči ziskom
+            eta = np.where(np.isfinite(eta), eta, 1 / gamma)
+        return eta
+
+    @staticmethod
+    def _monthly_climate(climates: List[ClimateData], orientations: List[str]):
+        """Mesačné teploty [budova × 12] a žiarenie [budova × orientácia × 12]"""
+        codes: Dict[int, int] = {}
+        temperatures, radiation, climate_index = [], [], []
+        for climate in climates:
+            code = codes.get(id(climate))
+            if code is None:
+                code = codes[id(climate)] = len(temperatures)
+                temperatures.append(np.asarray(climate.monthly_temperatures, dtype=np.float64))
+                radiation.append(np.array([monthly_solar_radiation(climate, o) for o in orientations])
+                                 .reshape(len(orientations), 12))
+            climate_index.append(code)
+        climate_index = np.asarray(climate_index, dtype=np.int64)
+        return np.array(temperatures)[climate_index], np.array(radiation)[climate_index]
+
+    @staticmethod
+    def calculate_heating_demand(portfolio: Portfolio,
+                                 climate_data: ClimateInput,
+                                 air_change_rate,
+                                 heat_capacity_per_area: float = HEAT_CAPACITY_CLASSES['stredná'],
+                                 internal_temperature: float = 20.0) -> Dict[str, np.ndarray]:
+        """
+        Mesačná potreba tepla na vykurovanie
+
+        Args:
+            portfolio: zoznam budov alebo BuildingStore
+            climate_data: klimatické údaje (spoločné alebo jedny na budovu)
+            air_change_rate: intenzita výmeny vzduchu [1/h] (skalár alebo pole na budovu)
+            heat_capacity_per_area: efektívna tepelná kapacita [J/(m².K)]
+            internal_temperature: návrhová vnútorná teplota [°C]
+
+        Returns:
+            slovník polí [budova × 12] s mesačnými hodnotami [kWh] a ročnými súčtami
+        """
+        store = BatchHeatingCalculations.as_store(portfolio)
+        climates = BatchHeatingCalculations.climates_per_building(climate_data, store.n_buildings)
+
+        ht = BatchHeatingCalculations.calculate_transmission_heat_loss_coefficient(store)
+        hv = BatchHeatingCalculations.calculate_ventilation_heat_loss_coefficient(store, air_change_rate)
+        h_total = ht + hv
+        floor_area = np.bincount(store.zone_building, weights=store.zone_floor_area,
+                                 minlength=store.n_buildings)
+
+        orientations, zone_apertures = BatchHeatingCalculations.calculate_zone_solar_apertures(store)
+        apertures = np.zeros((store.n_buildings, len(orientations)))
+        np.add.at(apertures, store.zone_building, zone_apertures)
+
+        theta_e, radiation = MonthlyHeatingCalculations._monthly_climate(climates, orientations)
+
+        # Straty a zisky [budova × mesiac]
+        qht = h_total[:, None] * (internal_temperature - theta_e) * MONTH_DAYS * 0.024
+        qi = BatchHeatingCalculations.calculate_zone_internal_gains(store)
+        qint = np.bincount(store.zone_building, weights=qi, minlength=store.n_buildings)[:, None] \
+            * 0.024 * MONTH_DAYS
+        qsol = np.einsum('bo,bom->bm', apertures, radiation)
+        qgn = qint + qsol
+
+        # Časová konštanta τ = Cm / H [h]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tau = heat_capacity_per_area * floor_area / 3600.0 / h_total
+            gamma = qgn / qht
+        tau = np.where(h_total > 0, tau, 0.0)
+        a = UTILIZATION_A0 + tau[:, None] / UTILIZATION_TAU0
+        eta = MonthlyHeatingCalculations.calculate_utilization_factor(gamma, tau[:, None])
+        eta = np.where(qht > 0, eta, 0.0)
+
+        qh = np.maximum(0.0, qht - eta * qgn)
+        annual = qh.sum(axis=1)
+
+        return {
+            'total_heat_loss': qht,
+            'internal_gains': qint,
+            'solar_gains': qsol,
+            'total_gains': qgn,
+            'gain_loss_ratio': gamma,
+            'time_constant': tau,
+            'utilization_factor': eta,
+            'heating_demand': qh,
+            'annual_heating_demand': annual,
+            'specific_heating_demand': np.divide(annual, floor_area, out=np.zeros_like(annual),
+                                                 where=floor_area > 0),
+            # Vykurovacie mesiace: γ < γlim = (a + 1) / a (STN EN ISO 13790, 7.4.1.2)
+            'heating_months': gamma < (a + 1) / a,
+        }
@@ -0,0 +1,410 @@
+"""
+Optimalizácia kombinácií opatrení obnovy
+Hľadanie Pareto-optimálnych kombinácií investičných nákladov a ročných úspor
+"""
+
+import copy
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models import Building, ConstructionType, Material, STANDARD_MATERIALS
+from .calculations import HeatingCalculations, EnergyCalculations
+from .batch import DEFAULT_INTERNAL_GAINS, EXTERNAL_CONSTRUCTION_TYPES, INTERNAL_GAINS_BY_CATEGORY
+
+
+@dataclass
+class RetrofitMeasure:
+    """Opatrenie obnovy s investičnými nákladmi a úpravou budovy"""
+    name: str
+    category: str  # obálka, okná, hydraulika, zdroj tepla
+    investment_cost: float  # [€]
+    apply: Callable[[Building], None]  # úprava kópie budovy
+    group: str = ""  # opatrenia tej istej skupiny sa navzájom vylučujú ("" = samostatná skupina)
+
+
+@dataclass
+class ParetoSolution:
+    """Pareto-optimálna kombinácia opatrení"""
+    measures: Tuple[str, ...]
+    investment_cost: float  # [€]
+    annual_savings_kwh: float  # úspora konečnej energie [kWh/rok]
+    annual_savings_eur: float  # [€/rok]
+    final_energy_kwh: float  # konečná energia po obnove [kWh/rok]
+
+    @property
+    def payback_period_years(self) -> float:
+        if self.annual_savings_eur <= 0:
+            return float('inf')
+        return self.investment_cost / self.annual_savings_eur
+
+
+@dataclass
+class OptimizationStatistics:
+    """Štatistika prehľadávania"""
+    evaluations: int = 0  # výpočty cez HeatingCalculations/EnergyCalculations
+    cache_hits: int = 0  # kombinácie zložené z uložených príspevkov opatrení (bez prepočtu)
+    pruned_branches: int = 0  # orezané vetvy (dominované horným odhadom)
+    visited_nodes: int = 0
+
+
+def _construction_area(building: Building, construction_type: ConstructionType) -> float:
+    return sum(construction.area for zone in building.zones for construction in zone.constructions
+               if construction.construction_type == construction_type)
+
+
+def _window_area(building: Building) -> float:
+    return sum(window.area for zone in building.zones for window in zone.windows)
+
+
+# Zložky rozkladu konečnej energie (stĺpce príspevkov objektov)
+_HT, _ENVELOPE_AREA, _SOLAR_GAINS, _VOLUME, _FLOOR_AREA = range(5)
+
+
+def _energy_components(building: Building) -> Tuple[tuple, np.ndarray, Tuple[float, float]]:
+    """
+    Rozklad vstupov final_energy na príspevky jednotlivých objektov budovy
+
+    Returns:
+        (štruktúra budovy a klimatické údaje, príspevky [objekt × zložka], (Δθ, η))
+    """
+    climate = building.climate_data
+    structure = [building.category, climate.external_temperature, climate.heating_days,
+                 tuple(sorted(climate.solar_radiation.items()))]
+    rows = []
+    for zone in building.zones:
+        structure.append((len(zone.constructions), len(zone.windows)))
+        rows.append((0.0, 0.0, 0.0, zone.volume, zone.floor_area))
+        for construction in zone.constructions:
+            bx = 1.0 if construction.construction_type in EXTERNAL_CONSTRUCTION_TYPES else 0.5
+            rows.append((bx * construction.u_value() * construction.area, construction.area, 0.0, 0.0, 0.0))
+        for window in zone.windows:
+            orientation = window.orientation.upper()
+            if orientation not in climate.solar_radiation:
+                orientation = 'J'
+            solar = 0.8 * (window.shading_factor * window.g_value * 0.8 * window.area) \
+                * climate.solar_radiation[orientation]
+            rows.append((window.u_value * window.area, window.area, solar, 0.0, 0.0))
+
+    system = building.heating_system
+    efficiency = system.efficiency if system is not None else 1.0
+    return (tuple(structure), np.array(rows, dtype=np.float64).reshape(-1, 5),
+            (EnergyCalculations.emission_temperature_increase(system), efficiency))
+
+
+def _upper_hull(options: Sequence[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """
+    Úseky (Δnáklady, Δúspory) hornej konvexnej obálky možností skupiny
+    vrátane nulovej voľby, s klesajúcimi úsporami na euro
+    """
+    hull = [(0.0, 0.0)]
+    for cost, savings in sorted(options):
+        if savings <= hull[-1][1]:
+            continue  # lacnejšia možnosť ušetrí aspoň toľko
+        if cost == hull[-1][0] and len(hull) > 1:
+            hull.pop()
+        while len(hull) >= 2:
+            (c1, s1), (c2, s2) = hull[-2], hull[-1]
+            if (c2 - c1) * (savings - s1) - (s2 - s1) * (cost - c1) < 0:
+                break
+            hull.pop()
+        hull.append((cost, savings))
+    return [(c2 - c1, s2 - s1) for (c1, s1), (c2, s2) in zip(hull, hull[1:])]
+
+
+def insulation_measure(building: Building,
+                       construction_type: ConstructionType,
+                       thickness: float,
+                       cost_per_m2: float,
+                       material: Material = STANDARD_MATERIALS['polystyrén_exp'],
+                       name: Optional[str] = None) -> RetrofitMeasure:
+    """Prídavná tepelná izolácia všetkých konštrukcií daného typu"""
+    def apply(target: Building):
+        for zone in target.zones:
+            for construction in zone.constructions:
+                if construction.construction_type == construction_type:
+                    construction.add_layer(material, thickness)
+
+    return RetrofitMeasure(
+        name=name or f"Zateplenie {construction_type.value} {thickness * 100:.0f} cm",
+        category="obálka",
+        investment_cost=_construction_area(building, construction_type) * cost_per_m2,
+        apply=apply,
+        group=f"zateplenie_{construction_type.value}",
+    )
+
+
+def window_replacement_measure(building: Building,
+                               u_value: float,
+                               g_value: float,
+                               cost_per_m2: float,
+                               name: Optional[str] = None) -> RetrofitMeasure:
+    """Výmena všetkých okien"""
+    def apply(target: Building):
+        for zone in target.zones:
+            for window in zone.windows:
+                window.u_value = u_value
+                window.g_value = g_value
+
+    return RetrofitMeasure(
+        name=name or f"Výmena okien U={u_value:.2f}",
+        category="okná",
+        investment_cost=_window_area(building) * cost_per_m2,
+        apply=apply,
+        group="okná",
+    )
+
+
+def hydraulic_balancing_measure(investment_cost: float,
+                                name: str = "Hydraulické vyregulovanie") -> RetrofitMeasure:
+    """Hydraulické vyregulovanie vykurovacej sústavy"""
+    def apply(target: Building):
+        if target.heating_system is not None:
+            target.heating_system.hydraulic_adjustment = True
+
+    return RetrofitMeasure(name, "hydraulika", investment_cost, apply, group="hydraulika")
+
+
+def heating_system_measure(efficiency: float,
+                           investment_cost: float,
+                           name: Optional[str] = None) -> RetrofitMeasure:
+    """Výmena zdroja tepla za zdroj s vyššou účinnosťou"""
+    def apply(target: Building):
+        if target.heating_system is not None:
+            target.heating_system.efficiency = efficiency
+
+    return RetrofitMeasure(name or f"Zdroj tepla η={efficiency:.2f}", "zdroj tepla",
+                           investment_cost, apply, group="zdroj_tepla")
+
+
+@dataclass
+class _Contribution:
+    """Príspevok opatrenia k rozloženej konečnej energii (voči pôvodnej budove)"""
+    mask: int  # bity dotknutých objektov a parametrov sústavy
+    delta: np.ndarray  # zmena súčtov zložiek
+    system: Dict[int, float]  # nové hodnoty (Δθ, η) podľa indexu
+
+
+class RetrofitOptimizer:
+    """
+    Hľadanie Pareto-optimálnych kombinácií opatrení (náklady vs. úspory)
+
+    Prehľadávanie do hĺbky cez skupiny vzájomne sa vylučujúcich opatrení
+    (z každej skupiny najviac jedno). Pôvodná budova a každé opatrenie
+    samostatne sa hodnotia cez HeatingCalculations a EnergyCalculations;
+    z rozdielu sa uloží príspevok opatrenia po objektoch (konštrukcie, okná,
+    zóny, Δθ a účinnosť sústavy). Kombinácia opatrení, ktoré menia rôzne
+    objekty, sa zloží zo súčtov zložiek čiastkovej kombinácie a príspevku
+    ďalšieho opatrenia bez kopírovania a prepočtu budovy. Len kombinácie,
+    v ktorých dve opatrenia menia ten istý objekt alebo opatrenie mení
+    štruktúru budovy či klimatické údaje, sa prepočítajú na kópii budovy.
+
+    Vetva sa oreže, ak ani horný odhad úspor pri danom rozpočte (spojitý
+    batoh nad opatreniami zostávajúcich skupín zoradenými podľa úspor na
+    euro) neprekoná riešenie s nižšími alebo rovnakými nákladmi. Odhad
+    predpokladá, že úspory kombinácie nie sú väčšie ako súčet samostatných
+    úspor, čo pre opatrenia na obálke a zdroji tepla platí.
+    """
+
+    def __init__(self,
+                 building: Building,
+                 measures: Sequence[RetrofitMeasure],
+                 air_change_rate: float = 0.5,
+                 energy_price: float = 0.15):
+        """
+        Args:
+            building: budova v pôvodnom stave
+            measures: kandidátne opatrenia
+            air_change_rate: intenzita výmeny vzduchu [1/h]
+            energy_price: cena energie [€/kWh]
+        """
+        self.building = building
+        self.measures = list(measures)
+        self.air_change_rate = air_change_rate
+        self.energy_price = energy_price
+        self.statistics = OptimizationStatistics()
+
+        names = [measure.name for measure in self.measures]
+        if len(set(names)) != len(names):
+            raise ValueError("Názvy opatrení musia byť jedinečné")
+
+        groups: Dict[str, List[RetrofitMeasure]] = {}
+        for measure in self.measures:
+            groups.setdefault(measure.group or measure.name, []).append(measure)
+        self.groups = list(groups.values())
+
+    def final_energy(self, building: Building) -> float:
+        """Ročná konečná energia na vykurovanie [kWh]"""
+        demand = HeatingCalculations.calculate_heating_demand(
+            building, building.climate_data, self.air_change_rate
+        )['heating_demand']
+        emission = EnergyCalculations.calculate_emission_losses(building, demand)
+        distribution = EnergyCalculations.calculate_distribution_losses(building)
+        efficiency = building.heating_system.efficiency if building.heating_system else 1.0
+        return (demand + emission + distribution) / efficiency
+
+    def _composed_energy(self, totals: np.ndarray, system: Tuple[float, float]) -> float:
+        """Konečná energia zo súčtov zložiek (rovnaké vzťahy ako final_energy) [kWh]"""
+        climate = self.building.climate_data
+        theta_e = climate.external_temperature
+        ht = totals[_HT] + 0.1 * totals[_ENVELOPE_AREA]
+        hv = (0.85 * 1.2 * 1010 * self.air_change_rate * totals[_VOLUME]) / 3600
+        qht = (ht + hv) * (20.0 - theta_e) * climate.heating_days * 0.024
+        qi = INTERNAL_GAINS_BY_CATEGORY.get(self.building.category, DEFAULT_INTERNAL_GAINS)
+        qint = qi * 0.024 * climate.heating_days * totals[_FLOOR_AREA]
+        qh = max(0.0, qht - 0.95 * (qint + totals[_SOLAR_GAINS]))
+        delta_theta, efficiency = system
+        emission = qh * (delta_theta / (20.0 + delta_theta - theta_e))
+        distribution = totals[_VOLUME] * 0.1 * 15.0
+        return (qh + emission + distribution) / efficiency
+
+    def _evaluate(self, building: Building) -> float:
+        self.statistics.evaluations += 1
+        return self.final_energy(building)
+
+    @staticmethod
+    def _apply(building: Building, measure: RetrofitMeasure) -> Building:
+        modified = copy.deepcopy(building)
+        measure.apply(modified)
+        return modified
+
+    def _apply_all(self, names: Tuple[str, ...]) -> Building:
+        """Kópia pôvodnej budovy s opatreniami v poradí prehľadávania"""
+        modified = copy.deepcopy(self.building)
+        by_name = {measure.name: measure for measure in self.measures}
+        for name in names:
+            by_name[name].apply(modified)
+        return modified
+
+    def optimize(self) -> List[ParetoSolution]:
+        """
+        Returns:
+            Pareto-optimálne riešenia zoradené podľa investičných nákladov
+        """
+        baseline = self._evaluate(self.building)
+        base_context, base_rows, base_system = _energy_components(self.building)
+        base_totals = base_rows.sum(axis=0)
+        composed_baseline = self._composed_energy(base_totals, base_system)
+        system_bits = (1 << len(base_rows), 1 << (len(base_rows) + 1))
+
+        # Samostatné úspory opatrení slúžia na zoradenie a horný odhad,
+        # príspevky po objektoch na skladanie kombinácií
+        standalone: Dict[str, float] = {}
+        contributions: Dict[str, Optional[_Contribution]] = {}
+        for measure in self.measures:
+            modified = self._apply(self.building, measure)
+            standalone[measure.name] = max(0.0, baseline - self._evaluate(modified))
+            context, rows, system = _energy_components(modified)
+            if context != base_context:
+                contributions[measure.name] = None
+                continue
+            changed = np.flatnonzero(np.any(rows != base_rows, axis=1))
+            mask = sum(1 << int(index) for index in changed)
+            changes = {}
+            for index, (value, base_value) in enumerate(zip(system, base_system)):
+                if value != base_value:
+                    mask |= system_bits[index]
+                    changes[index] = value
+            contributions[measure.name] = _Contribution(
+                mask, (rows[changed] - base_rows[changed]).sum(axis=0), changes
+            )
+
+        # Skupiny opatrení, ktoré menia štruktúru budovy, idú na koniec,
+        # aby sa kópie budovy prepočítavali len v hlbokých vetvách
+        groups = sorted(
+            self.groups,
+            key=lambda group: (any(contributions[m.name] is None for m in group),
+                               -max(standalone[m.name] / max(m.investment_cost, 1e-9) for m in group))
+        )
+        # Horný odhad úspor zostávajúcich skupín pri rozpočte (spojitý batoh):
+        # úseky hornej obálky skupín zoradené podľa úspor na euro
+        bounds = []
+        for index in range(len(groups) + 1):
+            segments = sorted(
+                (segment for group in groups[index:] for segment in _upper_hull(
+                    [(m.investment_cost, standalone[m.name]) for m in group])),
+                key=lambda segment: -segment[1] / segment[0] if segment[0] > 0 else -float('inf')
+            )
+            costs = np.concatenate([[0.0], np.cumsum([c for c, _ in segments])])
+            savings = np.concatenate([[0.0], np.cumsum([s for _, s in segments])])
+            bounds.append((costs, savings))
+
+        def savings_bound(index: int, budget: float) -> float:
+            costs, savings = bounds[index]
+            if budget >= costs[-1]:
+                return savings[-1]
+            return float(np.interp(budget, costs, savings))
+
+        front: List[Tuple[float, float, Tuple[str, ...]]] = []  # (náklady, úspory, opatrenia)
+        # Zložené a prepočítané úspory tej istej budovy sa líšia len zaokrúhlením
+        tolerance = 1e-9 * abs(baseline)
+
+        def add_to_front(cost: float, savings: float, names: Tuple[str, ...]):
+            if any(c <= cost and s >= savings - tolerance for c, s, _ in front):
+                return
+            front[:] = [point for point in front if not (cost <= point[0] and savings >= point[1] - tolerance)]
+            front.append((cost, savings, names))
+
+        def prunable(index: int, cost: float, savings: float) -> bool:
+            """Každú kombináciu vetvy dominuje riešenie s nižšími alebo rovnakými nákladmi"""
+            points = sorted(point[:2] for point in front)
+            if points[0][0] > cost:
+                return False
+            # Kombinácie s nákladmi od c po nasledujúci bod frontu porovnáva bod (c, s)
+            for position, (c, s) in enumerate(points):
+                next_cost = points[position + 1][0] if position + 1 < len(points) else float('inf')
+                if next_cost > cost and savings + savings_bound(index, next_cost - cost) > s + tolerance:
+                    return False
+            return True
+
+        def search(index: int, chosen: Tuple[str, ...], cost: float, savings: float,
+                   mask: Optional[int], totals: np.ndarray, system: Tuple[float, float],
+                   building: Optional[Building]):
+            self.statistics.visited_nodes += 1
+            add_to_front(cost, savings, chosen)
+            if index == len(groups):
+                return
+            if prunable(index, cost, savings):
+                self.statistics.pruned_branches += 1
+                return
+
+            for measure in groups[index]:
+                names = chosen + (measure.name,)
+                part = contributions[measure.name]
+                if mask is not None and part is not None:
+                    if not mask & part.mask:
+                        # Opatrenie mení iné objekty ako čiastková kombinácia
+                        self.statistics.cache_hits += 1
+                        child_totals = totals + part.delta
+                        child_system = tuple(part.system.get(i, value) for i, value in enumerate(system))
+                    else:
+                        # Spoločné objekty: rozklad kópie budovy so všetkými opatreniami
+                        modified = self._apply(building if building is not None else self._apply_all(chosen),
+                                               measure)
+                        self.statistics.evaluations += 1
+                        _, rows, child_system = _energy_components(modified)
+                        child_totals = rows.sum(axis=0)
+                    child_savings = composed_baseline - self._composed_energy(child_totals, child_system)
+                    search(index + 1, names, cost + measure.investment_cost, child_savings,
+                           mask | part.mask, child_totals, child_system, None)
+                else:
+                    modified = self._apply(building if building is not None else self._apply_all(chosen),
+                                           measure)
+                    search(index + 1, names, cost + measure.investment_cost,
+                           baseline - self._evaluate(modified), None, totals, system, modified)
+            search(index + 1, chosen, cost, savings, mask, totals, system, building)
+
+        search(0, (), 0.0, 0.0, 0, base_totals, base_system, self.building)
+
+        solutions = [
+            ParetoSolution(
+                measures=names,
+                investment_cost=cost,
+                annual_savings_kwh=savings,
+                annual_savings_eur=savings * self.energy_price,
+                final_energy_kwh=baseline - savings,
+            )
+            for cost, savings, names in front
+        ]
+        return sorted(solutions, key=lambda solution: solution.investment_cost)
@@ -0,0 +1,147 @@
+"""
+Výkonové mapy chladiacich zariadení
+Chladiaci výkon a EER v závislosti od vonkajšej teploty a čiastočného zaťaženia, bilineárna interpolácia nad hodinovými poľami
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Sequence
+
+import numpy as np
+
+
+# Menovité podmienky: vonkajšia teplota 35 °C, plné zaťaženie (STN EN 14511)
+RATING_TEMPERATURE = 35.0  # [°C]
+
+OUTDOOR_TEMPERATURES = [20.0, 25.0, 30.0, 35.0, 40.0, 45.0]  # [°C]
+PART_LOAD_RATIOS = [0.1, 0.25, 0.5, 0.75, 1.0]  # [-]
+
+
+def _axis(values: np.ndarray, grid: np.ndarray):
+    """Index intervalu mriežky a váha pravého uzla (hodnoty mimo rozsahu sa obmedzia)"""
+    values = np.clip(values, grid[0], grid[-1])
+    index = np.clip(np.searchsorted(grid, values, side='right') - 1, 0, len(grid) - 2)
+    weight = (values - grid[index]) / (grid[index + 1] - grid[index])
+    return index, weight
+
+
+def bilinear_interpolation(x_grid: Sequence[float], y_grid: Sequence[float], table: np.ndarray,
+                           x, y) -> np.ndarray:
+    """
+    Bilineárna interpolácia tabuľky table[x × y] v bodoch (x, y)
+
+    x a y môžu byť polia ľubovoľného (spoločne vysielateľného) tvaru,
+    napr. hodinové rady [hodina × zóna]; mimo mriežky sa hodnoty neextrapolujú.
+    """
+    x_grid = np.asarray(x_grid, dtype=np.float64)
+    y_grid = np.asarray(y_grid, dtype=np.float64)
+    table = np.asarray(table, dtype=np.float64)
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+    i, wx = _axis(x, x_grid)
+    j, wy = _axis(y, y_grid)
+    return ((1 - wx) * ((1 - wy) * table[i, j] + wy * table[i, j + 1])
+            + wx * ((1 - wy) * table[i + 1, j] + wy * table[i + 1, j + 1]))
+
+
+@dataclass
+class PerformanceMap:
+    """
+    Výkonová mapa zariadenia, pomerné hodnoty voči menovitým podmienkam
+
+    capacity_ratio: dostupný chladiaci výkon / menovitý výkon podľa vonkajšej teploty
+    eer_ratio: EER / menovitý EER, tabuľka [vonkajšia teplota × čiastočné zaťaženie]
+    """
+    outdoor_temperatures: Sequence[float]
+    part_load_ratios: Sequence[float]
+    capacity_ratio: Sequence[float]
+    eer_ratio: np.ndarray
+
+    def __post_init__(self):
+        self.outdoor_temperatures = np.asarray(self.outdoor_temperatures, dtype=np.float64)
+        self.part_load_ratios = np.asarray(self.part_load_ratios, dtype=np.float64)
+        self.capacity_ratio = np.asarray(self.capacity_ratio, dtype=np.float64)
+        self.eer_ratio = np.asarray(self.eer_ratio, dtype=np.float64)
+        if self.eer_ratio.shape != (len(self.outdoor_temperatures), len(self.part_load_ratios)):
+            raise ValueError("Tabuľka EER nezodpovedá mriežke teplôt a čiastočného zaťaženia")
+        if self.capacity_ratio.shape != self.outdoor_temperatures.shape:
+            raise ValueError("Pomerný výkon musí byť zadaný pre každú vonkajšiu teplotu")
+
+    @classmethod
+    def separable(cls, capacity_ratio: Sequence[float], temperature_factor: Sequence[float],
+                  part_load_factor: Sequence[float]) -> 'PerformanceMap':
+        """Mapa so súčinom teplotnej a zaťažovacej závislosti EER na štandardnej mriežke"""
+        return cls(OUTDOOR_TEMPERATURES, PART_LOAD_RATIOS, capacity_ratio,
+                   np.outer(temperature_factor, part_load_factor))
+
+    def capacity(self, rated_capacity, outdoor_temperature) -> np.ndarray:
+        """Dostupný chladiaci výkon pri vonkajšej teplote (v jednotkách menovitého výkonu)"""
+        return np.asarray(rated_capacity) * np.interp(
+            outdoor_temperature, self.outdoor_temperatures, self.capacity_ratio
+        )
+
+    def eer(self, rated_eer, outdoor_temperature, part_load_ratio) -> np.ndarray:
+        """EER pri vonkajšej teplote a čiastočnom zaťažení"""
+        return np.asarray(rated_eer) * bilinear_interpolation(
+            self.outdoor_temperatures, self.part_load_ratios, self.eer_ratio,
+            outdoor_temperature, part_load_ratio
+        )
+
+    def operate(self, rated_capacity, rated_eer, cooling_load, outdoor_temperature) -> Dict[str, np.ndarray]:
+        """
+        Hodinová prevádzka zariadenia
+
+        Args:
+            rated_capacity: menovitý chladiaci výkon [W]
+            rated_eer: menovitý EER [-]
+            cooling_load: požadovaný chladiaci výkon [W] (hodinové pole)
+            outdoor_temperature: vonkajšia teplota [°C] (hodinové pole)
+
+        Returns:
+            slovník polí: dodaný výkon, nepokrytá záťaž, čiastočné zaťaženie, EER a príkon [W]
+        """
+        load = np.maximum(np.asarray(cooling_load, dtype=np.float64), 0.0)
+        capacity = self.capacity(rated_capacity, outdoor_temperature)
+        delivered = np.minimum(load, capacity)
+        part_load = np.divide(delivered, capacity, out=np.zeros_like(delivered), where=capacity > 0)
+        eer = self.eer(rated_eer, outdoor_temperature, part_load)
+        return {
+            'delivered_W': delivered,
+            'unmet_W': load - delivered,
+            'part_load_ratio': part_load,
+            'eer': eer,
+            'electrical_power_W': np.divide(delivered, eer, out=np.zeros_like(delivered), where=eer > 0),
+        }
+
+
+# Typické mapy podľa druhu zariadenia (kľúče zodpovedajú CoolingSystem.type)
+PERFORMANCE_MAPS = {
+    'split': PerformanceMap.separable(
+        [1.10, 1.07, 1.04, 1.00, 0.95, 0.89],
+        [1.45, 1.30, 1.15, 1.00, 0.86, 0.73],
+        [0.70, 0.95, 1.10, 1.08, 1.00],  # invertor s cyklovaním pri nízkom zaťažení
+    ),
+    'VRF': PerformanceMap.separable(
+        [1.10, 1.07, 1.04, 1.00, 0.95, 0.90],
+        [1.50, 1.33, 1.16, 1.00, 0.86, 0.73],
+        [0.85, 1.15, 1.30, 1.18, 1.00],
+    ),
+    'chiller': PerformanceMap.separable(
+        [1.12, 1.08, 1.04, 1.00, 0.95, 0.90],
+        [1.35, 1.24, 1.12, 1.00, 0.88, 0.77],
+        [0.60, 0.85, 1.05, 1.08, 1.00],
+    ),
+    'evaporačný': PerformanceMap.separable(
+        [1.15, 1.08, 1.03, 1.00, 0.95, 0.90],
+        [1.60, 1.35, 1.15, 1.00, 0.85, 0.70],
+        [0.80, 0.95, 1.05, 1.03, 1.00],
+    ),
+    'absorpčný': PerformanceMap.separable(
+        [1.05, 1.03, 1.02, 1.00, 0.96, 0.90],
+        [1.10, 1.06, 1.03, 1.00, 0.95, 0.88],
+        [0.55, 0.80, 0.95, 1.00, 1.00],
+    ),
+}
+
+
+def performance_map(system_type: str) -> PerformanceMap:
+    """Výkonová mapa pre druh zariadenia (neznámy druh = split)"""
+    return PERFORMANCE_MAPS.get(system_type, PERFORMANCE_MAPS['split'])
@@ -0,0 +1,249 @@
+"""
+Dimenzovanie potrubia vykurovacej sústavy
+Výber najmenšej katalógovej DN podľa rýchlosti prúdenia a mernej tlakovej straty
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .calculations import HydraulicCalculations
+from .hydraulics import PipeNetwork, PIPE, DEFAULT_WATER_TEMPERATURE
+from . import water_properties
+
+
+@dataclass
+class PipeCatalogue:
+    """
+    Katalóg rúr jedného materiálu zoradený podľa vnútorného priemeru
+
+    Zoradené pole priemerov je index katalógu: hľadanie vhodnej DN je
+    bisekcia nad poľom, nie prechádzanie všetkých rozmerov.
+    """
+    name: str
+    nominal: Sequence[str]  # označenie rozmeru (DN, vonkajší priemer × hrúbka steny)
+    inner_diameter: np.ndarray  # vnútorný priemer [m] (rastúci)
+    unit_cost: np.ndarray  # cena potrubia vrátane montáže a izolácie [€/m]
+    roughness: float  # absolútna drsnosť steny [m]
+
+    def __post_init__(self):
+        self.nominal = list(self.nominal)
+        self.inner_diameter = np.asarray(self.inner_diameter, dtype=np.float64)
+        self.unit_cost = np.asarray(self.unit_cost, dtype=np.float64)
+        if not (len(self.nominal) == len(self.inner_diameter) == len(self.unit_cost)):
+            raise ValueError("Rozmery katalógu musia mať rovnaký počet položiek")
+        if np.any(np.diff(self.inner_diameter) <= 0):
+            raise ValueError("Vnútorné priemery katalógu musia byť rastúce")
+
+    def __len__(self) -> int:
+        return len(self.inner_diameter)
+
+
+# Katalógy rúr (orientačné ceny vrátane tvaroviek, montáže a izolácie)
+PIPE_CATALOGUE = {
+    # Oceľové závitové rúry stredné (STN EN 10255)
+    'oceľ': PipeCatalogue(
+        'oceľ',
+        ['DN10', 'DN15', 'DN20', 'DN25', 'DN32', 'DN40', 'DN50', 'DN65', 'DN80', 'DN100'],
+        [0.0126, 0.0161, 0.0217, 0.0273, 0.0360, 0.0419, 0.0531, 0.0689, 0.0809, 0.1053],
+        [18.0, 21.0, 25.0, 31.0, 38.0, 44.0, 56.0, 74.0, 90.0, 120.0],
+        roughness=0.045e-3,
+    ),
+    # Medené rúry (STN EN 1057)
+    'meď': PipeCatalogue(
+        'meď',
+        ['15×1', '18×1', '22×1', '28×1.5', '35×1.5', '42×1.5', '54×2', '64×2', '76.1×2'],
+        [0.013, 0.016, 0.020, 0.025, 0.032, 0.039, 0.050, 0.060, 0.0721],
+        [22.0, 26.0, 32.0, 42.0, 55.0, 68.0, 92.0, 115.0, 140.0],
+        roughness=0.0015e-3,
+    ),
+}
+
+
+@dataclass
+class PipeSizingResult:
+    """Výsledok dimenzovania (polia v poradí úsekov)"""
+    pipe_names: List[str]
+    design_flow: np.ndarray  # návrhový prietok [kg/s]
+    length: np.ndarray  # [m]
+    catalogue_index: np.ndarray  # index rozmeru v katalógu
+    nominal: List[str]
+    diameter: np.ndarray  # vnútorný priemer [m]
+    velocity: np.ndarray  # rýchlosť prúdenia [m/s]
+    specific_pressure_drop: np.ndarray  # merná tlaková strata trením [Pa/m]
+    cost: np.ndarray  # cena úsekov [€]
+    undersized: np.ndarray  # limity nesplní ani najväčší rozmer katalógu
+
+    @property
+    def total_cost(self) -> float:
+        """Celková cena potrubia [€]"""
+        return float(self.cost.sum())
+
+    @property
+    def total_length(self) -> float:
+        return float(self.length.sum())
+
+    def length_by_nominal(self) -> Dict[str, float]:
+        """Súčet dĺžok podľa rozmeru (výkaz materiálu) [m]"""
+        lengths: Dict[str, float] = {}
+        for nominal, length in zip(self.nominal, self.length):
+            lengths[nominal] = lengths.get(nominal, 0.0) + float(length)
+        return lengths
+
+    def report(self) -> List[Dict]:
+        """Tabuľka navrhnutých rozmerov pre každý úsek"""
+        return [
+            {
+                'pipe': name,
+                'design_flow_kg_s': float(self.design_flow[i]),
+                'nominal': self.nominal[i],
+                'diameter_m': float(self.diameter[i]),
+                'velocity_m_s': float(self.velocity[i]),
+                'specific_pressure_drop_Pa_m': float(self.specific_pressure_drop[i]),
+                'cost_eur': float(self.cost[i]),
+                'undersized': bool(self.undersized[i]),
+            }
+            for i, name in enumerate(self.pipe_names)
+        ]
+
+
+class PipeSizer:
+    """
+    Dimenzovanie potrubia podľa katalógu
+
+    Pre každý úsek sa hľadá najmenší rozmer, pri ktorom rýchlosť neprekročí
+    max_velocity a merná tlaková strata trením max_pressure_gradient.
+    Limit rýchlosti dáva najmenší priemer priamo, jeho poloha v katalógu sa
+    nájde bisekciou (np.searchsorted). Merná strata s priemerom klesá, preto
+    sa ďalej bisekciou zužuje interval indexov katalógu - všetky úseky naraz,
+    v každom kroku jedným vektorizovaným výpočtom strát.
+    """
+
+    def __init__(self,
+                 catalogue: PipeCatalogue = PIPE_CATALOGUE['oceľ'],
+                 max_velocity: float = 1.0,
+                 max_pressure_gradient: float = 150.0,
+                 water_temperature: float = DEFAULT_WATER_TEMPERATURE,
+                 friction_method: str = "colebrook"):
+        """
+        Args:
+            catalogue: katalóg rúr
+            max_velocity: najväčšia rýchlosť prúdenia [m/s] (hluk, erózia)
+            max_pressure_gradient: najväčšia merná tlaková strata trením [Pa/m]
+            water_temperature: stredná teplota vody [°C]
+            friction_method: výpočet súčiniteľa trenia (blasius, swamee_jain, colebrook)
+        """
+        if max_velocity <= 0 or max_pressure_gradient <= 0:
+            raise ValueError("Limity rýchlosti a mernej tlakovej straty musia byť kladné")
+        self.catalogue = catalogue
+        self.max_velocity = max_velocity
+        self.max_pressure_gradient = max_pressure_gradient
+        self.water_temperature = water_temperature
+        self.friction_method = friction_method
+
+    def _pressure_gradient(self, flow: np.ndarray, index: np.ndarray) -> np.ndarray:
+        """Merná tlaková strata trením pri rozmeroch z katalógu [Pa/m]"""
+        return HydraulicCalculations.calculate_pressure_loss_array(
+            flow, 1.0, self.catalogue.inner_diameter[index],
+            fittings_factor=1.0, water_temperature=self.water_temperature,
+            roughness=self.catalogue.roughness, method=self.friction_method
+        )
+
+    def select(self, design_flow) -> np.ndarray:
+        """
+        Indexy najmenších vyhovujúcich rozmerov katalógu
+
+        Args:
+            design_flow: návrhové prietoky úsekov [kg/s]
+
+        Returns:
+            indexy do katalógu; úseky, pre ktoré nevyhovuje žiadny rozmer,
+            dostanú najväčší rozmer
+        """
+        flow = np.abs(np.asarray(design_flow, dtype=np.float64))
+        diameters = self.catalogue.inner_diameter
+        last = len(diameters) - 1
+
+        # Limit rýchlosti: d ≥ √(4 m / (π ρ v_max))
+        density = water_properties.density(self.water_temperature)
+        min_diameter = np.sqrt(4 * flow / (np.pi * density * self.max_velocity))
+        low = np.minimum(np.searchsorted(diameters, min_diameter, side='left'), last)
+        high = np.full_like(low, last)
+
+        # Bisekcia nad indexmi katalógu, len pre úseky s neuzavretým intervalom
+        active = np.flatnonzero(low < high)
+        while len(active):
+            middle = (low[active] + high[active]) // 2
+            passes = self._pressure_gradient(flow[active], middle) <= self.max_pressure_gradient
+            high[active] = np.where(passes, middle, high[active])
+            low[active] = np.where(passes, low[active], middle + 1)
+            active = active[low[active] < high[active]]
+        return low
+
+    def size(self, design_flow, length=1.0, names: Optional[Sequence[str]] = None) -> PipeSizingResult:
+        """
+        Dimenzovanie úsekov so zadanými návrhovými prietokmi
+
+        Args:
+            design_flow: návrhové prietoky [kg/s]
+            length: dĺžky úsekov [m] (pre cenu)
+            names: názvy úsekov
+        """
+        flow = np.abs(np.asarray(design_flow, dtype=np.float64))
+        length = np.broadcast_to(np.asarray(length, dtype=np.float64), flow.shape).copy()
+        index = self.select(flow)
+
+        diameter = self.catalogue.inner_diameter[index]
+        density = water_properties.density(self.water_temperature)
+        velocity = flow / (density * np.pi * (diameter / 2) ** 2)
+        gradient = self._pressure_gradient(flow, index)
+        undersized = (velocity > self.max_velocity * (1 + 1e-12)) | (gradient > self.max_pressure_gradient)
+
+        return PipeSizingResult(
+            pipe_names=list(names) if names is not None else [f"úsek_{i}" for i in range(len(flow))],
+            design_flow=flow,
+            length=length,
+            catalogue_index=index,
+            nominal=[self.catalogue.nominal[i] for i in index],
+            diameter=diameter,
+            velocity=velocity,
+            specific_pressure_drop=gradient,
+            cost=self.catalogue.unit_cost[index] * length,
+            undersized=undersized,
+        )
+
+    def size_network(self, network: PipeNetwork, apply: bool = True) -> PipeSizingResult:
+        """
+        Dimenzovanie všetkých potrubí siete z návrhových prietokov telies
+
+        Prietoky v rozvode sa určia jedným výpočtom siete s telesami
+        nahradenými odbermi (ako pri vyregulovaní), potom sa naraz
+        dimenzujú všetky potrubia.
+
+        Args:
+            network: sieť s návrhovými prietokmi telies a zadanými tlakmi
+            apply: zapísať navrhnuté priemery a drsnosť do siete
+        """
+        terminals = network.terminals()
+        design = np.array([network.design_flow[t] for t in terminals])
+        if len(terminals) == 0 or np.any(design <= 0):
+            raise ValueError("Všetky telesá musia mať kladný návrhový prietok")
+
+        demand = np.zeros(network.n_nodes)
+        np.add.at(demand, np.array(network.link_start)[terminals], design)
+        np.add.at(demand, np.array(network.link_end)[terminals], -design)
+        active = np.ones(network.n_links, dtype=bool)
+        active[terminals] = False
+        distribution = network.solve(node_demand=demand, active=active)
+        if not distribution.converged:
+            raise RuntimeError("Hydraulický výpočet rozvodu nekonvergoval")
+
+        pipes = np.flatnonzero(np.array(network.link_kind) == PIPE)
+        result = self.size(distribution.flow[pipes], np.array(network.length)[pipes],
+                           [network.link_names[p] for p in pipes])
+        if apply:
+            for pipe, diameter in zip(pipes, result.diameter):
+                network.diameter[pipe] = float(diameter)
+                network.roughness[pipe] = self.catalogue.roughness
+        return result
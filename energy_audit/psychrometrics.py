@@ -0,0 +1,140 @@
+"""
+Psychrometria vlhkého vzduchu
+Tlak nasýtených pár, merná vlhkosť, entalpia a rosný bod pre skaláry aj hodinové polia
+"""
+
+import math
+from typing import Union
+
+import numpy as np
+
+
+ArrayLike = Union[float, np.ndarray]
+
+ATMOSPHERIC_PRESSURE = 101325.0  # [Pa]
+MOLAR_MASS_RATIO = 0.621945  # pomer mólových hmotností vody a suchého vzduchu [-]
+LATENT_HEAT = 2501.0  # výparné teplo vody pri 0 °C [kJ/kg]
+DRY_AIR_SPECIFIC_HEAT = 1.006  # [kJ/(kg.K)]
+VAPOUR_SPECIFIC_HEAT = 1.86  # [kJ/(kg.K)]
+
+# Magnusov vzťah (Sonntag 1990): nad vodou a nad ľadom, odchýlka do 0,1 % v rozsahu -45 až 60 °C
+_MAGNUS_PRESSURE = 611.2  # [Pa]
+_MAGNUS_WATER = (17.62, 243.12)
+_MAGNUS_ICE = (22.46, 272.62)
+
+
+def _result(value: np.ndarray) -> ArrayLike:
+    """Skalárny vstup vráti float, pole vráti pole"""
+    return float(value) if np.ndim(value) == 0 else value
+
+
+def _as_float_array(value: ArrayLike) -> np.ndarray:
+    """Pole s plávajúcou čiarkou (float32 vstup zostane float32)"""
+    value = np.asarray(value)
+    return value if value.dtype.kind == 'f' else value.astype(np.float64)
+
+
+def _magnus(temperature: np.ndarray, coefficients) -> np.ndarray:
+    b, c = coefficients
+    value = temperature + np.asarray(c, temperature.dtype)
+    np.divide(temperature, value, out=value)
+    value *= np.asarray(b, temperature.dtype)
+    np.exp(value, out=value)
+    value *= np.asarray(_MAGNUS_PRESSURE, temperature.dtype)
+    return value
+
+
+def saturation_pressure(temperature: ArrayLike) -> ArrayLike:
+    """
+    Tlak nasýtených vodných pár [Pa]
+
+    Args:
+        temperature: teplota vzduchu [°C] (pod 0 °C nad ľadom)
+    """
+    temperature = _as_float_array(temperature)
+    if temperature.ndim == 0:
+        b, c = _MAGNUS_WATER if temperature >= 0 else _MAGNUS_ICE
+        return _MAGNUS_PRESSURE * math.exp(b * float(temperature) / (c + float(temperature)))
+    pressure = _magnus(temperature, _MAGNUS_WATER)
+    # Vzťah nad ľadom sa vyhodnotí len pre hodiny pod bodom mrazu
+    ice = temperature < 0
+    if ice.any():
+        pressure[ice] = _magnus(temperature[ice], _MAGNUS_ICE)
+    return _result(pressure)
+
+
+def humidity_ratio(temperature: ArrayLike,
+                   relative_humidity: ArrayLike,
+                   pressure: float = ATMOSPHERIC_PRESSURE) -> ArrayLike:
+    """
+    Merná vlhkosť (hmotnosť vodnej pary na kg suchého vzduchu) [kg/kg]
+
+    Args:
+        temperature: teplota vzduchu [°C]
+        relative_humidity: relatívna vlhkosť (0-1)
+        pressure: celkový tlak vzduchu [Pa]
+    """
+    vapour_pressure = np.asarray(relative_humidity) * saturation_pressure(temperature)
+    return _result(MOLAR_MASS_RATIO * vapour_pressure / (pressure - vapour_pressure))
+
+
+def relative_humidity(temperature: ArrayLike,
+                      humidity_ratio: ArrayLike,
+                      pressure: float = ATMOSPHERIC_PRESSURE) -> ArrayLike:
+    """Relatívna vlhkosť (0-1, nad nasýtením > 1) zo mernej vlhkosti [kg/kg]"""
+    humidity_ratio = np.asarray(humidity_ratio)
+    vapour_pressure = pressure * humidity_ratio / (MOLAR_MASS_RATIO + humidity_ratio)
+    return _result(vapour_pressure / saturation_pressure(temperature))
+
+
+def enthalpy(temperature: ArrayLike, humidity_ratio: ArrayLike) -> ArrayLike:
+    """
+    Merná entalpia vlhkého vzduchu [kJ/kg suchého vzduchu]
+
+    h = 1,006 t + x (2501 + 1,86 t)
+    """
+    temperature = np.asarray(temperature)
+    return _result(DRY_AIR_SPECIFIC_HEAT * temperature
+                   + np.asarray(humidity_ratio) * (LATENT_HEAT + VAPOUR_SPECIFIC_HEAT * temperature))
+
+
+def dew_point(temperature: ArrayLike, relative_humidity: ArrayLike) -> ArrayLike:
+    """
+    Teplota rosného bodu [°C] (inverzia Magnusovho vzťahu nad vodou)
+
+    Args:
+        temperature: teplota vzduchu [°C]
+        relative_humidity: relatívna vlhkosť (0-1, nulová vlhkosť vráti -inf)
+    """
+    temperature = np.asarray(temperature)
+    b, c = _MAGNUS_WATER
+    with np.errstate(divide='ignore'):
+        gamma = np.log(relative_humidity) + b * temperature / (c + temperature)
+    return _result(c * gamma / (b - gamma))
+
+
+def air_state(temperature: ArrayLike,
+              relative_humidity: ArrayLike,
+              pressure: float = ATMOSPHERIC_PRESSURE) -> dict:
+    """Stav vlhkého vzduchu: merná vlhkosť, entalpia a rosný bod"""
+    x = humidity_ratio(temperature, relative_humidity, pressure)
+    return {
+        'humidity_ratio': x,
+        'enthalpy': enthalpy(temperature, x),
+        'dew_point': dew_point(temperature, relative_humidity),
+    }
+
+
+def dehumidification(outdoor_temperature: ArrayLike,
+                     outdoor_relative_humidity: ArrayLike,
+                     indoor_temperature: ArrayLike = 24.0,
+                     indoor_relative_humidity: ArrayLike = 0.5,
+                     pressure: float = ATMOSPHERIC_PRESSURE) -> ArrayLike:
+    """
+    Rozdiel mernej vlhkosti vonkajšieho a vnútorného vzduchu na odvlhčenie [kg/kg]
+
+    Sušší vonkajší vzduch nevytvára latentnú záťaž (rozdiel sa obmedzí na nulu).
+    """
+    outdoor = np.asarray(humidity_ratio(outdoor_temperature, outdoor_relative_humidity, pressure))
+    indoor = np.asarray(humidity_ratio(indoor_temperature, indoor_relative_humidity, pressure))
+    return _result(np.maximum(outdoor - indoor, 0.0))
@@ -0,0 +1,280 @@
+"""
+Parametrická štúdia variantov obnovy (zateplenie, výmena okien, vetranie)
+Všetky kombinácie parametrov sa vyhodnotia vektorovo, voliteľne paralelne
+"""
+
+import copy
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models import Building, ConstructionType, Material, STANDARD_MATERIALS
+from .batch import BatchHeatingCalculations, ClimateInput, Portfolio, BX_BY_CONSTRUCTION_CODE
+from .columnar import CONSTRUCTION_TYPES
+
+
+# Súčiniteľ mernej tepelnej straty vetraním HV = k × n × V (rovnica 2.4 zo skrípt)
+_VENTILATION_FACTOR = 0.85 * 1.2 * 1010 / 3600
+
+
+@dataclass
+class RetrofitVariant:
+    """Jeden variant obnovy"""
+    insulation_thickness: float  # prídavná tepelná izolácia [m]
+    window_u_value: Optional[float]  # nové okná U [W/(m².K)], None = pôvodné
+    window_g_value: Optional[float]  # nové okná g [-], None = pôvodné
+    air_change_rate: float  # intenzita výmeny vzduchu [1/h]
+
+
+@dataclass
+class RetrofitSweepChunk:
+    """Výsledky pre súvislý rozsah budov a všetky varianty"""
+    building_start: int  # index prvej budovy
+    heating_demand: np.ndarray  # potreba tepla [budova × variant] [kWh]
+    specific_heating_demand: np.ndarray  # merná potreba tepla [budova × variant] [kWh/m²]
+
+    @property
+    def building_stop(self) -> int:
+        return self.building_start + len(self.heating_demand)
+
+
+def apply_variant(building: Building, variant: RetrofitVariant,
+                  insulation_material: Material = STANDARD_MATERIALS['polystyrén_exp'],
+                  insulated_types: Sequence[ConstructionType] = (ConstructionType.EXTERNAL_WALL,)) -> Building:
+    """Kópia budovy s aplikovaným variantom obnovy (pre kontrolu a protokoly)"""
+    retrofitted = copy.deepcopy(building)
+    for zone in retrofitted.zones:
+        if variant.insulation_thickness > 0:
+            for construction in zone.constructions:
+                if construction.construction_type in insulated_types:
+                    construction.add_layer(insulation_material, variant.insulation_thickness)
+        for window in zone.windows:
+            if variant.window_u_value is not None:
+                window.u_value = variant.window_u_value
+            if variant.window_g_value is not None:
+                window.g_value = variant.window_g_value
+    return retrofitted
+
+
+def _sweep_arrays(portfolio: Portfolio, climate_data: ClimateInput,
+                  insulated_types: Sequence[ConstructionType],
+                  thermal_bridges_delta_u: float) -> Dict[str, np.ndarray]:
+    """
+    Rozklad potreby tepla na zložky, ktoré sa pri variantoch menia
+    (zatepľované konštrukcie, okná, vetranie) a zložky, ktoré zostávajú
+    """
+    store = BatchHeatingCalculations.as_store(portfolio)
+    climates = BatchHeatingCalculations.climates_per_building(climate_data, store.n_buildings)
+    n = store.n_buildings
+
+    u_values = BatchHeatingCalculations.calculate_u_values(store)
+    construction_building = store.zone_building[store.construction_zone]
+    window_building = store.zone_building[store.window_zone]
+    insulated_codes = [CONSTRUCTION_TYPES.index(t) for t in insulated_types]
+    insulated = np.isin(store.construction_type, insulated_codes)
+    bx_area = BX_BY_CONSTRUCTION_CODE[store.construction_type] * store.construction_area
+
+    # Pevná časť HT: nezatepľované konštrukcie a tepelné mosty
+    envelope_area = BatchHeatingCalculations.calculate_envelope_area(store)
+    ht_fixed = (np.bincount(construction_building[~insulated],
+                            weights=(bx_area * u_values)[~insulated], minlength=n)
+                + thermal_bridges_delta_u * envelope_area)
+
+    # Solárne zisky bez g (okná sa menia spolu s g)
+    i_sol = BatchHeatingCalculations.window_solar_radiation(store, climates)
+    solar_without_g = 0.8 * (store.window_shading_factor * 0.8 * store.window_area) * i_sol
+
+    floor_area = np.bincount(store.zone_building, weights=store.zone_floor_area, minlength=n)
+    heating_days = np.array([c.heating_days for c in climates], dtype=np.float64)
+    theta_e = np.array([c.external_temperature for c in climates], dtype=np.float64)
+
+    return {
+        'ht_fixed': ht_fixed,
+        'window_ht': np.bincount(window_building, weights=store.window_u_value * store.window_area,
+                                 minlength=n),
+        'window_area': np.bincount(window_building, weights=store.window_area, minlength=n),
+        'solar_gains': np.bincount(window_building, weights=solar_without_g * store.window_g_value,
+                                   minlength=n),
+        'solar_without_g': np.bincount(window_building, weights=solar_without_g, minlength=n),
+        'internal_gains': BatchHeatingCalculations.calculate_internal_heat_gains(store, climates),
+        'volume': np.bincount(store.zone_building, weights=store.zone_volume, minlength=n),
+        'floor_area': floor_area,
+        'degree_factor': (20.0 - theta_e) * heating_days * 0.024,
+        'wall_building': construction_building[insulated],
+        'wall_bx_area': bx_area[insulated],
+        'wall_resistance': 1.0 / u_values[insulated],
+    }
+
+
+def _evaluate_chunk(arrays: Dict[str, np.ndarray], start: int, stop: int,
+                    thicknesses: np.ndarray, insulation_conductivity: float,
+                    window_u: np.ndarray, window_g: np.ndarray,
+                    air_change_rates: np.ndarray) -> RetrofitSweepChunk:
+    """Vyhodnotenie všetkých variantov pre budovy start:stop"""
+    count = stop - start
+    block = {key: arrays[key][start:stop] for key in (
+        'ht_fixed', 'window_ht', 'window_area', 'solar_gains', 'solar_without_g',
+        'internal_gains', 'volume', 'floor_area', 'degree_factor'
+    )}
+
+    # Zatepľované konštrukcie budov v rozsahu (budovy sú zoradené vzostupne)
+    wall_building = arrays['wall_building']
+    first, last = np.searchsorted(wall_building, [start, stop])
+    wall_ht = arrays['wall_bx_area'][first:last, None] / (
+        arrays['wall_resistance'][first:last, None] + thicknesses[None, :] / insulation_conductivity
+    )
+    ht_walls = np.zeros((count, len(thicknesses)))
+    np.add.at(ht_walls, wall_building[first:last] - start, wall_ht)
+
+    # Okná: NaN v parametroch znamená pôvodné okná
+    keep_u = np.isnan(window_u)
+    ht_windows = np.where(keep_u[None, :], block['window_ht'][:, None],
+                          np.nan_to_num(window_u)[None, :] * block['window_area'][:, None])
+    keep_g = np.isnan(window_g)
+    solar = np.where(keep_g[None, :], block['solar_gains'][:, None],
+                     np.nan_to_num(window_g)[None, :] * block['solar_without_g'][:, None])
+
+    # [budova × izolácia × okná × vetranie]
+    ht = block['ht_fixed'][:, None, None] + ht_walls[:, :, None] + ht_windows[:, None, :]
+    hv = _VENTILATION_FACTOR * air_change_rates[None, :] * block['volume'][:, None]
+    qht = (ht[:, :, :, None] + hv[:, None, None, :]) * block['degree_factor'][:, None, None, None]
+    qgn = block['internal_gains'][:, None] + solar
+    qh = np.maximum(0.0, qht - 0.95 * qgn[:, None, :, None]).reshape(count, -1)
+
+    floor_area = block['floor_area'][:, None]
+    specific = np.divide(qh, floor_area, out=np.zeros_like(qh), where=floor_area > 0)
+    return RetrofitSweepChunk(start, qh, specific)
+
+
+# Polia zdieľané s pracovnými procesmi (nastavuje _attach_worker)
+_WORKER_STATE = {}
+
+
+def _attach_worker(layout: Dict[str, Tuple[str, Tuple[int, ...], str]], parameters: Dict):
+    """Inicializácia pracovného procesu: pripojenie zdieľanej pamäte bez kopírovania"""
+    blocks, arrays = [], {}
+    for key, (name, shape, dtype) in layout.items():
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    _WORKER_STATE.update(blocks=blocks, arrays=arrays, parameters=parameters)
+
+
+def _worker_evaluate(start: int, stop: int) -> RetrofitSweepChunk:
+    return _evaluate_chunk(_WORKER_STATE['arrays'], start, stop, **_WORKER_STATE['parameters'])
+
+
+class RetrofitSweep:
+    """
+    Parametrická štúdia variantov obnovy pre portfólio budov
+
+    Varianty tvoria kartézsky súčin hrúbok prídavnej izolácie, typov okien
+    a intenzít výmeny vzduchu. Budova sa pri variante neprestavuje: potreba
+    tepla sa rozloží na zložky (zatepľované konštrukcie, okná, vetranie,
+    zisky) a každý variant je len lacná aritmetika nad týmito poliami.
+    Výsledky zodpovedajú HeatingCalculations pre budovu upravenú apply_variant.
+    """
+
+    def __init__(self,
+                 portfolio: Portfolio,
+                 climate_data: ClimateInput,
+                 insulation_thicknesses: Sequence[float] = (0.0,),
+                 window_options: Sequence[Tuple[Optional[float], Optional[float]]] = ((None, None),),
+                 air_change_rates: Sequence[float] = (0.5,),
+                 insulation_material: Material = STANDARD_MATERIALS['polystyrén_exp'],
+                 insulated_types: Sequence[ConstructionType] = (ConstructionType.EXTERNAL_WALL,),
+                 thermal_bridges_delta_u: float = 0.1):
+        """
+        Args:
+            portfolio: zoznam budov alebo BuildingStore
+            climate_data: klimatické údaje (spoločné alebo jedny na budovu)
+            insulation_thicknesses: hrúbky prídavnej izolácie [m]
+            window_options: dvojice (U, g) nových okien, None = pôvodná hodnota
+            air_change_rates: intenzity výmeny vzduchu [1/h]
+            insulation_material: materiál prídavnej izolácie
+            insulated_types: typy zatepľovaných konštrukcií
+            thermal_bridges_delta_u: prirážka na tepelné mosty ΔU [W/(m².K)]
+        """
+        if insulation_material.thermal_conductivity <= 0:
+            raise ValueError("Tepelná vodivosť musí byť kladná")
+
+        self.insulation_material = insulation_material
+        self.insulated_types = tuple(insulated_types)
+        self.variants = [
+            RetrofitVariant(thickness, u_value, g_value, n)
+            for thickness, (u_value, g_value), n in itertools.product(
+                insulation_thicknesses, window_options, air_change_rates
+            )
+        ]
+        self.arrays = _sweep_arrays(portfolio, climate_data, self.insulated_types,
+                                    thermal_bridges_delta_u)
+        self.parameters = {
+            'thicknesses': np.asarray(insulation_thicknesses, dtype=np.float64),
+            'insulation_conductivity': insulation_material.thermal_conductivity,
+            'window_u': np.array([np.nan if u is None else u for u, _ in window_options]),
+            'window_g': np.array([np.nan if g is None else g for _, g in window_options]),
+            'air_change_rates': np.asarray(air_change_rates, dtype=np.float64),
+        }
+
+    @property
+    def n_buildings(self) -> int:
+        return len(self.arrays['floor_area'])
+
+    @property
+    def n_evaluations(self) -> int:
+        return self.n_buildings * len(self.variants)
+
+    def evaluate(self) -> RetrofitSweepChunk:
+        """Vyhodnotenie všetkých budov a variantov v aktuálnom procese"""
+        return _evaluate_chunk(self.arrays, 0, self.n_buildings, **self.parameters)
+
+    def run(self, workers: Optional[int] = None,
+            buildings_per_task: int = 256) -> Iterator[RetrofitSweepChunk]:
+        """
+        Paralelné vyhodnotenie s priebežným odovzdávaním výsledkov
+
+        Polia portfólia sa raz umiestnia do zdieľanej pamäte, pracovné procesy
+        ich čítajú bez kopírovania. Výsledky sa vracajú v poradí dokončenia
+        (building_start určuje, ktorým budovám patria).
+
+        Args:
+            workers: počet procesov (None = počet jadier, 0 = bez paralelizácie)
+            buildings_per_task: počet budov v jednej úlohe
+        """
+        bounds = [(start, min(start + buildings_per_task, self.n_buildings))
+                  for start in range(0, self.n_buildings, buildings_per_task)]
+        if workers == 0:
+            for start, stop in bounds:
+                yield _evaluate_chunk(self.arrays, start, stop, **self.parameters)
+            return
+
+        blocks, layout = [], {}
+        try:
+            for key, array in self.arrays.items():
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                blocks.append(block)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+                layout[key] = (block.name, array.shape, array.dtype.str)
+
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker,
+                                     initargs=(layout, self.parameters)) as executor:
+                futures = [executor.submit(_worker_evaluate, start, stop) for start, stop in bounds]
+                for future in as_completed(futures):
+                    yield future.result()
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def results(self, workers: Optional[int] = 0) -> RetrofitSweepChunk:
+        """Zozbierané výsledky všetkých budov v poradí vstupu"""
+        heating = np.empty((self.n_buildings, len(self.variants)))
+        specific = np.empty_like(heating)
+        for chunk in self.run(workers):
+            heating[chunk.building_start:chunk.building_stop] = chunk.heating_demand
+            specific[chunk.building_start:chunk.building_stop] = chunk.specific_heating_demand
+        return RetrofitSweepChunk(0, heating, specific)
@@ -0,0 +1,322 @@
+"""
+Hodinová chladiaca záťaž metódou radiačných časových radov (RTS)
+Radiačná časť tepelných ziskov sa do chladiacej záťaže premieta s oneskorením podľa ASHRAE Fundamentals, kap. 18
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .models import ConstructionType
+from .batch import BatchHeatingCalculations, Portfolio
+from .columnar import CONSTRUCTION_TYPES
+from .dynamic import HourlyWeather, DEFAULT_SOLAR_PEAKS, sum_zones_per_building
+
+
+# Radiačné časové rady (RTS) [%] pre 24 h; nesolárne (vnútorné zisky, prechod tepla)
+# a solárne (prepustené žiarenie), reprezentatívne zóny s kobercom a 10 % zasklenia
+NONSOLAR_RTS = {
+    'ľahká': [47, 19, 11, 6, 4, 3, 2, 2, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    'stredná': [46, 18, 10, 6, 4, 3, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0],
+    'ťažká': [46, 11, 7, 5, 4, 3, 3, 3, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0],
+}
+SOLAR_RTS = {
+    'ľahká': [53, 17, 9, 5, 3, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0],
+    'stredná': [53, 15, 7, 4, 3, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0],
+    'ťažká': [53, 9, 4, 3, 3, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+}
+# Časové rady prechodu tepla (CTS) nepriesvitnými konštrukciami [%]
+CONDUCTION_TIME_SERIES = {
+    'ľahká': [18, 58, 20, 4, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    'stredná': [1, 10, 20, 18, 14, 10, 7, 5, 4, 3, 2, 2, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0],
+    'ťažká': [0, 1, 3, 6, 8, 9, 9, 8, 7, 7, 6, 5, 5, 4, 4, 3, 3, 3, 2, 2, 2, 1, 1, 1],
+}
+
+# Radiačný podiel tepelných ziskov [-] (ASHRAE Fundamentals, tab. 14)
+RADIANT_FRACTIONS = {
+    'osoby': 0.6,
+    'osvetlenie': 0.5,
+    'zariadenia': 0.2,
+    'okná': 0.46,  # prechod tepla zasklením
+    'steny': 0.46,
+    'strechy': 0.6,
+}
+
+# Denný priebeh teploty v návrhový deň: podiel denného rozkmitu pod maximom (hodiny 1-24)
+DAILY_RANGE_FRACTIONS = [
+    0.87, 0.92, 0.96, 0.99, 1.00, 0.98, 0.93, 0.84, 0.71, 0.56, 0.39, 0.23,
+    0.11, 0.03, 0.00, 0.03, 0.10, 0.21, 0.34, 0.47, 0.58, 0.68, 0.76, 0.82,
+]
+
+# Pomer pohltivosti a súčiniteľa prestupu tepla vonkajšieho povrchu α/he [m².K/W] (tmavý povrch)
+SURFACE_ABSORPTANCE_RATIO = 0.052
+# Oprava teploty vzduchu na slnku pre vodorovné plochy o dlhovlnné vyžarovanie [K]
+HORIZONTAL_SKY_CORRECTION = 3.9
+HORIZONTAL_SOLAR_PEAK = 800.0  # [W/m²]
+
+# Čas maxima žiarenia na fasádu [h] pre návrhový deň
+_FACADE_PEAK_HOUR = {'SV': 8.0, 'V': 9.0, 'JV': 10.5, 'J': 12.5, 'JZ': 14.5, 'Z': 16.0, 'SZ': 17.0}
+
+# Kancelárske prevádzkové profily (podiel inštalovanej hodnoty, hodiny 0-23)
+OFFICE_OCCUPANCY = [0.0] * 7 + [0.3, 0.9, 1.0, 1.0, 1.0, 0.7, 1.0, 1.0, 1.0, 0.9, 0.4, 0.1] + [0.0] * 5
+OFFICE_LIGHTING = [0.05] * 7 + [0.5, 0.9, 0.9, 0.9, 0.9, 0.8, 0.9, 0.9, 0.9, 0.9, 0.6, 0.3] + [0.05] * 5
+OFFICE_EQUIPMENT = [0.2] * 7 + [0.5, 0.9, 1.0, 1.0, 1.0, 0.8, 1.0, 1.0, 1.0, 0.9, 0.6, 0.3] + [0.2] * 5
+
+
+@dataclass
+class InternalLoads:
+    """Vnútorné tepelné zisky na m² podlahovej plochy a ich denné profily"""
+    people_per_area: float = 0.1  # [osoba/m²]
+    people_sensible: float = 70.0  # citeľné teplo [W/osoba]
+    people_latent: float = 45.0  # latentné teplo [W/osoba]
+    lighting_power: float = 10.0 * 0.95  # [W/m²] (podiel premenený na teplo)
+    equipment_power: float = 15.0 * 0.7 * 0.8  # [W/m²] (využitie × súčasnosť)
+    occupancy_schedule: Sequence[float] = field(default_factory=lambda: list(OFFICE_OCCUPANCY))
+    lighting_schedule: Sequence[float] = field(default_factory=lambda: list(OFFICE_LIGHTING))
+    equipment_schedule: Sequence[float] = field(default_factory=lambda: list(OFFICE_EQUIPMENT))
+
+    @staticmethod
+    def profile(schedule: Sequence[float], n_hours: int) -> np.ndarray:
+        """Denný (alebo dlhší) profil zopakovaný na n_hours hodín"""
+        return np.resize(np.asarray(schedule, dtype=np.float64), n_hours)
+
+
+@dataclass
+class RTSResult:
+    """Výsledky metódy RTS (zónové polia tvaru [hodina × zóna])"""
+    cooling_load: np.ndarray  # citeľná chladiaca záťaž [W]
+    heat_gain: np.ndarray  # okamžité citeľné tepelné zisky [W]
+    latent_load: np.ndarray  # latentná záťaž od osôb [W]
+    component_loads: Dict[str, np.ndarray]  # citeľná záťaž zložiek [hodina × budova]
+    zone_building: np.ndarray
+    n_buildings: int
+
+    def building_loads(self, loads: np.ndarray) -> np.ndarray:
+        """Hodinové hodnoty budov [hodina × budova] zo zónových hodnôt"""
+        return sum_zones_per_building(loads, self.zone_building, self.n_buildings)
+
+    def peak_cooling_load(self, include_latent: bool = True) -> np.ndarray:
+        """Maximálna hodinová chladiaca záťaž budov [W] (pre návrh zariadenia)"""
+        loads = self.cooling_load + self.latent_load if include_latent else self.cooling_load
+        return self.building_loads(loads).max(axis=0, initial=0.0)
+
+    def peak_heat_gain(self, include_latent: bool = True) -> np.ndarray:
+        """Maximálne okamžité tepelné zisky budov [W] (bez akumulácie)"""
+        gains = self.heat_gain + self.latent_load if include_latent else self.heat_gain
+        return self.building_loads(gains).max(axis=0, initial=0.0)
+
+    def annual_cooling_demand(self) -> np.ndarray:
+        """Potreba chladu budov [kWh] (súčet kladnej citeľnej a latentnej záťaže)"""
+        loads = np.maximum(self.cooling_load, 0.0) + self.latent_load
+        return self.building_loads(loads).sum(axis=0) / 1000
+
+
+def _series(values: Sequence[float]) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    return values / values.sum()
+
+
+def _fold(kernel: np.ndarray, n_hours: int) -> np.ndarray:
+    """Jadro konvolúcie zvinuté na periódu n_hours (návrhový deň s periodickým ustálením)"""
+    folded = np.zeros(n_hours)
+    np.add.at(folded, np.arange(len(kernel)) % n_hours, kernel)
+    return folded
+
+
+def periodic_convolution(series: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """
+    Periodická konvolúcia hodinových radov [hodina × ...] s jadrom pozdĺž osi hodín
+
+    Q(θ) = Σj r_j q(θ - j); krátke periódy (návrhový deň, týždeň) cirkulantnou
+    maticou, dlhé rady (celý rok) cez FFT.
+    """
+    series = np.asarray(series, dtype=np.float64)
+    n_hours = series.shape[0]
+    kernel = _fold(np.asarray(kernel, dtype=np.float64), n_hours)
+    if n_hours <= 168:
+        index = np.subtract.outer(np.arange(n_hours), np.arange(n_hours)) % n_hours
+        return np.tensordot(kernel[index], series, axes=1)
+    spectrum = np.fft.rfft(series, axis=0)
+    spectrum *= np.fft.rfft(kernel).reshape((-1,) + (1,) * (series.ndim - 1))
+    return np.fft.irfft(spectrum, n=n_hours, axis=0)
+
+
+class RadiantTimeSeries:
+    """
+    Hodinová chladiaca záťaž zón metódou RTS
+
+    Tepelné zisky od osôb, osvetlenia, zariadení, slnečného žiarenia a prechodu
+    tepla sa rozdelia na konvekčnú časť (okamžitá záťaž) a radiačnú časť, ktorú
+    konštrukcie zóny akumulujú a odovzdávajú podľa radiačného časového radu.
+    Prechod tepla nepriesvitnými konštrukciami sa navyše oneskorí časovým radom
+    CTS z teploty vzduchu na slnku. Všetky časové rady sú periodické, preto
+    24-hodinové počasie dáva ustálený návrhový deň a 8760 hodín celý rok.
+
+    Jednotlivé zisky sa lineárne skladajú do piatich báz (okamžitá, RTS, solárne
+    RTS, CTS, CTS + RTS), takže na zónovej úrovni stačia štyri konvolúcie
+    [hodina × zóna] bez ohľadu na počet zložiek. Záťaž vetrania (ventilačný
+    vzduch spracuje zariadenie) sa nezahŕňa.
+    """
+
+    @staticmethod
+    def design_day(design_temperature: float = 32.0,
+                   daily_range: float = 11.0,
+                   solar_peaks: Dict[str, float] = None) -> HourlyWeather:
+        """
+        Návrhový letný deň (24 h)
+
+        Teplota klesá od maxima o 15:00 podľa DAILY_RANGE_FRACTIONS; žiarenie
+        na fasády má maximum v čase podľa orientácie (zjednodušený priebeh).
+        """
+        hours = np.arange(24) + 0.5
+        temperature = design_temperature - daily_range * np.asarray(DAILY_RANGE_FRACTIONS)
+        sun = np.clip(np.sin(np.pi * (hours - 5.0) / 14.0), 0.0, None)  # východ 5:00, západ 19:00
+
+        peaks = dict(DEFAULT_SOLAR_PEAKS, H=HORIZONTAL_SOLAR_PEAK) if solar_peaks is None else solar_peaks
+        radiation = {}
+        for orientation, peak in peaks.items():
+            peak_hour = _FACADE_PEAK_HOUR.get(orientation.upper())
+            profile = sun if peak_hour is None else sun * np.clip(np.cos(np.pi * (hours - peak_hour) / 12.0), 0.0, None)
+            radiation[orientation] = peak * profile / profile.max()
+        return HourlyWeather(temperature=temperature, solar_radiation=radiation)
+
+    @staticmethod
+    def _gains(store, weather: HourlyWeather, internal_loads: InternalLoads,
+               indoor_temperature: float,
+               surface_absorptance_ratio: float) -> List[Tuple[str, str, np.ndarray, np.ndarray]]:
+        """
+        Okamžité citeľné zisky ako (zložka, druh zisku, budiace rady, koeficienty zón)
+
+        Zisk zón [hodina × zóna] = budiace rady [hodina × k] @ koeficienty [zóna × k]ᵀ
+        """
+        n_hours, n_zones = weather.n_hours, len(store.zone_name)
+        floor_area = store.zone_floor_area[:, None]
+        temperature_difference = (weather.temperature - indoor_temperature)[:, None]
+
+        def schedule(values):
+            return InternalLoads.profile(values, n_hours)[:, None]
+
+        gains = [
+            ('osoby', 'osoby', schedule(internal_loads.occupancy_schedule),
+             internal_loads.people_per_area * internal_loads.people_sensible * floor_area),
+            ('osvetlenie', 'osvetlenie', schedule(internal_loads.lighting_schedule),
+             internal_loads.lighting_power * floor_area),
+            ('zariadenia', 'zariadenia', schedule(internal_loads.equipment_schedule),
+             internal_loads.equipment_power * floor_area),
+        ]
+
+        # Prepustené slnečné žiarenie a prechod tepla zasklením
+        orientations, window_orientation = store.window_orientation_codes
+        apertures = np.zeros((n_zones, len(orientations)))
+        np.add.at(apertures, (store.window_zone, window_orientation),
+                  store.window_area * store.window_g_value * store.window_shading_factor)
+        irradiance = np.column_stack([weather.irradiance(o) for o in orientations] or [np.zeros(n_hours)])
+        gains.append(('slnko', 'slnko', irradiance, apertures if orientations else np.zeros((n_zones, 1))))
+        window_ua = np.bincount(store.window_zone, weights=store.window_u_value * store.window_area,
+                                minlength=n_zones)
+        gains.append(('prechod_tepla', 'okná', temperature_difference, window_ua[:, None]))
+
+        # Nepriesvitné konštrukcie: rozdiel teploty vzduchu na slnku a vnútornej teploty
+        ua = BatchHeatingCalculations.calculate_u_values(store) * store.construction_area
+        walls = store.construction_type == CONSTRUCTION_TYPES.index(ConstructionType.EXTERNAL_WALL)
+        roofs = store.construction_type == CONSTRUCTION_TYPES.index(ConstructionType.ROOF)
+
+        codes: Dict[str, int] = {}
+        wall_orientation = np.fromiter(
+            (codes.setdefault(store.construction_orientation[c].upper(), len(codes)) for c in np.flatnonzero(walls)),
+            dtype=np.int64, count=int(walls.sum())
+        )
+        wall_ua = np.zeros((n_zones, len(codes)))
+        np.add.at(wall_ua, (store.construction_zone[walls], wall_orientation), ua[walls])
+        wall_drivers = [temperature_difference[:, 0]]
+        wall_drivers += [surface_absorptance_ratio * weather.irradiance(o) for o in codes]
+        gains.append(('prechod_tepla', 'steny', np.column_stack(wall_drivers),
+                      np.column_stack([wall_ua.sum(axis=1), wall_ua])))
+
+        roof_ua = np.bincount(store.construction_zone[roofs], weights=ua[roofs], minlength=n_zones)
+        sol_air_difference = (temperature_difference[:, 0] + surface_absorptance_ratio * weather.irradiance('H')
+                              - HORIZONTAL_SKY_CORRECTION)
+        gains.append(('prechod_tepla', 'strechy', sol_air_difference[:, None], roof_ua[:, None]))
+        return gains
+
+    @staticmethod
+    def calculate(portfolio: Portfolio,
+                  weather: HourlyWeather,
+                  internal_loads: InternalLoads = None,
+                  construction_class: str = 'stredná',
+                  indoor_temperature: float = 24.0,
+                  surface_absorptance_ratio: float = SURFACE_ABSORPTANCE_RATIO) -> RTSResult:
+        """
+        Args:
+            portfolio: zoznam budov alebo BuildingStore
+            weather: hodinové klimatické údaje (24 h = návrhový deň, 8760 h = rok)
+            internal_loads: vnútorné zisky a profily (predvolene kancelária)
+            construction_class: hmotnosť konštrukcií zóny (ľahká, stredná, ťažká)
+            indoor_temperature: vnútorná teplota pri chladení [°C]
+            surface_absorptance_ratio: α/he vonkajších povrchov [m².K/W]
+
+        Returns:
+            hodinová chladiaca záťaž a okamžité zisky zón, záťaž zložiek po budovách
+        """
+        if construction_class not in NONSOLAR_RTS:
+            raise ValueError(f"Neznáma hmotnosť konštrukcií: {construction_class}")
+        store = BatchHeatingCalculations.as_store(portfolio)
+        internal_loads = internal_loads or InternalLoads()
+        n_hours = weather.n_hours
+
+        nonsolar = _series(NONSOLAR_RTS[construction_class])
+        conduction = _series(CONDUCTION_TIME_SERIES[construction_class])
+        bases = {
+            'okamžitá': None,
+            'rts': nonsolar,
+            'solárne_rts': _series(SOLAR_RTS[construction_class]),
+            'cts': conduction,
+            'cts_rts': np.convolve(conduction, nonsolar),
+        }
+
+        # Druh zisku -> podiely báz (konvekčná časť okamžite, radiačná s oneskorením)
+        def weights(kind):
+            if kind == 'slnko':
+                return {'solárne_rts': 1.0}
+            fraction = RADIANT_FRACTIONS[kind]
+            if kind in ('steny', 'strechy'):
+                return {'cts': 1.0 - fraction, 'cts_rts': fraction}
+            return {'okamžitá': 1.0 - fraction, 'rts': fraction}
+
+        # Konvolúcia je lineárna, preto sa oneskorujú len budiace rady (málo stĺpcov)
+        # a záťaž zón vznikne jedným maticovým súčinom s koeficientmi zón
+        gains = RadiantTimeSeries._gains(store, weather, internal_loads,
+                                         indoor_temperature, surface_absorptance_ratio)
+        responses, coefficients, components = [], [], []
+        for component, kind, drivers, zone_coefficients in gains:
+            for basis, weight in weights(kind).items():
+                kernel = bases[basis]
+                response = weight * (drivers if kernel is None else periodic_convolution(drivers, kernel))
+                responses.append(response)
+                coefficients.append(zone_coefficients)
+                components.extend([component] * response.shape[1])
+        responses = np.column_stack(responses)
+        coefficients = np.column_stack(coefficients)
+
+        # Záťaž zložiek po budovách z koeficientov sčítaných za budovy
+        building_coefficients = np.zeros((store.n_buildings, coefficients.shape[1]))
+        np.add.at(building_coefficients, store.zone_building, coefficients)
+        columns = np.array(components)
+        component_loads = {
+            component: responses[:, columns == component] @ building_coefficients[:, columns == component].T
+            for component in dict.fromkeys(components)
+        }
+
+        drivers = np.column_stack([drivers for _, _, drivers, _ in gains])
+        zone_coefficients = np.column_stack([zone_coefficients for _, _, _, zone_coefficients in gains])
+        occupancy = InternalLoads.profile(internal_loads.occupancy_schedule, n_hours)
+        return RTSResult(
+            cooling_load=responses @ coefficients.T,
+            heat_gain=drivers @ zone_coefficients.T,
+            latent_load=np.outer(occupancy, internal_loads.people_per_area * internal_loads.people_latent
+                                 * store.zone_floor_area),
+            component_loads=component_loads,
+            zone_building=store.zone_building,
+            n_buildings=store.n_buildings,
+        )
@@ -0,0 +1,236 @@
+"""
+Globálna citlivostná analýza vstupov energetického auditu
+Morrisova metóda elementárnych efektov a Sobolove indexy (Saltelliho odhad)
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .models import Building, ClimateData
+from .uncertainty import (
+    HeatingDemandModel, ParameterUncertainty,
+    THERMAL_CONDUCTIVITY, AIR_CHANGE_RATE, SOLAR_RADIATION, EXTERNAL_TEMPERATURE,
+    INTERNAL_GAINS, THERMAL_BRIDGES, EMISSION_DELTA_THETA, DISTRIBUTION_LOSSES, EFFICIENCY
+)
+
+
+# Rozsahy parametrov: menovitá hodnota ± spread (rozdelenie sa neuvažuje, vzorky sú rovnomerné)
+DEFAULT_RANGES = {
+    THERMAL_CONDUCTIVITY: ParameterUncertainty('rovnomerné', 0.20),
+    AIR_CHANGE_RATE: ParameterUncertainty('rovnomerné', 0.30),
+    SOLAR_RADIATION: ParameterUncertainty('rovnomerné', 0.15),
+    EXTERNAL_TEMPERATURE: ParameterUncertainty('rovnomerné', 2.0, relative=False),
+    INTERNAL_GAINS: ParameterUncertainty('rovnomerné', 0.30),
+    THERMAL_BRIDGES: ParameterUncertainty('rovnomerné', 0.05, relative=False),
+    EMISSION_DELTA_THETA: ParameterUncertainty('rovnomerné', 0.30),
+    DISTRIBUTION_LOSSES: ParameterUncertainty('rovnomerné', 0.30),
+    EFFICIENCY: ParameterUncertainty('rovnomerné', 0.05),
+}
+
+
+@dataclass
+class MorrisIndex:
+    """Morrisove ukazovatele parametra (v jednotkách výstupu na celý rozsah parametra)"""
+    parameter: str
+    mu: float  # priemerný elementárny efekt
+    mu_star: float  # priemer absolútnych hodnôt (miera vplyvu)
+    sigma: float  # smerodajná odchýlka (nelinearita, interakcie)
+    rank: int = 0
+
+
+@dataclass
+class SobolIndex:
+    """Sobolove indexy parametra"""
+    parameter: str
+    first_order: float  # S1 - podiel rozptylu výstupu od samotného parametra
+    total_order: float  # ST - vrátane interakcií s ostatnými parametrami
+    rank: int = 0
+
+
+# Model zdieľaný s pracovnými procesmi (nastavuje _attach_worker)
+_WORKER_STATE = {}
+
+
+def _attach_worker(model: HeatingDemandModel, output: str):
+    _WORKER_STATE.update(model=model, output=output)
+
+
+def _worker_evaluate(parameters: np.ndarray) -> np.ndarray:
+    return _WORKER_STATE['model'].evaluate(parameters)[_WORKER_STATE['output']]
+
+
+def _ranked(indices: List, key) -> List:
+    indices = sorted(indices, key=key, reverse=True)
+    for rank, index in enumerate(indices, start=1):
+        index.rank = rank
+    return indices
+
+
+class SensitivityAnalysis:
+    """
+    Citlivostná analýza potreby tepla jednej budovy
+
+    Parametre sú stĺpce HeatingDemandModel (λ jednotlivých materiálov,
+    intenzita výmeny vzduchu, žiarenie podľa orientácií, parametre sústavy).
+    Všetky body sa vygenerujú naraz ako matica a vyhodnotia sa po blokoch
+    vektorizovaným modelom, voliteľne v pracovných procesoch.
+    """
+
+    def __init__(self,
+                 building: Building,
+                 climate_data: Optional[ClimateData] = None,
+                 air_change_rate: float = 0.5,
+                 ranges: Optional[Dict[str, ParameterUncertainty]] = None,
+                 output: str = 'heating_demand'):
+        """
+        Args:
+            building: posudzovaná budova
+            climate_data: klimatické údaje (predvolene building.climate_data)
+            air_change_rate: menovitá intenzita výmeny vzduchu [1/h]
+            ranges: rozsahy skupín parametrov (predvolene DEFAULT_RANGES, ostatné sú konštantné)
+            output: sledovaný výstup modelu (heating_demand, specific_heating_demand, final_energy)
+        """
+        self.model = HeatingDemandModel(building, climate_data, air_change_rate)
+        self.output = output
+        ranges = DEFAULT_RANGES if ranges is None else ranges
+
+        columns, low, high = [], [], []
+        for group, uncertainty in ranges.items():
+            if group not in self.model.groups:
+                raise KeyError(f"Neznámy parameter: {group}")
+            for column in self.model.groups[group]:
+                nominal = self.model.nominal[column]
+                spread = abs(nominal) * uncertainty.spread if uncertainty.relative else uncertainty.spread
+                if spread == 0:
+                    continue  # nulový rozsah (napr. nulová menovitá hodnota)
+                columns.append(column)
+                low.append(nominal - spread)
+                high.append(nominal + spread)
+        self.columns = np.array(columns, dtype=np.int64)
+        self.low = np.array(low)
+        self.high = np.array(high)
+
+    @property
+    def parameter_names(self) -> List[str]:
+        return [self.model.parameter_names[column] for column in self.columns]
+
+    @property
+    def n_parameters(self) -> int:
+        return len(self.columns)
+
+    def _to_parameters(self, unit_samples: np.ndarray) -> np.ndarray:
+        """Body z jednotkovej kocky [vzorka × varírovaný parameter] na maticu parametrov modelu"""
+        parameters = np.tile(self.model.nominal, (len(unit_samples), 1))
+        parameters[:, self.columns] = self.low + unit_samples * (self.high - self.low)
+        return parameters
+
+    def evaluate(self, unit_samples: np.ndarray, workers: Optional[int] = 0,
+                 rows_per_task: int = 20000) -> np.ndarray:
+        """
+        Vyhodnotenie výstupu modelu pre body jednotkovej kocky
+
+        Args:
+            unit_samples: pole [vzorka × varírovaný parameter] s hodnotami 0-1
+            workers: počet procesov (None = počet jadier, 0 = bez paralelizácie)
+            rows_per_task: počet vzoriek v jednej úlohe
+        """
+        parameters = self._to_parameters(unit_samples)
+        chunks = [parameters[start:start + rows_per_task]
+                  for start in range(0, len(parameters), rows_per_task)]
+        if workers == 0 or len(chunks) <= 1:
+            return np.concatenate([self.model.evaluate(chunk)[self.output] for chunk in chunks])
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker,
+                                 initargs=(self.model, self.output)) as executor:
+            return np.concatenate(list(executor.map(_worker_evaluate, chunks)))
+
+    def morris(self,
+               trajectories: int = 100,
+               levels: int = 4,
+               seed: Optional[int] = None,
+               workers: Optional[int] = 0) -> List[MorrisIndex]:
+        """
+        Morrisova skríningová metóda (elementárne efekty po trajektóriách)
+
+        Args:
+            trajectories: počet trajektórií r (vyhodnotení je r × (p + 1))
+            levels: počet úrovní mriežky p
+            seed: počiatočná hodnota generátora náhodných čísel
+            workers: počet procesov (None = počet jadier, 0 = bez paralelizácie)
+
+        Returns:
+            ukazovatele zoradené podľa μ* (najvplyvnejší parameter prvý)
+        """
+        rng = np.random.default_rng(seed)
+        p = self.n_parameters
+        delta = levels / (2.0 * (levels - 1))
+
+        # Začiatok trajektórie na mriežke a smer kroku každého parametra
+        grid = np.arange(levels) / (levels - 1)
+        base = rng.choice(grid[grid <= 1.0 - delta + 1e-12], size=(trajectories, p))
+        direction = rng.choice([-1.0, 1.0], size=(trajectories, p))
+        start = base + delta * (direction < 0)
+
+        # Poradie, v akom sa parametre menia (náhodná permutácia na trajektóriu)
+        order = np.argsort(rng.random((trajectories, p)), axis=1)
+        step_of_parameter = np.argsort(order, axis=1)
+        moved = step_of_parameter[:, None, :] < np.arange(p + 1)[None, :, None]
+        points = start[:, None, :] + delta * direction[:, None, :] * moved  # [r × (p+1) × p]
+
+        y = self.evaluate(points.reshape(-1, p), workers).reshape(trajectories, p + 1)
+        rows = np.arange(trajectories)[:, None]
+        effects = (y[rows, step_of_parameter + 1] - y[rows, step_of_parameter]) * direction / delta
+
+        indices = [
+            MorrisIndex(name, float(effects[:, j].mean()), float(np.abs(effects[:, j]).mean()),
+                        float(effects[:, j].std(ddof=1)) if trajectories > 1 else 0.0)
+            for j, name in enumerate(self.parameter_names)
+        ]
+        return _ranked(indices, key=lambda index: index.mu_star)
+
+    def sobol(self,
+              n_samples: int = 4096,
+              seed: Optional[int] = None,
+              workers: Optional[int] = 0) -> List[SobolIndex]:
+        """
+        Sobolove indexy prvého rádu a celkové (Saltelli 2010, Jansenov odhad ST)
+
+        Args:
+            n_samples: veľkosť základných matíc A a B (vyhodnotení je N × (p + 2))
+            seed: počiatočná hodnota generátora náhodných čísel
+            workers: počet procesov (None = počet jadier, 0 = bez paralelizácie)
+
+        Returns:
+            indexy zoradené podľa celkového indexu ST (najvplyvnejší parameter prvý)
+        """
+        rng = np.random.default_rng(seed)
+        p = self.n_parameters
+        a = rng.random((n_samples, p))
+        b = rng.random((n_samples, p))
+
+        # Matice AB_i: matica A so stĺpcom i z matice B, všetky naraz [p × N × p]
+        ab = np.broadcast_to(a, (p, n_samples, p)).copy()
+        ab[np.arange(p), :, np.arange(p)] = b.T
+
+        y = self.evaluate(np.concatenate([a, b, ab.reshape(-1, p)]), workers)
+        y_a, y_b = y[:n_samples], y[n_samples:2 * n_samples]
+        y_ab = y[2 * n_samples:].reshape(p, n_samples)
+
+        variance = np.concatenate([y_a, y_b]).var()
+        if variance == 0:
+            first = total = np.zeros(p)
+        else:
+            first = np.mean(y_b * (y_ab - y_a), axis=1) / variance
+            total = 0.5 * np.mean((y_a - y_ab) ** 2, axis=1) / variance
+
+        indices = [SobolIndex(name, float(first[j]), float(total[j]))
+                   for j, name in enumerate(self.parameter_names)]
+        return _ranked(indices, key=lambda index: index.total_order)
+
+    @staticmethod
+    def to_table(indices: List) -> List[Dict]:
+        """Výsledky ako zoznam riadkov (slovníkov) pre export do reportu"""
+        return [dict(index.__dict__) for index in indices]
@@ -0,0 +1,294 @@
+"""
+Šírenie neistôt vstupných údajov metódou Monte Carlo
+Všetky realizácie vstupov sa vyhodnocujú naraz ako jedno vektorizované pole
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models import Building, ClimateData
+from .batch import BX_BY_CONSTRUCTION_CODE, INTERNAL_GAINS_BY_CODE
+from .columnar import BuildingStore
+from .calculations import EnergyCalculations
+
+
+# Skupiny parametrov modelu (stĺpce matice vstupov)
+THERMAL_CONDUCTIVITY = 'thermal_conductivity'
+AIR_CHANGE_RATE = 'air_change_rate'
+SOLAR_RADIATION = 'solar_radiation'
+EXTERNAL_TEMPERATURE = 'external_temperature'
+INTERNAL_GAINS = 'internal_gains'
+THERMAL_BRIDGES = 'thermal_bridges_delta_u'
+EMISSION_DELTA_THETA = 'emission_delta_theta'
+DISTRIBUTION_LOSSES = 'distribution_losses'
+EFFICIENCY = 'efficiency'
+
+
+@dataclass
+class ParameterUncertainty:
+    """
+    Neistota parametra
+
+    spread je pri normálnom a lognormálnom rozdelení smerodajná odchýlka,
+    pri rovnomernom a trojuholníkovom polovičná šírka intervalu. Relatívna
+    neistota sa vzťahuje na menovitú hodnotu, absolútna je v jednotkách parametra.
+    """
+    distribution: str = 'normálne'  # normálne, lognormálne, rovnomerné, trojuholníkové
+    spread: float = 0.1
+    relative: bool = True
+
+    def sample(self, nominal: np.ndarray, n_samples: int, rng: np.random.Generator) -> np.ndarray:
+        """Realizácie parametra [vzorka × stĺpec]"""
+        nominal = np.asarray(nominal, dtype=np.float64)
+        shape = (n_samples, len(nominal))
+        if self.distribution == 'normálne':
+            deviation = rng.standard_normal(shape) * self.spread
+        elif self.distribution == 'lognormálne':
+            # Lognormálne rozdelenie so strednou hodnotou 1 (len relatívne)
+            sigma = np.sqrt(np.log1p(self.spread ** 2))
+            return nominal * rng.lognormal(-sigma ** 2 / 2, sigma, shape)
+        elif self.distribution == 'rovnomerné':
+            deviation = rng.uniform(-self.spread, self.spread, shape)
+        elif self.distribution == 'trojuholníkové':
+            deviation = rng.triangular(-self.spread, 0.0, self.spread, shape)
+        else:
+            raise ValueError(f"Neznáme rozdelenie: {self.distribution}")
+
+        if self.relative:
+            # Fyzikálne veličiny nesmú zmeniť znamienko
+            return nominal * np.maximum(1.0 + deviation, 1e-3)
+        return nominal + deviation
+
+
+# Predvolené neistoty vstupov energetického auditu
+DEFAULT_UNCERTAINTIES = {
+    THERMAL_CONDUCTIVITY: ParameterUncertainty('lognormálne', 0.10),
+    AIR_CHANGE_RATE: ParameterUncertainty('lognormálne', 0.25),
+    SOLAR_RADIATION: ParameterUncertainty('normálne', 0.10),
+}
+
+
+class HeatingDemandModel:
+    """
+    Vektorizovaný model potreby tepla a konečnej energie jednej budovy
+
+    Vstupy výpočtov HeatingCalculations a EnergyCalculations sú stĺpce matice
+    parametrov [vzorka × parameter]; evaluate vyhodnotí všetky riadky naraz.
+    Pri menovitých hodnotách sa výsledky zhodujú so skalárnym výpočtom
+    (až na poradie sčítania). Straty odovzdávania tepla sa počítajú s tou
+    istou vonkajšou teplotou ako potreba tepla.
+    """
+
+    def __init__(self,
+                 building: Building,
+                 climate_data: Optional[ClimateData] = None,
+                 air_change_rate: float = 0.5,
+                 thermal_bridges_delta_u: float = 0.1):
+        climate = building.climate_data if climate_data is None else climate_data
+        store = BuildingStore.from_buildings([building])
+        self.building = building
+
+        names: List[str] = []
+        nominal: List[float] = []
+        self.groups: Dict[str, np.ndarray] = {}
+
+        def add(group: str, labels: Sequence[str], values: Sequence[float]):
+            start = len(names)
+            names.extend(labels)
+            nominal.extend(float(value) for value in values)
+            self.groups[group] = np.arange(start, len(names))
+
+        # Vrstvy a konštrukcie: tepelný odpor R = Σ d / λ po úsekoch vrstiev
+        add(THERMAL_CONDUCTIVITY,
+            [f"{THERMAL_CONDUCTIVITY}[{name}]" for name in store.material_name],
+            store.material_conductivity)
+        self._layer_material = store.layer_material
+        self._layer_thickness = store.layer_thickness
+        # Vrstvy jednej konštrukcie sú v BuildingStore uložené za sebou
+        offsets = store.construction_layer_offsets
+        self._n_constructions = len(offsets) - 1
+        self._layered = np.diff(offsets) > 0
+        self._layer_starts = offsets[:-1][self._layered]
+        self._surface_resistance = store.construction_rsi + store.construction_rse
+        self._construction_ua = BX_BY_CONSTRUCTION_CODE[store.construction_type] * store.construction_area
+        self._window_ua = float(np.sum(store.window_u_value * store.window_area))
+        self._envelope_area = float(store.construction_area.sum() + store.window_area.sum())
+
+        # Vetranie
+        add(AIR_CHANGE_RATE, [AIR_CHANGE_RATE], [air_change_rate])
+        self._volume = float(store.zone_volume.sum())
+
+        # Slnečné žiarenie podľa orientácií klimatických údajov (neznáma = juh)
+        labels, window_orientation = store.window_orientation_codes
+        keys = [label if label in climate.solar_radiation else 'J' for label in labels]
+        solar_keys = sorted(set(keys))
+        key_index = np.array([solar_keys.index(key) for key in keys], dtype=np.int64)
+        self._apertures = np.zeros(len(solar_keys))
+        if len(window_orientation):
+            a_sol = 0.8 * (store.window_shading_factor * store.window_g_value * 0.8 * store.window_area)
+            np.add.at(self._apertures, key_index[window_orientation], a_sol)
+        add(SOLAR_RADIATION, [f"{SOLAR_RADIATION}[{key}]" for key in solar_keys],
+            [climate.solar_radiation[key] for key in solar_keys])
+
+        add(EXTERNAL_TEMPERATURE, [EXTERNAL_TEMPERATURE], [climate.external_temperature])
+        self._heating_days = float(climate.heating_days)
+        self.floor_area = float(store.zone_floor_area.sum())
+        add(INTERNAL_GAINS, [INTERNAL_GAINS], [INTERNAL_GAINS_BY_CODE[store.building_category[0]]])
+        add(THERMAL_BRIDGES, [THERMAL_BRIDGES], [thermal_bridges_delta_u])
+
+        # Vykurovacia sústava (EnergyCalculations)
+        system = building.heating_system
+        add(EMISSION_DELTA_THETA, [EMISSION_DELTA_THETA],
+            [EnergyCalculations.emission_temperature_increase(system)])
+        add(DISTRIBUTION_LOSSES, [DISTRIBUTION_LOSSES], [15.0])  # [kWh/(m.rok)]
+        add(EFFICIENCY, [EFFICIENCY], [system.efficiency if system is not None else 1.0])
+
+        self.parameter_names = names
+        self.nominal = np.array(nominal)
+
+    @property
+    def n_parameters(self) -> int:
+        return len(self.parameter_names)
+
+    def column(self, parameters: np.ndarray, group: str) -> np.ndarray:
+        """Stĺpce skupiny parametrov [vzorka × stĺpec]"""
+        return parameters[:, self.groups[group]]
+
+    def evaluate(self, parameters: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Vyhodnotenie modelu pre všetky riadky matice parametrov
+
+        Args:
+            parameters: pole [vzorka × parameter] v poradí parameter_names
+
+        Returns:
+            slovník polí s jednou hodnotou na vzorku
+        """
+        parameters = np.atleast_2d(np.asarray(parameters, dtype=np.float64))
+        if parameters.shape[1] != self.n_parameters:
+            raise ValueError("Počet stĺpcov nezodpovedá počtu parametrov modelu")
+
+        conductivity = self.column(parameters, THERMAL_CONDUCTIVITY)[:, self._layer_material]
+        if np.any(conductivity <= 0):
+            raise ValueError("Tepelná vodivosť musí byť kladná")
+        resistance = np.zeros((len(parameters), self._n_constructions))
+        if len(self._layer_starts):
+            resistance[:, self._layered] = np.add.reduceat(
+                self._layer_thickness / conductivity, self._layer_starts, axis=1
+            )
+        u_values = 1.0 / (self._surface_resistance + resistance)
+
+        delta_u = self.column(parameters, THERMAL_BRIDGES)[:, 0]
+        ht = u_values @ self._construction_ua + self._window_ua + delta_u * self._envelope_area
+        n = self.column(parameters, AIR_CHANGE_RATE)[:, 0]
+        hv = (0.85 * 1.2 * 1010 * n * self._volume) / 3600
+
+        theta_e = self.column(parameters, EXTERNAL_TEMPERATURE)[:, 0]
+        qht = (ht + hv) * (20.0 - theta_e) * self._heating_days * 0.024
+        qint = self.column(parameters, INTERNAL_GAINS)[:, 0] * 0.024 * self._heating_days * self.floor_area
+        qsol = self.column(parameters, SOLAR_RADIATION) @ self._apertures
+        qh = np.maximum(0.0, qht - 0.95 * (qint + qsol))
+
+        delta_theta = self.column(parameters, EMISSION_DELTA_THETA)[:, 0]
+        emission = qh * (delta_theta / (20.0 + delta_theta - theta_e))
+        distribution = self._volume * 0.1 * self.column(parameters, DISTRIBUTION_LOSSES)[:, 0]
+        final_energy = (qh + emission + distribution) / self.column(parameters, EFFICIENCY)[:, 0]
+
+        return {
+            'total_heat_loss': qht,
+            'total_gains': qint + qsol,
+            'heating_demand': qh,
+            'specific_heating_demand': qh / self.floor_area if self.floor_area > 0 else np.zeros_like(qh),
+            'final_energy': final_energy,
+        }
+
+
+@dataclass
+class UncertaintyResult:
+    """Výsledky simulácie Monte Carlo (jedna hodnota na vzorku)"""
+    samples: Dict[str, np.ndarray]
+    nominal: Dict[str, float]
+    percentiles: Tuple[float, ...] = (5.0, 50.0, 95.0)
+
+    @property
+    def n_samples(self) -> int:
+        return len(next(iter(self.samples.values())))
+
+    def mean(self, key: str = 'heating_demand') -> float:
+        return float(self.samples[key].mean())
+
+    def std(self, key: str = 'heating_demand') -> float:
+        return float(self.samples[key].std(ddof=1))
+
+    def percentile(self, q, key: str = 'heating_demand'):
+        return np.percentile(self.samples[key], q)
+
+    def confidence_interval(self, level: float = 0.9, key: str = 'heating_demand') -> Tuple[float, float]:
+        """Obojstranný interval spoľahlivosti [kWh] alebo [kWh/m²]"""
+        alpha = (1.0 - level) / 2 * 100
+        low, high = np.percentile(self.samples[key], [alpha, 100 - alpha])
+        return float(low), float(high)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Menovitá hodnota, priemer, smerodajná odchýlka a percentily pre každý výstup"""
+        summary = {}
+        for key, values in self.samples.items():
+            row = {'nominal': self.nominal[key], 'mean': float(values.mean()),
+                   'std': float(values.std(ddof=1)) if len(values) > 1 else 0.0}
+            for q, value in zip(self.percentiles, np.percentile(values, self.percentiles)):
+                row[f"p{q:g}"] = float(value)
+            summary[key] = row
+        return summary
+
+
+class MonteCarloAnalysis:
+    """Šírenie neistôt vstupov do potreby tepla metódou Monte Carlo"""
+
+    @staticmethod
+    def sample(model: HeatingDemandModel,
+               uncertainties: Dict[str, ParameterUncertainty],
+               n_samples: int,
+               rng: np.random.Generator) -> np.ndarray:
+        """Matica realizácií vstupov [vzorka × parameter]; ostatné parametre sú menovité"""
+        parameters = np.tile(model.nominal, (n_samples, 1))
+        for group, uncertainty in uncertainties.items():
+            if group not in model.groups:
+                raise KeyError(f"Neznámy parameter: {group}")
+            columns = model.groups[group]
+            parameters[:, columns] = uncertainty.sample(model.nominal[columns], n_samples, rng)
+        return parameters
+
+    @staticmethod
+    def run(building: Building,
+            climate_data: Optional[ClimateData] = None,
+            air_change_rate: float = 0.5,
+            n_samples: int = 10000,
+            uncertainties: Optional[Dict[str, ParameterUncertainty]] = None,
+            seed: Optional[int] = None,
+            percentiles: Sequence[float] = (5.0, 50.0, 95.0)) -> UncertaintyResult:
+        """
+        Args:
+            building: posudzovaná budova
+            climate_data: klimatické údaje (predvolene building.climate_data)
+            air_change_rate: menovitá intenzita výmeny vzduchu [1/h]
+            n_samples: počet realizácií vstupov
+            uncertainties: neistoty podľa skupín parametrov (predvolene DEFAULT_UNCERTAINTIES)
+            seed: počiatočná hodnota generátora náhodných čísel
+            percentiles: vykazované percentily [%]
+
+        Returns:
+            rozdelenia potreby tepla, mernej potreby tepla a konečnej energie
+        """
+        model = HeatingDemandModel(building, climate_data, air_change_rate)
+        rng = np.random.default_rng(seed)
+        parameters = MonteCarloAnalysis.sample(
+            model, DEFAULT_UNCERTAINTIES if uncertainties is None else uncertainties, n_samples, rng
+        )
+        nominal = model.evaluate(model.nominal)
+        return UncertaintyResult(
+            samples=model.evaluate(parameters),
+            nominal={key: float(values[0]) for key, values in nominal.items()},
+            percentiles=tuple(percentiles),
+        )
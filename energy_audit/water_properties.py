@@ -0,0 +1,93 @@
+"""
+Teplotne závislé vlastnosti vody pre hydraulické výpočty
+Predpočítané tabuľky ρ(T), μ(T), cp(T) s lineárnou interpoláciou v konštantnom čase
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+# Rozsah a krok tabuliek [°C]
+TEMPERATURE_MIN = 0.0
+TEMPERATURE_MAX = 120.0
+TEMPERATURE_STEP = 0.5
+
+# Merná tepelná kapacita vody (nasýtená kvapalina) [J/(kg.K)]
+_SPECIFIC_HEAT_REFERENCE = (
+    (0.0, 4217.6), (10.0, 4192.1), (20.0, 4181.8), (30.0, 4178.4), (40.0, 4178.5),
+    (50.0, 4180.6), (60.0, 4184.3), (70.0, 4189.5), (80.0, 4196.3), (90.0, 4205.0),
+    (100.0, 4215.9), (110.0, 4229.0), (120.0, 4245.0),
+)
+
+
+def _density(t: np.ndarray) -> np.ndarray:
+    """Hustota vody podľa Kella (1975) [kg/m³]"""
+    return ((999.83952 + 16.945176 * t - 7.9870401e-3 * t ** 2 - 46.170461e-6 * t ** 3
+             + 105.56302e-9 * t ** 4 - 280.54253e-12 * t ** 5) / (1 + 16.879850e-3 * t))
+
+
+def _viscosity(t: np.ndarray) -> np.ndarray:
+    """Dynamická viskozita vody podľa Vogelovej rovnice [Pa.s]"""
+    return 2.414e-5 * 10 ** (247.8 / (t + 273.15 - 140.0))
+
+
+def _specific_heat(t: np.ndarray) -> np.ndarray:
+    """Merná tepelná kapacita vyrovnaná polynómom 4. stupňa cez tabuľkové hodnoty [J/(kg.K)]"""
+    reference_t, reference_cp = np.array(_SPECIFIC_HEAT_REFERENCE).T
+    coefficients = np.polyfit(reference_t, reference_cp, 4)
+    return np.polyval(coefficients, t)
+
+
+_GRID = np.arange(TEMPERATURE_MIN, TEMPERATURE_MAX + TEMPERATURE_STEP / 2, TEMPERATURE_STEP)
+_TABLES = {
+    'density': _density(_GRID),
+    'viscosity': _viscosity(_GRID),
+    'specific_heat': _specific_heat(_GRID),
+}
+# Smernice medzi uzlami tabuľky (interpolácia bez delenia)
+_SLOPES = {key: np.append(np.diff(values), 0.0) for key, values in _TABLES.items()}
+# Zoznamy pre skalárne vyhľadávanie bez réžie numpy
+_SCALAR_TABLES = {key: (values.tolist(), _SLOPES[key].tolist()) for key, values in _TABLES.items()}
+_LAST_INDEX = len(_GRID) - 1
+
+
+def _lookup(name: str, temperature):
+    """Lineárna interpolácia v tabuľke (teplota mimo rozsahu sa obmedzí na okraj)"""
+    if isinstance(temperature, (int, float)):
+        position = (temperature - TEMPERATURE_MIN) / TEMPERATURE_STEP
+        position = min(max(position, 0.0), float(_LAST_INDEX))
+        index = int(position)
+        values, slopes = _SCALAR_TABLES[name]
+        return values[index] + (position - index) * slopes[index]
+
+    position = (np.asarray(temperature, dtype=np.float64) - TEMPERATURE_MIN) / TEMPERATURE_STEP
+    np.clip(position, 0.0, _LAST_INDEX, out=position)
+    index = position.astype(np.intp)
+    position -= index
+    return _TABLES[name][index] + position * _SLOPES[name][index]
+
+
+def density(temperature):
+    """Hustota vody ρ [kg/m³] pri teplote [°C] (skalár alebo pole)"""
+    return _lookup('density', temperature)
+
+
+def viscosity(temperature):
+    """Dynamická viskozita vody μ [Pa.s] pri teplote [°C] (skalár alebo pole)"""
+    return _lookup('viscosity', temperature)
+
+
+def specific_heat(temperature):
+    """Merná tepelná kapacita vody cp [J/(kg.K)] pri teplote [°C] (skalár alebo pole)"""
+    return _lookup('specific_heat', temperature)
+
+
+def properties(temperature) -> Tuple:
+    """(ρ [kg/m³], μ [Pa.s], cp [J/(kg.K)]) pri teplote [°C]"""
+    return density(temperature), viscosity(temperature), specific_heat(temperature)
+
+
+def mean_temperature(supply_temperature: float, return_temperature: float) -> float:
+    """Stredná teplota vody medzi prívodom a spiatočkou [°C]"""
+    return (supply_temperature + return_temperature) / 2
@@ -0,0 +1,969 @@
+#!/usr/bin/env python3
+"""
+Testy výpočtového jadra energetického auditu (energy_audit)
+"""
+
+import copy
+import io
+import json
+import pickle
+import random
+
+import numpy as np
+import pytest
+
+from energy_audit.models import (
+    Building, BuildingCategory, Zone, Construction, ConstructionType, Layer,
+    Material, Window, ThermalBridge, ClimateData, HeatingSystem, HeatingSystemType,
+    HotWaterSystem, STANDARD_MATERIALS, portfolio_to_dict, portfolio_from_dict
+)
+from energy_audit.calculations import (
+    HeatingCalculations, EnergyCalculations, HydraulicCalculations, CoolingCalculations
+)
+from energy_audit.batch import BatchHeatingCalculations
+from energy_audit.columnar import BuildingStore
+from energy_audit.dynamic import HourlySimulation, HourlyWeather
+from energy_audit.monthly import MonthlyHeatingCalculations
+from energy_audit.retrofit import RetrofitSweep, apply_variant
+from energy_audit.optimizer import (
+    RetrofitOptimizer, insulation_measure, window_replacement_measure,
+    hydraulic_balancing_measure, heating_system_measure
+)
+from energy_audit.uncertainty import HeatingDemandModel, MonteCarloAnalysis, ParameterUncertainty
+from energy_audit.sensitivity import SensitivityAnalysis
+from energy_audit.hydraulics import PipeNetwork, VALVE_CATALOGUE
+from energy_audit.balancing import ValvePresetOptimizer
+from energy_audit import water_properties, psychrometrics
+from energy_audit.pipe_sizing import PipeSizer, PIPE_CATALOGUE
+from energy_audit.cli import run_pipeline, audit_building
+from energy_audit.cache import ResultCache, input_key
+from energy_audit.incremental import IncrementalHeatingModel
+from energy_audit.rts import RadiantTimeSeries, InternalLoads, periodic_convolution, NONSOLAR_RTS
+from energy_audit.performance_maps import PerformanceMap, performance_map, bilinear_interpolation
+from energy_audit import climate as climate_store
+
+
+def create_test_building(seed: int) -> Building:
+    """Náhodná, ale reprodukovateľná budova s viacerými zónami"""
+    rng = random.Random(seed)
+    category = rng.choice(list(BuildingCategory))
+    building = Building(f"Budova {seed}", category)
+    materials = list(STANDARD_MATERIALS.values())
+    construction_types = [ConstructionType.EXTERNAL_WALL, ConstructionType.ROOF,
+                          ConstructionType.FLOOR_ON_GROUND, ConstructionType.FLOOR_ABOVE_UNHEATED]
+
+    for z in range(rng.randint(1, 4)):
+        floor_area = rng.uniform(20, 400)
+        zone = Zone(f"Zóna {z}", floor_area, floor_area * rng.uniform(2.6, 3.2))
+        for c in range(rng.randint(0, 4)):
+            construction = Construction(f"K{z}.{c}", rng.choice(construction_types),
+                                        area=rng.uniform(5, 150))
+            for _ in range(rng.randint(1, 4)):
+                construction.add_layer(rng.choice(materials), rng.uniform(0.01, 0.4))
+            zone.constructions.append(construction)
+        for w in range(rng.randint(0, 5)):
+            zone.windows.append(Window(f"O{z}.{w}", rng.uniform(0.5, 6), rng.uniform(0.8, 2.8),
+                                       g_value=rng.uniform(0.4, 0.8),
+                                       orientation=rng.choice(['S', 'j', 'V', 'Z', 'JV', 'X', ''])))
+        zone.thermal_bridges.append(ThermalBridge("Nadpražie", 0.1, rng.uniform(1, 20)))
+        building.add_zone(zone)
+    return building
+
+
+def test_batch_heating_demand_matches_scalar():
+    buildings = [create_test_building(seed) for seed in range(60)]
+    climate = ClimateData()
+
+    batch = BatchHeatingCalculations.calculate_heating_demand(buildings, climate, 0.5)
+
+    for i, building in enumerate(buildings):
+        scalar = HeatingCalculations.calculate_heating_demand(building, climate, 0.5)
+        for key, value in scalar.items():
+            assert batch[key][i] == value, (key, i)
+
+
+def test_batch_heating_demand_per_building_inputs():
+    buildings = [create_test_building(seed) for seed in range(10)]
+    climates = [ClimateData(external_temperature=2.0 + i * 0.1, heating_days=200 + i)
+                for i in range(len(buildings))]
+    air_change_rates = np.linspace(0.3, 1.2, len(buildings))
+
+    batch = BatchHeatingCalculations.calculate_heating_demand(buildings, climates, air_change_rates)
+
+    for i, building in enumerate(buildings):
+        scalar = HeatingCalculations.calculate_heating_demand(
+            building, climates[i], float(air_change_rates[i])
+        )
+        assert batch['heating_demand'][i] == scalar['heating_demand']
+
+
+def test_building_store_round_trip():
+    buildings = [create_test_building(seed) for seed in range(20)]
+    buildings[0].heating_system = HeatingSystem(HeatingSystemType.FLOOR_HEATING, 45.0, 35.0)
+
+    store = BuildingStore.from_buildings(buildings)
+    restored = store.to_buildings()
+
+    assert restored == buildings
+    assert len(store.material_name) <= len(STANDARD_MATERIALS)
+    layers = [layer for b in restored for z in b.zones for c in z.constructions for layer in c.layers]
+    assert len({id(layer.material) for layer in layers}) == len(store.material_name)
+
+
+def test_building_store_file_round_trip(tmp_path):
+    buildings = [create_test_building(seed) for seed in range(25)]
+    buildings[3].heating_system = HeatingSystem(HeatingSystemType.FLOOR_HEATING, 45.0, 35.0)
+    buildings[4].hot_water_system = HotWaterSystem(storage_volume=150.0)
+    buildings[5].zones[0].name = 'Kúpeľňa ž'
+    store = BuildingStore.from_buildings(buildings)
+    path = tmp_path / 'portfolio.eap'
+    store.save(path)
+
+    opened = BuildingStore.open(path)
+    assert isinstance(opened.layer_thickness, np.memmap)
+    assert not opened.layer_thickness.flags.writeable
+    assert opened.zone_name[len(buildings[0].zones) + len(buildings[1].zones)] == buildings[2].zones[0].name
+    assert opened.to_buildings() == buildings
+
+    # Dávkový výpočet priamo nad súborom
+    climate = ClimateData()
+    np.testing.assert_array_equal(
+        BatchHeatingCalculations.calculate_heating_demand(path, climate, 0.5)['heating_demand'],
+        BatchHeatingCalculations.calculate_heating_demand(store, climate, 0.5)['heating_demand'],
+    )
+
+
+def test_building_dict_round_trip():
+    building = create_test_building(7)
+    building.heating_system = HeatingSystem(HeatingSystemType.RADIATOR, 70.0, 55.0, hydraulic_adjustment=True)
+    building.hot_water_system = HotWaterSystem(storage_volume=200.0)
+    building.climate_data = ClimateData(monthly_solar_radiation={'J': [20.0] * 12})
+
+    data = json.loads(json.dumps(building.to_dict()))
+    restored = Building.from_dict(data)
+    assert restored == building
+    assert restored.to_dict() == data
+    assert HeatingCalculations.calculate_heating_demand(restored, restored.climate_data, 0.5) == \
+        HeatingCalculations.calculate_heating_demand(building, building.climate_data, 0.5)
+
+    # Materiály zdieľané vrstvami aj budovami portfólia sa načítajú ako jedna inštancia
+    buildings = [create_test_building(seed) for seed in range(15)]
+    restored = portfolio_from_dict(json.loads(json.dumps(portfolio_to_dict(buildings))))
+    assert restored == buildings
+    layers = [layer for b in restored for z in b.zones for c in z.constructions for layer in c.layers]
+    assert len({id(layer.material) for layer in layers}) <= len(STANDARD_MATERIALS)
+
+    # Načítané vrstvy sledujú zmeny materiálu (zneplatnenie uloženého odporu)
+    construction = next(c for b in restored for z in b.zones for c in z.constructions)
+    u_value = construction.u_value()
+    construction.layers[0].material.thermal_conductivity *= 2
+    assert construction.u_value() > u_value
+
+    data['schema_version'] = 99
+    with pytest.raises(ValueError):
+        Building.from_dict(data)
+    for invalid in ([1, 2], None, "x"):
+        with pytest.raises(ValueError):
+            Building.from_dict(invalid)
+
+
+def test_cli_pipeline_streams_in_input_order():
+    buildings = [create_test_building(seed) for seed in range(40)]
+    for building in buildings[::3]:
+        building.heating_system = HeatingSystem(HeatingSystemType.RADIATOR, 70.0, 55.0)
+    lines = [json.dumps(building.to_dict()) + '\n' for building in buildings]
+    lines.insert(5, '{"schema_version": 1}\n')
+    # Platný JSON, ktorý nie je objekt, ani budova s poškodenou štruktúrou nepreruší prúd
+    invalid = ['[1, 2]\n', 'null\n', '"x"\n', '{"schema_version": 1, "materials": [], "zones": [1]}\n']
+    lines[20:20] = invalid
+
+    serial, parallel = io.StringIO(), io.StringIO()
+    assert run_pipeline(lines, serial, workers=0, chunk_size=7, audit_date='2024-01-01') == 45
+    run_pipeline(lines, parallel, workers=2, chunk_size=3, max_pending=2, audit_date='2024-01-01')
+    assert parallel.getvalue() == serial.getvalue()
+
+    records = [json.loads(line) for line in serial.getvalue().splitlines()]
+    assert all('error' in record for record in records[20:24])
+    assert records[20]['error'].startswith('ValueError')
+    del records[20:24]
+    assert 'error' in records[5]
+    del records[5]
+    for building, record in zip(buildings, records):
+        expected = audit_building(building, audit_date='2024-01-01').export_to_dict()
+        assert record == json.loads(json.dumps(expected))
+    assert records[0]['hydraulic_balancing']['zone_results']
+
+
+def test_result_cache_tiers_and_eviction(tmp_path):
+    climate = ClimateData()
+    building = create_test_building(4)
+    renamed = copy.deepcopy(building)
+    renamed.name = 'Iný názov'
+    assert input_key('heating_demand', renamed, climate) == input_key('heating_demand', building, climate)
+    changed = copy.deepcopy(building)
+    changed.zones[0].floor_area += 1.0
+    assert input_key('heating_demand', changed, climate) != input_key('heating_demand', building, climate)
+
+    path = str(tmp_path / 'cache.sqlite')
+    with ResultCache(max_entries=2, path=path) as cache:
+        first = cache.calculate_heating_demand(building, climate, 0.5)
+        assert first == HeatingCalculations.calculate_heating_demand(building, climate, 0.5)
+        first['heating_demand'] = -1.0  # úprava vráteného výsledku neovplyvní uložený
+        assert cache.calculate_heating_demand(renamed, climate, 0.5)['heating_demand'] > 0
+        cache.calculate_hot_water_demand(building)
+        cache.calculate_heating_demand(building, climate, 0.7)
+        assert (cache.statistics.misses, cache.statistics.memory_hits) == (3, 1)
+
+    # Nová inštancia (prázdna pamäť) číta z disku
+    with ResultCache(path=path) as cache:
+        cache.calculate_heating_demand(building, climate, 0.5)
+        assert cache.statistics.disk_hits == 1
+        assert cache.statistics.hit_rate == 1.0
+
+    # Limit veľkosti: najdlhšie nepoužité záznamy sa odstránia
+    with ResultCache(path=str(tmp_path / 'small.sqlite'), max_disk_bytes=1500) as cache:
+        for seed in range(10):
+            cache.calculate_heating_demand(create_test_building(seed), climate, 0.5)
+        assert 0 < cache.disk_size <= 1500
+        assert cache.statistics.evictions > 0
+
+
+def test_incremental_model_recomputes_only_changed_zones():
+    building = copy.deepcopy(create_test_building(0))  # vlastné kópie štandardných materiálov
+    building.zones = copy.deepcopy([zone for seed in range(30) for zone in create_test_building(seed).zones])
+    model = IncrementalHeatingModel(building)
+
+    def assert_matches_full_calculation():
+        results = model.results()
+        full = HeatingCalculations.calculate_heating_demand(building, building.climate_data, 0.5)
+        for key, value in full.items():
+            assert np.isclose(results[key], value, rtol=1e-12), key
+
+    assert_matches_full_calculation()
+    assert model.zone_updates == len(building.zones)
+
+    zone = next(i for i, z in enumerate(building.zones) if z.windows)
+    building.zones[zone].windows[0].u_value = 0.7
+    assert model.dirty_zones == {zone}
+    assert_matches_full_calculation()
+    assert model.zone_updates == len(building.zones) + 1
+
+    # Vrstva aj materiál sa oznamujú cez konštrukciu
+    layer = next(c for z in building.zones for c in z.constructions).layers[0]
+    layer.thickness *= 2
+    assert len(model.dirty_zones) == 1
+    assert_matches_full_calculation()
+    layer.material.thermal_conductivity *= 0.5
+    assert_matches_full_calculation()
+
+    # Zmeny zoznamov na mieste sa zistia pri čítaní výsledkov
+    building.zones[-1].windows.append(Window('Nové okno', 3.0, 1.0, orientation='J'))
+    building.add_zone(Zone('Prístavba', 40.0, 110.0))
+    assert_matches_full_calculation()
+
+
+def test_incremental_model_detects_in_place_replacement():
+    building = copy.deepcopy(create_test_building(0))
+    building.zones = copy.deepcopy([zone for seed in range(10) for zone in create_test_building(seed).zones])
+    model = IncrementalHeatingModel(building)
+    model.results()
+
+    def assert_matches_full_calculation():
+        full = HeatingCalculations.calculate_heating_demand(building, building.climate_data, 0.5)
+        assert np.isclose(model.results()['heating_demand'], full['heating_demand'], rtol=1e-12)
+
+    # Nahradenie okna a konštrukcie na mieste (rovnaký počet prvkov zóny)
+    zone = next(z for z in building.zones if z.windows)
+    replaced = zone.windows[0]
+    zone.windows[0] = Window('Náhrada', 5.0, 2.8, orientation='J')
+    assert_matches_full_calculation()
+    zone = next(z for z in building.zones if z.constructions)
+    construction = Construction('Náhrada', ConstructionType.ROOF, area=80.0)
+    construction.add_layer(Material('EPS', 0.04), 0.05)
+    zone.constructions[0] = construction
+    assert_matches_full_calculation()
+
+    # Nové prvky sa sledujú, nahradené už nie
+    construction.layers[0].thickness = 0.2
+    assert len(model.dirty_zones) == 1
+    assert_matches_full_calculation()
+    replaced.u_value = 0.5
+    assert not model.dirty_zones
+
+
+def test_climate_store_nearest_station_and_shared_series(tmp_path):
+    climate_store.create_slovak_store(tmp_path)
+    store = climate_store.open_store(tmp_path)
+    assert climate_store.open_store(str(tmp_path)) is store
+
+    assert store.nearest(48.31, 17.27).station_id == 'bratislava'
+    assert store.nearest(48.95, 20.95).station_id == 'košice'
+    assert store.nearest(49.06, 18.92).station_id == 'žilina'
+    distance = climate_store.haversine_distance(48.1486, 17.1077, [48.7164], [21.2611])
+    assert distance[0] == pytest.approx(310, abs=10)  # Bratislava - Košice [km]
+
+    # Rady sú namapované float32 a budovy v jednom meste zdieľajú jeden objekt
+    series = store.series('žilina')
+    assert isinstance(series.data, np.memmap) and series.data.dtype == np.float32
+    assert series.temperature.shape == (8760,)
+    assert store.series('žilina') is series
+    assert store.climate_data_near(49.2, 18.7) is store.climate_data_near(49.25, 18.8)
+
+    climate = store.climate_data('žilina')
+    daily = series.temperature.astype(float).reshape(365, 24).mean(axis=1)
+    assert climate.heating_days == np.count_nonzero(daily <= 13.0)
+    assert climate.degree_days == pytest.approx(np.sum(20.0 - daily[daily <= 13.0]), rel=1e-6)
+    assert climate.monthly_temperatures[0] < 0 < climate.monthly_temperatures[6]
+    assert np.allclose(series.hourly_weather().irradiance('JV'), series.irradiance('jv'))
+
+    building = create_test_building(7)
+    result = HeatingCalculations.calculate_heating_demand(building, climate, 0.5)
+    assert result['heating_demand'] > 0
+
+    # Tabuľky pre chladenie sa odvodzujú zo staníc úložiska (rovnaké kľúče lokalít)
+    from cooling_analysis_tool import CoolingAnalyzer
+    from energy_audit.calculations import SLOVAK_COOLING_DATA
+    station_ids = [station.station_id for station in store.stations]
+    assert list(SLOVAK_COOLING_DATA) == station_ids
+    assert list(CoolingAnalyzer().slovak_climate_data) == station_ids
+    analyzer = CoolingAnalyzer(stations=store.stations)
+    assert analyzer.slovak_climate_data['košice']['design_temp_C'] == store.station('košice').design_cooling_temperature
+    assert SLOVAK_COOLING_DATA['žilina']['relative_humidity_percent'] == 70
+
+
+def test_rts_cooling_load_design_day_and_year():
+    buildings = [create_test_building(seed) for seed in range(12)]
+    design_day = RadiantTimeSeries.design_day(32.0, 11.0)
+    result = RadiantTimeSeries.calculate(buildings, design_day)
+
+    # Periodický ustálený stav: akumulácia posúva záťaž v čase, denný súčet sa zachová
+    assert np.allclose(result.cooling_load.sum(axis=0), result.heat_gain.sum(axis=0))
+    assert np.all(result.peak_cooling_load() <= result.peak_heat_gain() + 1e-9)
+    assert np.allclose(sum(result.component_loads.values()), result.building_loads(result.cooling_load))
+    assert set(result.component_loads) == {'osoby', 'osvetlenie', 'zariadenia', 'slnko', 'prechod_tepla'}
+
+    # Impulz zisku osvetlenia o 12:00: konvekčná časť okamžite, radiačná podľa RTS
+    impulse = [0.0] * 24
+    impulse[12] = 1.0
+    loads = InternalLoads(people_per_area=0.0, equipment_power=0.0, lighting_power=1.0,
+                          lighting_schedule=impulse)
+    empty = Building("Prázdna", BuildingCategory.OFFICE_BUILDING, zones=[Zone("Z", 100.0, 300.0)])
+    lighting = RadiantTimeSeries.calculate([empty], design_day, loads).component_loads['osvetlenie'][:, 0]
+    rts = np.asarray(NONSOLAR_RTS['stredná']) / 100
+    expected = 100.0 * (0.5 * np.roll(rts, 12))
+    expected[12] += 100.0 * 0.5
+    assert np.allclose(lighting, expected)
+
+    # Celý rok (FFT) zodpovedá priamemu výpočtu periodickej konvolúcie
+    series = np.random.default_rng(1).random((8760, 3))
+    kernel = np.random.default_rng(2).random(30)
+    direct = sum(kernel[j] * np.roll(series, j, axis=0) for j in range(30))
+    assert np.allclose(periodic_convolution(series, kernel), direct)
+
+    weather = HourlyWeather.synthetic()
+    annual = RadiantTimeSeries.calculate(BuildingStore.from_buildings(buildings), weather)
+    assert annual.cooling_load.shape == (8760, sum(len(b.zones) for b in buildings))
+    assert np.allclose(annual.cooling_load.sum(axis=0), annual.heat_gain.sum(axis=0))
+    assert np.all(annual.annual_cooling_demand() > 0)
+
+
+def test_performance_map_bilinear_lookup_and_hourly_operation():
+    x_grid, y_grid = [20.0, 30.0, 45.0], [0.1, 0.5, 1.0]
+    table = np.array([[1.0, 2.0, 3.0], [4.0, 6.0, 5.0], [2.0, 2.5, 1.0]])
+    # Uzly mriežky, stred bunky, obmedzenie mimo rozsahu
+    assert bilinear_interpolation(x_grid, y_grid, table, 30.0, 0.5) == pytest.approx(6.0)
+    assert bilinear_interpolation(x_grid, y_grid, table, 25.0, 0.3) == pytest.approx((1 + 2 + 4 + 6) / 4)
+    assert bilinear_interpolation(x_grid, y_grid, table, 60.0, 0.0) == pytest.approx(2.0)
+
+    # Vektorizované vyhľadanie [hodina × zóna] zodpovedá bodovému
+    rng = np.random.default_rng(4)
+    temperature = rng.uniform(15, 50, (48, 5))
+    part_load = rng.uniform(0, 1.2, (48, 5))
+    values = bilinear_interpolation(x_grid, y_grid, table, temperature, part_load)
+    expected = [bilinear_interpolation(x_grid, y_grid, table, t, p) for t, p in zip(temperature.flat, part_load.flat)]
+    assert values.shape == (48, 5) and np.allclose(values.ravel(), expected)
+
+    # Menovitý bod, pokles EER s teplotou a výkon obmedzený dostupnou kapacitou
+    vrf = performance_map('VRF')
+    assert vrf.eer(3.6, 35.0, 1.0) == pytest.approx(3.6)
+    assert vrf.eer(3.6, 25.0, 1.0) > 3.6 > vrf.eer(3.6, 40.0, 1.0)
+    assert performance_map('neznámy') is performance_map('split')
+    operation = vrf.operate(10000.0, 3.6, [0.0, 5000.0, 12000.0], [25.0, 35.0, 40.0])
+    assert np.allclose(operation['delivered_W'], [0.0, 5000.0, 9500.0])
+    assert np.allclose(operation['unmet_W'], [0.0, 0.0, 2500.0])
+    assert np.allclose(operation['electrical_power_W'] * operation['eer'], operation['delivered_W'])
+    with pytest.raises(ValueError):
+        PerformanceMap([20.0, 35.0], [0.5, 1.0], [1.0, 1.0], np.ones((3, 2)))
+
+    # Sezónna spotreba z hodinovej záťaže metódy RTS
+    weather = HourlyWeather.synthetic()
+    loads = RadiantTimeSeries.calculate([create_test_building(3)], weather)
+    hourly = loads.building_loads(loads.cooling_load + loads.latent_load)[:, 0]
+    season = vrf.operate(hourly.max(), 3.6, hourly, weather.temperature)
+    assert season['unmet_W'].sum() == pytest.approx(0.0, abs=1e-6)
+    seasonal_eer = season['delivered_W'].sum() / season['electrical_power_W'].sum()
+    assert 3.6 < seasonal_eer < 3.6 * 1.5 * 1.3
+
+
+def test_cooling_lifecycle_cost_matches_year_loop():
+    from cooling_analysis_tool import CoolingAnalyzer, CoolingSystem, present_value_factor
+
+    # Anuitný faktor v uzavretom tvare = súčet diskontovaných rokov
+    rates = np.array([0.0, 0.03, 0.08])
+    years = np.array([1, 12, 30])
+    for r in rates:
+        for n in years:
+            for g in (0.0, 0.02, r):
+                loop = sum((1 + g) ** (y - 1) / (1 + r) ** y for y in range(1, n + 1))
+                assert present_value_factor(r, n, g) == pytest.approx(loop)
+    assert present_value_factor(rates[:, None], years[None, :]).shape == (3, 3)
+
+    analyzer = CoolingAnalyzer()
+    systems = [
+        CoolingSystem("Split", "split", 60, 20, 3.2, 15000, 800),
+        CoolingSystem("VRF", "VRF", 80, 22, 3.6, 35000, 1200),
+        CoolingSystem("Chiller", "chiller", 80, 20, 4.0, 45000, 2000),
+        CoolingSystem("VRF 2", "VRF", 50, 15, 4.1, 30000, 900),
+    ]
+    load = 70000.0
+    table = analyzer.lifecycle_cost_analysis(systems, load, [0.02, 0.05], [0.15, 0.25], [15, 20])
+    assert len(table) == len(systems) * 8
+
+    for system in systems:
+        performance = analyzer.calculate_system_performance(system, load)
+        row = table[(table['Systém'] == system.name) & (table['Diskontná sadzba [-]'] == 0.05)
+                    & (table['Cena elektriny [€/kWh]'] == 0.25) & (table['Obdobie [roky]'] == 15)]
+        annual = performance['annual_energy_kWh'] * 0.25 + system.annual_maintenance_cost_eur
+        lcc = system.installation_cost_eur + sum(annual / 1.05 ** y for y in range(1, 16))
+        assert row['Ročná spotreba [kWh]'].item() == pytest.approx(performance['annual_energy_kWh'])
+        assert row['LCC [€]'].item() == pytest.approx(lcc)
+
+    # Pôvodná tabuľka: jeden scenár (4 %, 20 rokov, cena elektriny 0,18 €/kWh)
+    summary = analyzer.economic_analysis(systems, load)
+    assert list(summary['Systém']) == [system.name for system in systems]
+    for system, lcc in zip(systems, summary['LCC 20 rokov [€]']):
+        annual = analyzer.calculate_system_performance(system, load)['total_annual_cost_eur']
+        assert lcc == pytest.approx(system.installation_cost_eur + sum(annual / 1.04 ** y for y in range(1, 21)),
+                                    abs=0.01)
+
+
+def test_cooling_scenario_grid_matches_single_runs(tmp_path):
+    from cooling_analysis_tool import BuildingParameters, CoolingAnalyzer, CoolingSystem, ScenarioGridResult
+
+    analyzer = CoolingAnalyzer()
+    buildings = [
+        BuildingParameters(f"Budova {i}", 200 + 150 * i, 20 + 10 * i, 10 + 5 * i, 2000, 3000 + 500 * i,
+                           0.3, 0.2, 1.1, 0.6, internal_temp_C=23 + i % 3, internal_relative_humidity=0.45)
+        for i in range(5)
+    ]
+    locations = ["bratislava", "košice", "žilina"]
+    systems = [
+        CoolingSystem("Split", "split", 20, 7, 3.2, 8000, 300),
+        CoolingSystem("VRF", "VRF", 40, 11, 3.6, 25000, 900),
+        CoolingSystem("Chiller", "chiller", 60, 15, 4.0, 40000, 1500),
+        CoolingSystem("VRF 2", "VRF", 15, 4, 4.1, 12000, 400),
+    ]
+    path = tmp_path / "grid.npz"
+    result = analyzer.run_scenario_grid(buildings, locations, systems, output_path=str(path))
+    assert result.shape == (5, 3, 4)
+
+    for b, building in enumerate(buildings):
+        for l, location in enumerate(locations):
+            load = analyzer.calculate_cooling_load(building, location)['total_cooling_W']
+            assert result.values['cooling_load_W'][b, l, 0] == pytest.approx(load)
+            for s, system in enumerate(systems):
+                performance = analyzer.calculate_system_performance(system, load, location)
+                assert result.values['annual_energy_kWh'][b, l, s] == pytest.approx(performance['annual_energy_kWh'])
+                assert result.values['unmet_cooling_kWh'][b, l, s] == pytest.approx(performance['unmet_cooling_kWh'])
+                lcc = system.installation_cost_eur + sum(
+                    performance['total_annual_cost_eur'] / 1.04 ** y for y in range(1, 21))
+                assert result.values['lcc_eur'][b, l, s] == pytest.approx(lcc)
+
+    # Stĺpcový súbor a paralelný výpočet po blokoch budov
+    loaded = ScenarioGridResult.load(str(path))
+    # Cesta bez prípony: np.savez doplní .npz, load ju doplní tiež
+    stem = tmp_path / "grid_bez_pripony"
+    analyzer.run_scenario_grid(buildings[:2], locations, systems, output_path=str(stem))
+    assert (tmp_path / "grid_bez_pripony.npz").exists()
+    assert ScenarioGridResult.load(str(stem)).shape == (2, 3, 4)
+    assert result.save(stem) == str(stem) + ".npz"
+    assert (loaded.buildings, loaded.locations, loaded.systems) == (result.buildings, result.locations, result.systems)
+    frame = loaded.to_frame()
+    assert len(frame) == 60 and frame['Lokalita'].iloc[4] == "košice"
+    parallel = analyzer.run_scenario_grid(buildings, locations, systems, workers=2, chunk_size=2)
+    for key, value in result.values.items():
+        np.testing.assert_array_equal(loaded.values[key], value)
+        assert np.allclose(parallel.values[key], value, rtol=1e-12)
+
+
+def test_batch_heating_demand_on_store():
+    buildings = [create_test_building(seed) for seed in range(30)]
+    climate = ClimateData()
+    store = BuildingStore.from_buildings(buildings)
+
+    from_store = BatchHeatingCalculations.calculate_heating_demand(store, climate, 0.6)
+    from_list = BatchHeatingCalculations.calculate_heating_demand(buildings, climate, 0.6)
+
+    np.testing.assert_array_equal(from_store['heating_demand'], from_list['heating_demand'])
+
+
+def test_construction_u_value_cache_invalidation():
+    brick = Material('Tehla', 0.8)
+    insulation = Material('EPS', 0.04)
+    wall = Construction('Stena', ConstructionType.EXTERNAL_WALL, area=10.0)
+    wall.add_layer(brick, 0.3)
+
+    def expected():
+        return 1.0 / (wall.rsi + sum(l.thickness / l.material.thermal_conductivity
+                                     for l in wall.layers) + wall.rse)
+
+    Construction.reset_cache_info()
+    assert wall.u_value() == expected()
+    assert wall.u_value() == expected()
+    assert Construction.cache_info() == {'hits': 1, 'misses': 1}
+
+    wall.add_layer(insulation, 0.1)
+    assert wall.u_value() == expected()
+    wall.layers[1].thickness = 0.2
+    assert wall.u_value() == expected()
+    insulation.thermal_conductivity = 0.032
+    assert wall.u_value() == expected()
+    wall.layers[0].material = Material('Pórobetón', 0.19)
+    assert wall.u_value() == expected()
+    brick.thermal_conductivity = 0.5  # už nie je súčasťou steny
+    wall.rse = 0.0
+    assert wall.u_value() == expected()
+    assert Construction.cache_info()['misses'] == 6
+
+
+def test_construction_cache_detects_in_place_layer_replacement():
+    wall = Construction('Stena', ConstructionType.EXTERNAL_WALL, area=10.0)
+    wall.add_layer(Material('Tehla', 0.8), 0.3)
+    wall.add_layer(Material('EPS', 0.04), 0.1)
+
+    def expected():
+        return 1.0 / (wall.rsi + sum(l.thickness / l.material.thermal_conductivity
+                                     for l in wall.layers) + wall.rse)
+
+    assert wall.u_value() == expected()
+    replaced = wall.layers[1]
+    wall.layers[1] = Layer(Material('Omietka', 0.7), 0.02)
+    assert wall.u_value() == expected()
+    wall.layers[1].thickness = 0.05  # nahradená vrstva sa sleduje
+    assert wall.u_value() == expected()
+
+    wall.layers.append(wall.layers.pop(0))  # rovnaký počet vrstiev
+    wall.layers.pop()
+    wall.layers.append(Layer(Material('Pórobetón', 0.19), 0.3))
+    assert wall.u_value() == expected()
+    assert replaced.__dict__.get('_observers') == {}  # odobratá vrstva už konštrukciu neoznamuje
+
+
+def test_construction_registers_observers_lazily():
+    brick = Material('Tehla', 0.8)
+    wall = Construction('Stena', ConstructionType.EXTERNAL_WALL, area=10.0)
+    wall.add_layer(brick, 0.3)
+    assert not brick.__dict__.get('_observers')  # vytvorenie modelu nič neregistruje
+
+    u = wall.u_value()
+    assert wall.u_value() == u
+    brick.thermal_conductivity = 0.4
+    assert wall.u_value() == 1.0 / (0.13 + 0.3 / 0.4 + 0.04)
+
+
+def test_construction_cache_survives_copy_and_pickle():
+    wall = Construction('Stena', ConstructionType.EXTERNAL_WALL, area=10.0)
+    wall.add_layer(Material('Tehla', 0.8), 0.3)
+    wall.u_value()
+
+    for clone in (copy.deepcopy(wall), pickle.loads(pickle.dumps(wall))):
+        assert clone == wall
+        clone.layers[0].material.thermal_conductivity = 0.4
+        assert clone.u_value() == 1.0 / (0.13 + 0.3 / 0.4 + 0.04)
+    assert wall.u_value() == 1.0 / (0.13 + 0.3 / 0.8 + 0.04)
+
+
+def test_hourly_simulation_reaches_steady_state():
+    building = create_test_building(3)
+    hours = 500
+    weather = HourlyWeather(temperature=np.zeros(hours))
+
+    result = HourlySimulation.simulate([building], weather, air_change_rate=0.5)
+
+    ht = HeatingCalculations.calculate_transmission_heat_loss_coefficient(building)
+    hv = HeatingCalculations.calculate_ventilation_heat_loss_coefficient(building, 0.5)
+    internal = BatchHeatingCalculations.calculate_zone_internal_gains([building]).sum()
+    steady_load = (ht + hv) * 20.0 - internal
+
+    assert result.heating_load.shape == (hours, len(building.zones))
+    assert np.isclose(result.building_loads(result.heating_load)[-1, 0], steady_load)
+    assert result.cooling_load.sum() == 0.0
+
+
+def test_monthly_utilization_factor():
+    eta = MonthlyHeatingCalculations.calculate_utilization_factor(
+        np.array([0.0, 0.5, 1.0, 2.0]), np.array([15.0, 0.0, 15.0, 15.0])
+    )
+    assert np.allclose(eta, [1.0, 2 / 3, 2 / 3, 3 / 7])
+
+
+def test_monthly_heating_demand_batch_and_scalar():
+    buildings = [create_test_building(seed) for seed in range(8)]
+    climate = ClimateData()
+
+    batch = MonthlyHeatingCalculations.calculate_heating_demand(buildings, climate, 0.5)
+    assert batch['heating_demand'].shape == (len(buildings), 12)
+    assert np.allclose(batch['heating_demand'].sum(axis=1), batch['annual_heating_demand'])
+
+    single = HeatingCalculations.calculate_heating_demand_monthly(buildings[2], climate, 0.5)
+    assert np.allclose(single['heating_demand'], batch['heating_demand'][2])
+    # v zime sa takmer všetky zisky využijú, v lete len malá časť
+    assert single['utilization_factor'][0] > single['utilization_factor'][6]
+
+
+def test_retrofit_sweep_matches_rebuilt_buildings():
+    buildings = [create_test_building(seed) for seed in range(12)]
+    climate = ClimateData()
+    sweep = RetrofitSweep(buildings, climate,
+                          insulation_thicknesses=[0.0, 0.1, 0.2],
+                          window_options=[(None, None), (0.9, 0.5)],
+                          air_change_rates=[0.3, 0.6])
+
+    results = sweep.results()
+    assert results.heating_demand.shape == (12, 12)
+
+    for b_idx in (0, 4, 11):
+        for v_idx, variant in enumerate(sweep.variants):
+            expected = HeatingCalculations.calculate_heating_demand(
+                apply_variant(buildings[b_idx], variant), climate, variant.air_change_rate
+            )['heating_demand']
+            assert np.isclose(results.heating_demand[b_idx, v_idx], expected, rtol=1e-12)
+
+    parallel = sweep.results(workers=2)
+    np.testing.assert_array_equal(parallel.heating_demand, results.heating_demand)
+
+    # Chýbajúca orientácia bez náhradnej 'J' je chyba ako v skalárnom výpočte
+    with pytest.raises(KeyError):
+        RetrofitSweep(buildings, ClimateData(solar_radiation={'S': 300}))
+
+
+def test_emission_losses_with_hydraulic_balancing():
+    increase = EnergyCalculations.emission_temperature_increase
+    assert increase(None) == 1.2
+    assert increase(HeatingSystem(HeatingSystemType.RADIATOR, 70.0, 55.0)) == 1.2
+    assert increase(HeatingSystem(HeatingSystemType.RADIATOR, 70.0, 55.0, hydraulic_adjustment=True)) \
+        == pytest.approx(0.8)
+    assert increase(HeatingSystem(HeatingSystemType.FLOOR_HEATING, 45.0, 35.0)) == 0.5
+    assert increase(HeatingSystem(HeatingSystemType.FLOOR_HEATING, 45.0, 35.0, hydraulic_adjustment=True)) \
+        == pytest.approx(0.1)
+
+    # Vyregulovaná radiátorová sústava: Qem,ls = QH Δθ / (20 + Δθ - θe), Δθ = 0,8 K
+    building = create_test_building(2)
+    building.heating_system = HeatingSystem(HeatingSystemType.RADIATOR, 70.0, 55.0, hydraulic_adjustment=True)
+    theta_e = building.climate_data.external_temperature
+    assert EnergyCalculations.calculate_emission_losses(building, 10000.0) == \
+        pytest.approx(10000.0 * 0.8 / (20.8 - theta_e))
+    building.heating_system.hydraulic_adjustment = False
+    assert EnergyCalculations.calculate_emission_losses(building, 10000.0) == \
+        pytest.approx(10000.0 * 1.2 / (21.2 - theta_e))
+
+
+def test_retrofit_optimizer_pareto_front_matches_brute_force():
+    import itertools
+
+    building = create_test_building(5)
+    building.heating_system = HeatingSystem(HeatingSystemType.RADIATOR, 75.0, 60.0, efficiency=0.8)
+    measures = [
+        insulation_measure(building, ConstructionType.EXTERNAL_WALL, 0.10, 45.0),
+        insulation_measure(building, ConstructionType.EXTERNAL_WALL, 0.20, 60.0),
+        insulation_measure(building, ConstructionType.ROOF, 0.25, 35.0),
+        window_replacement_measure(building, 0.9, 0.5, 250.0),
+        window_replacement_measure(building, 0.7, 0.45, 320.0),
+        hydraulic_balancing_measure(1500.0),
+        heating_system_measure(0.95, 6000.0),
+        heating_system_measure(1.05, 9000.0, name="Kondenzačný kotol"),
+        insulation_measure(building, ConstructionType.EXTERNAL_WALL, 0.03, 25.0, name="Omietka"),
+    ]
+    measures[-1].group = "omietka"  # mení tie isté steny ako zateplenie (kombinácie sa prepočítajú)
+    optimizer = RetrofitOptimizer(building, measures)
+    front = optimizer.optimize()
+
+    # Úplné prehľadanie všetkých prípustných kombinácií
+    groups = optimizer.groups
+    baseline = optimizer.final_energy(building)
+    points = []
+    for choice in itertools.product(*[[None] + group for group in groups]):
+        selected = [m for m in choice if m is not None]
+        modified = copy.deepcopy(building)
+        for measure in selected:
+            measure.apply(modified)
+        points.append((sum(m.investment_cost for m in selected), baseline - optimizer.final_energy(modified)))
+    expected = sorted({(c, s) for c, s in points
+                       if not any(c2 <= c and s2 >= s and (c2, s2) != (c, s) for c2, s2 in points)})
+
+    assert len(front) == len(expected)
+    assert np.allclose([(p.investment_cost, p.annual_savings_kwh) for p in front], expected)
+    assert optimizer.statistics.evaluations < len(points)
+    assert optimizer.statistics.cache_hits > 0
+    assert all(a.annual_savings_kwh < b.annual_savings_kwh for a, b in zip(front, front[1:]))
+
+
+def test_heating_demand_model_nominal_matches_scalar():
+    for seed in range(10):
+        building = create_test_building(seed)
+        building.heating_system = HeatingSystem(HeatingSystemType.RADIATOR, 75.0, 60.0, efficiency=0.8,
+                                                hydraulic_adjustment=seed % 2 == 1)
+        if seed % 3 == 0:  # konštrukcia bez vrstiev (len povrchové odpory)
+            building.zones[0].constructions.insert(
+                0, Construction('Dvere', ConstructionType.EXTERNAL_WALL, area=2.0))
+        model = HeatingDemandModel(building, air_change_rate=0.7)
+        nominal = model.evaluate(model.nominal)
+
+        qh = HeatingCalculations.calculate_heating_demand(building, building.climate_data, 0.7)['heating_demand']
+        final_energy = (qh + EnergyCalculations.calculate_emission_losses(building, qh)
+                        + EnergyCalculations.calculate_distribution_losses(building)) / 0.8
+        assert np.isclose(nominal['heating_demand'][0], qh, rtol=1e-12)
+        assert np.isclose(nominal['final_energy'][0], final_energy, rtol=1e-12)
+
+
+def test_monte_carlo_percentiles():
+    building = create_test_building(7)
+    result = MonteCarloAnalysis.run(building, n_samples=10000, seed=42)
+
+    assert result.n_samples == 10000
+    summary = result.summary()['heating_demand']
+    assert summary['p5'] < summary['p50'] < summary['p95']
+    assert np.isclose(summary['p50'], summary['nominal'], rtol=0.05)
+    low, high = result.confidence_interval(0.9)
+    assert np.isclose(low, summary['p5']) and np.isclose(high, summary['p95'])
+
+    # Bez neistôt sú všetky realizácie rovné menovitej hodnote
+    exact = MonteCarloAnalysis.run(building, n_samples=10, uncertainties={
+        'air_change_rate': ParameterUncertainty('rovnomerné', 0.0)})
+    assert np.allclose(exact.samples['heating_demand'], summary['nominal'])
+
+
+def test_sensitivity_rankings():
+    building = create_test_building(4)
+    building.heating_system = HeatingSystem(HeatingSystemType.RADIATOR, 75.0, 60.0, efficiency=0.8)
+    analysis = SensitivityAnalysis(building, output='final_energy')
+
+    morris = analysis.morris(trajectories=50, seed=1)
+    assert [index.rank for index in morris] == list(range(1, analysis.n_parameters + 1))
+    assert all(a.mu_star >= b.mu_star for a, b in zip(morris, morris[1:]))
+
+    sobol = analysis.sobol(n_samples=4096, seed=1)
+    assert sobol[0].parameter == morris[0].parameter
+    # Model je takmer aditívny: súčet indexov prvého rádu ≈ 1
+    assert np.isclose(sum(index.first_order for index in sobol), 1.0, atol=0.1)
+
+    parallel = analysis.sobol(n_samples=4096, seed=1, workers=2)
+    assert SensitivityAnalysis.to_table(parallel) == SensitivityAnalysis.to_table(sobol)
+
+
+def test_pipe_network_single_loop():
+    network = PipeNetwork()
+    network.add_node('spiatočka', pressure=0.0)
+    network.add_node('prívod', pressure=10000.0)
+    network.add_node('A')
+    network.add_node('B')
+    network.add_pipe('P', 'prívod', 'A', 20.0, 0.02)
+    network.add_terminal('teleso', 'A', 'B', kv=0.6)
+    network.add_pipe('S', 'B', 'spiatočka', 20.0, 0.02)
+
+    solution = network.solve()
+    assert solution.converged
+    assert np.isclose(solution.pressure_drop.sum(), 10000.0)
+    assert np.isclose(solution.link_flow('P'), solution.link_flow('teleso'))
+    # Teleso s Kv: Δp = 1 bar pri prietoku Kv [m³/h]
+    volume_flow = solution.link_flow('teleso') / network.density * 3600
+    assert np.isclose(solution.pressure_drop[network.link_index['teleso']], 1e5 * (volume_flow / 0.6) ** 2)
+
+
+def test_pipe_network_apartment_block():
+    n_risers, n_floors = 100, 20
+    network = PipeNetwork.two_pipe_system(np.full((n_risers, n_floors), 0.5), 20000.0, main_diameter=0.08)
+    solution = network.solve()
+
+    assert solution.converged and solution.iterations < 30
+    assert solution.residual < 1e-9
+    flows = solution.flow[network.terminals()].reshape(n_risers, n_floors)
+    # Telesá ďaleko od zdroja majú nižší dispozičný tlak a prietok
+    assert flows[0, 0] > flows[-1, -1] > 0
+    assert np.isclose(solution.link_flow('ležatý_P0'), flows.sum())
+
+
+def test_hydraulic_balancing_analysis_with_network():
+    building = create_test_building(2)
+    building.heating_system = HeatingSystem(HeatingSystemType.RADIATOR, 70.0, 55.0)
+    zones = [[zone.name for zone in building.zones]]
+    network = PipeNetwork.two_pipe_system(np.full((1, len(building.zones)), 0.4), 15000.0, zones=zones)
+    demands = {zone.name: 50.0 * zone.floor_area for zone in building.zones}
+
+    results = HydraulicCalculations.hydraulic_balancing_analysis(building, demands, network=network)
+    solution = network.solve()
+    for f, zone in enumerate(building.zones):
+        row = results[zone.name]
+        assert row['network_converged']
+        assert np.isclose(row['actual_flow_kg_s'], solution.link_flow(f"teleso_0.{f}"))
+        assert np.isclose(row['required_flow_kg_s'], demands[zone.name] / (water_properties.specific_heat(62.5) * 15.0))
+
+
+def test_water_properties():
+    # Tabuľkové hodnoty pre nasýtenú kvapalinu
+    assert abs(water_properties.density(20.0) - 998.2) < 0.1
+    assert abs(water_properties.density(80.0) - 971.8) < 0.1
+    assert abs(water_properties.viscosity(20.0) - 1.002e-3) < 0.01e-3
+    assert abs(water_properties.specific_heat(60.0) - 4184.3) < 1.0
+
+    # Pole a skalár dávajú rovnaké hodnoty, mimo rozsahu sa hodnota obmedzí na okraj
+    temperatures = np.array([-5.0, 0.0, 37.3, 62.5, 119.9, 150.0])
+    for name in ('density', 'viscosity', 'specific_heat'):
+        lookup = getattr(water_properties, name)
+        assert np.allclose(lookup(temperatures), [lookup(float(t)) for t in temperatures], rtol=1e-12)
+    assert water_properties.density(-5.0) == water_properties.density(0.0)
+
+    # Teplejšia voda má nižšiu viskozitu a tlakovú stratu
+    assert (HydraulicCalculations.calculate_pressure_loss(0.2, 20.0, 0.025, water_temperature=80.0)
+            < HydraulicCalculations.calculate_pressure_loss(0.2, 20.0, 0.025, water_temperature=40.0))
+
+
+def test_psychrometrics_reference_values_and_arrays():
+    # Referenčné hodnoty ASHRAE Fundamentals (101,325 kPa)
+    assert psychrometrics.saturation_pressure(20.0) == pytest.approx(2339, rel=5e-3)
+    assert psychrometrics.saturation_pressure(-10.0) == pytest.approx(259.9, rel=5e-3)
+    x = psychrometrics.humidity_ratio(20.0, 0.5)
+    assert x == pytest.approx(0.00726, rel=5e-3)
+    assert psychrometrics.enthalpy(20.0, x) == pytest.approx(38.5, abs=0.1)
+    assert psychrometrics.dew_point(20.0, 0.5) == pytest.approx(9.26, abs=0.05)
+    assert psychrometrics.relative_humidity(20.0, x) == pytest.approx(0.5)
+
+    # Hodinové polia (zóny × hodiny) dávajú rovnaké hodnoty ako skalárny výpočet
+    rng = np.random.default_rng(5)
+    temperature = rng.uniform(-20, 35, (50, 24))
+    humidity = rng.uniform(0.1, 1.0, (50, 24))
+    ratios = psychrometrics.humidity_ratio(temperature, humidity)
+    expected = [psychrometrics.humidity_ratio(t, rh) for t, rh in zip(temperature.flat, humidity.flat)]
+    assert np.allclose(ratios.ravel(), expected, rtol=1e-12)
+    assert psychrometrics.humidity_ratio(temperature.astype(np.float32), humidity.astype(np.float32)).dtype == np.float32
+    assert np.all(psychrometrics.dew_point(temperature, humidity) <= temperature + 1e-9)
+
+    # Latentná záťaž vetrania z vlhkosti vonkajšieho vzduchu, suchší vzduch ju nevytvára
+    loads = CoolingCalculations.calculate_ventilation_cooling_load(
+        0.5, np.array([8.0, 8.0]), outdoor_relative_humidity=np.array([0.6, 0.1])
+    )
+    delta = psychrometrics.humidity_ratio(32.0, 0.6) - psychrometrics.humidity_ratio(24.0, 0.5)
+    assert loads['latent_cooling_load'][0] == pytest.approx(0.5 * 1.2 * delta * 2.5e6)
+    assert loads['latent_cooling_load'][1] == 0.0
+
+
+def test_pipe_sizer_matches_linear_scan():
+    sizer = PipeSizer(PIPE_CATALOGUE['meď'], max_velocity=0.8, max_pressure_gradient=120.0)
+    flows = np.random.default_rng(3).uniform(0.0, 1.5, 500)
+    index = sizer.select(flows)
+
+    # Najmenší vyhovujúci rozmer lineárnym prechodom katalógu
+    catalogue = sizer.catalogue
+    for flow, selected in zip(flows, index):
+        expected = len(catalogue) - 1
+        for i, diameter in enumerate(catalogue.inner_diameter):
+            velocity = flow / (water_properties.density(60.0) * np.pi * (diameter / 2) ** 2)
+            gradient = sizer._pressure_gradient(np.array([flow]), np.array([i]))[0]
+            if velocity <= 0.8 and gradient <= 120.0:
+                expected = i
+                break
+        assert selected == expected
+
+    # Celá sieť naraz: priemery sa zapíšu do siete, cena je súčet úsekov
+    network = PipeNetwork.two_pipe_system(None, 30000.0, design_flows=np.full((3, 4), 0.02),
+                                          catalogue=VALVE_CATALOGUE['TRV_DN15'])
+    result = PipeSizer().size_network(network)
+    assert not result.undersized.any()
+    assert result.diameter[result.pipe_names.index('ležatý_P0')] >= \
+        result.diameter[result.pipe_names.index('ležatý_P2')]
+    assert np.isclose(result.total_cost, sum(row['cost_eur'] for row in result.report()))
+    assert network.diameter[network.link_index['ležatý_P0']] == \
+        result.diameter[result.pipe_names.index('ležatý_P0')]
+    assert network.solve().converged
+
+
+def test_valve_preset_optimizer():
+    rng = np.random.default_rng(0)
+    design = rng.uniform(0.005, 0.03, (10, 5))
+    catalogue = VALVE_CATALOGUE['TRV_DN15']
+    network = PipeNetwork.two_pipe_system(None, 30000.0, main_diameter=0.05, design_flows=design,
+                                          catalogue=catalogue)
+
+    # Bez apply zostane sieť nezmenená
+    untouched = list(network.kv)
+    preview = ValvePresetOptimizer(network, min_valve_pressure_drop=0.0).optimize(apply=False)
+    assert network.kv == untouched
+    result = ValvePresetOptimizer(network, min_valve_pressure_drop=0.0).optimize()
+    np.testing.assert_array_equal(result.presets, preview.presets)
+
+    assert result.solution.converged
+    assert not result.clamped.any()
+    assert result.max_flow_error < 0.05
+    assert len(result.report()) == design.size
+    index = result.terminal_names.index(result.index_terminal)
+    assert result.presets[index] == catalogue.presets[-1]
+    assert np.all((result.presets >= catalogue.presets[0]) & (result.presets <= catalogue.presets[-1]))
+    assert np.allclose(result.kv, catalogue.kv(result.presets))
+
+    # Pri nižšom dopravnom tlaku nedosiahne najnepriaznivejší okruh návrhový prietok
+    network.set_pressure('zdroj_prívod', 0.9 * result.pump_pressure)
+    reduced = network.solve()
+    assert reduced.link_flow(result.index_terminal) < result.design_flow[index]
+
+    # Úzky rozvod: ventily blízko čerpadla nedokážu uškrtiť prebytok tlaku,
+    # ostatné telesá sa nastavia so skutočnými prietokmi týchto telies
+    network = PipeNetwork.two_pipe_system(None, 30000.0, main_diameter=0.02, design_flows=design,
+                                          catalogue=catalogue)
+    result = ValvePresetOptimizer(network, min_valve_pressure_drop=0.0).optimize()
+    assert result.clamped.any() and result.iterations > 1
+    assert np.all(result.presets[result.clamped] == catalogue.presets[0])
+    assert np.all(result.flow_error[result.clamped] > 0.05)
+    assert np.max(np.abs(result.flow_error[~result.clamped])) < 0.05
+
+
+def test_pressure_loss_array_matches_scalar():
+    rng = np.random.default_rng(3)
+    flows = rng.uniform(0.001, 1.5, 2000)
+    lengths = rng.uniform(1.0, 40.0, 2000)
+    diameters = rng.choice([0.012, 0.016, 0.02, 0.025, 0.032, 0.05], 2000)
+
+    losses = HydraulicCalculations.calculate_pressure_loss_array(flows, lengths, diameters)
+    expected = [HydraulicCalculations.calculate_pressure_loss(m, l, d) for m, l, d in zip(flows, lengths, diameters)]
+    assert np.allclose(losses, expected, rtol=1e-13, atol=0)
+
+    # Pozičné parametre v poradí skalárnej funkcie, drsnosť a metóda len menom
+    positional = HydraulicCalculations.calculate_pressure_loss_array(flows[:50], lengths[:50], diameters[:50], 2.0, 80.0)
+    expected = [HydraulicCalculations.calculate_pressure_loss(m, l, d, 2.0, 80.0)
+                for m, l, d in zip(flows[:50], lengths[:50], diameters[:50])]
+    assert np.allclose(positional, expected, rtol=1e-13, atol=0)
+    with pytest.raises(TypeError):
+        HydraulicCalculations.calculate_pressure_loss_array(flows, lengths, diameters, 1.5, 60.0, 1e-4)
+
+    # Vstupy rôznych tvarov sa rozšíria (broadcasting) na spoločný tvar
+    mixed = HydraulicCalculations.calculate_pressure_loss_array(np.array([0.2]), 10.0, np.array([0.02, 0.025, 0.03]))
+    assert np.allclose(mixed, [HydraulicCalculations.calculate_pressure_loss(0.2, 10.0, d) for d in (0.02, 0.025, 0.03)],
+                       rtol=1e-13, atol=0)
+    grid = HydraulicCalculations.calculate_pressure_loss_array(np.array([0.2, 0.3]), np.array([[10.0], [20.0]]), 0.025,
+                                                               water_temperature=np.array([70.0, 50.0]))
+    assert grid.shape == (2, 2)
+    assert np.isclose(grid[1, 0], HydraulicCalculations.calculate_pressure_loss(0.2, 20.0, 0.025, 1.5, 70.0),
+                      rtol=1e-13, atol=0)
+
+    # Colebrook-White: riešenie implicitnej rovnice, Swamee-Jain do 2 %
+    reynolds = np.geomspace(4000, 1e7, 500)
+    roughness = np.full(500, 1e-4)
+    colebrook = HydraulicCalculations.calculate_friction_factor_array(reynolds, roughness, "colebrook")
+    residual = 1 / np.sqrt(colebrook) + 2 * np.log10(roughness / 3.7 + 2.51 / (reynolds * np.sqrt(colebrook)))
+    assert np.max(np.abs(residual)) < 1e-10
+    swamee_jain = HydraulicCalculations.calculate_friction_factor_array(reynolds, roughness, "swamee_jain")
+    assert np.allclose(swamee_jain, colebrook, rtol=0.02)
+
+    # Prechodová oblasť je spojitá
+    transition = HydraulicCalculations.calculate_friction_factor_array(
+        [1999.999, 2000.0, 3999.999, 4000.0], 0.0, "blasius", transition=True)
+    assert np.allclose(transition[0], transition[1]) and np.allclose(transition[2], transition[3])